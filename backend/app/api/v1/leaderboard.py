@@ -0,0 +1,81 @@
+"""API endpoints for ranked scores per scoring weight."""
+
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.schemas.leaderboard import LeaderboardOut, LeaderboardRankOut
+from app.services.leaderboard import (
+    SOURCE_DATABASE,
+    claim_leaderboard_rebuild,
+    get_coin_rank,
+    get_coins_in_range,
+    get_top_coins,
+)
+from app.tasks.scoring_all import rebuild_leaderboards
+
+router = APIRouter(prefix="/leaderboard", tags=["leaderboard"])
+
+
+async def warm_if_missed(result: dict) -> None:
+    """
+    Redis missed but the database has scores: rebuild the leaderboards in
+    the background, unless a rebuild is already pending. Redis doubles as
+    the Celery broker, so when it is down the enqueue fails too; that is
+    logged and the database answer is still returned.
+    """
+    if result["source"] != SOURCE_DATABASE or not result["total"]:
+        return
+    try:
+        if await claim_leaderboard_rebuild():
+            rebuild_leaderboards.delay()
+    except Exception as e:
+        logger.warning(f"⚠️ Could not queue a leaderboard rebuild: {e}")
+
+
+@router.get("/{scoring_weight_id}", response_model=LeaderboardOut)
+async def get_top_coins_endpoint(
+    scoring_weight_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    limit: int = Query(50, ge=1, le=1000),
+) -> LeaderboardOut:
+    """Top coins by final score for a scoring weight."""
+    result = await get_top_coins(db, scoring_weight_id, limit)
+    await warm_if_missed(result)
+    return LeaderboardOut(scoring_weight_id=scoring_weight_id, **result)
+
+
+@router.get("/{scoring_weight_id}/range", response_model=LeaderboardOut)
+async def get_coins_in_range_endpoint(
+    scoring_weight_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    min_score: float = Query(0.0, ge=0.0, le=1.0),
+    max_score: float = Query(1.0, ge=0.0, le=1.0),
+    limit: int = Query(50, ge=1, le=1000),
+) -> LeaderboardOut:
+    """Coins whose final score lies in [min_score, max_score], best first."""
+    if min_score > max_score:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="min_score must not exceed max_score",
+        )
+    result = await get_coins_in_range(db, scoring_weight_id, min_score, max_score, limit)
+    await warm_if_missed(result)
+    return LeaderboardOut(scoring_weight_id=scoring_weight_id, **result)
+
+
+@router.get("/{scoring_weight_id}/coins/{coin_id}", response_model=LeaderboardRankOut)
+async def get_coin_rank_endpoint(
+    scoring_weight_id: uuid.UUID,
+    coin_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+) -> LeaderboardRankOut:
+    """Rank and final score of one coin for a scoring weight."""
+    result = await get_coin_rank(db, scoring_weight_id, coin_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Coin has no score for this weight")
+    await warm_if_missed(result)
+    return LeaderboardRankOut(scoring_weight_id=scoring_weight_id, **result)
@@ -1,22 +1,50 @@
+from datetime import datetime, timedelta
 from uuid import UUID
-from typing import Annotated
+from typing import Annotated, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
 
 from app.api.deps import get_db, get_current_manager
+from app.core.config import settings
+from app.db.session import get_session_factory
+from app.models.metric_rollup import RESOLUTION_DAY, RESOLUTION_HOUR, RESOLUTION_RAW, ROLLUP_FIELDS
 from app.models.user import User
-from app.schemas.metric import MetricCreate, MetricUpdate, MetricOut
+from app.schemas.metric import MetricCreate, MetricHistoryOut, MetricProjectionOut, MetricUpdate, MetricOut
 from app.crud.metrics import (
     create_metric,
     get_metric_by_id,
     get_metrics_by_coin,
+    metrics_export_query,
     update_metric,
     delete_metric,
 )
+from app.services.metric_history import get_metric_history
+from app.services.metric_stream import FORMAT_CSV, FORMAT_NDJSON, MEDIA_TYPES, stream_rows
+from app.utils.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
 
 router = APIRouter(prefix="/metrics", tags=["metrics"])
 
+# History window when no start is given
+DEFAULT_HISTORY_DAYS = 365
+
+
+def _check_fields(fields: Optional[List[str]]) -> None:
+    unknown = sorted(set(fields or ()) - set(MetricProjectionOut.model_fields))
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown metric fields: {', '.join(unknown)}")
+
+
+def _stream_response(session_factory: sessionmaker, stmt, fmt: str, filename: str) -> StreamingResponse:
+    headers = {"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'} if fmt == FORMAT_CSV else None
+    return StreamingResponse(
+        stream_rows(session_factory, stmt, fmt, settings.METRIC_STREAM_CHUNK_ROWS),
+        media_type=MEDIA_TYPES[fmt],
+        headers=headers,
+    )
+
 
 @router.post("/", response_model=MetricOut, status_code=status.HTTP_201_CREATED)
 async def create_metric_endpoint(
@@ -29,6 +57,25 @@ async def create_metric_endpoint(
     return metric
 
 
+@router.get("/export", response_class=StreamingResponse, status_code=status.HTTP_200_OK)
+async def export_metrics_endpoint(
+    session_factory: Annotated[sessionmaker, Depends(get_session_factory)],
+    _: Annotated[User, Depends(get_current_manager)],
+    coin_id: Annotated[Optional[List[UUID]], Query()] = None,
+    start: Annotated[Optional[datetime], Query(alias="from")] = None,
+    end: Annotated[Optional[datetime], Query(alias="to")] = None,
+    format: Literal[FORMAT_NDJSON, FORMAT_CSV] = FORMAT_NDJSON,
+    fields: Annotated[Optional[List[str]], Query()] = None,
+) -> StreamingResponse:
+    """
+    Stream active metrics fetched in [from, to), optionally only of the
+    given ``coin_id``s, as NDJSON or CSV straight off a database cursor
+    (manager only).
+    """
+    _check_fields(fields)
+    return _stream_response(session_factory, metrics_export_query(coin_id, start, end, fields), format, "metrics")
+
+
 @router.get("/{metric_id}", response_model=MetricOut, status_code=status.HTTP_200_OK)
 async def get_metric_endpoint(
     metric_id: UUID,
@@ -41,13 +88,100 @@ async def get_metric_endpoint(
     return metric
 
 
-@router.get("/coin/{coin_id}", response_model=list[MetricOut], status_code=status.HTTP_200_OK)
+@router.get(
+    "/coin/{coin_id}",
+    response_model=list[MetricProjectionOut],
+    response_model_exclude_unset=True,
+    status_code=status.HTTP_200_OK,
+)
 async def get_metrics_by_coin_endpoint(
     coin_id: UUID,
+    response: Response,
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> list[MetricOut]:
-    """List all metrics for a given coin."""
-    return await get_metrics_by_coin(db, coin_id)
+    start: Annotated[Optional[datetime], Query(alias="from")] = None,
+    end: Annotated[Optional[datetime], Query(alias="to")] = None,
+    limit: Annotated[int, Query(ge=1, le=5000)] = 500,
+    cursor: Optional[str] = None,
+    order: Literal["asc", "desc"] = "asc",
+    fields: Annotated[Optional[List[str]], Query()] = None,
+) -> list[MetricProjectionOut]:
+    """
+    A page of a coin's active metrics fetched in [from, to), ordered by
+    fetch time. When more remain, the ``X-Next-Cursor`` response header
+    holds the ``cursor`` for the next page. ``fields`` limits the columns
+    returned besides ``id`` and ``fetched_at``.
+    """
+    _check_fields(fields)
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+    rows = await get_metrics_by_coin(
+        db, coin_id, limit + 1, start, end, after, descending=order == "desc", fields=fields
+    )
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].fetched_at, rows[-1].id)
+    return [MetricProjectionOut.model_validate(row._asdict()) for row in rows]
+
+
+@router.get("/coin/{coin_id}/export", response_class=StreamingResponse, status_code=status.HTTP_200_OK)
+async def export_metrics_by_coin_endpoint(
+    coin_id: UUID,
+    session_factory: Annotated[sessionmaker, Depends(get_session_factory)],
+    start: Annotated[Optional[datetime], Query(alias="from")] = None,
+    end: Annotated[Optional[datetime], Query(alias="to")] = None,
+    format: Literal[FORMAT_NDJSON, FORMAT_CSV] = FORMAT_NDJSON,
+    fields: Annotated[Optional[List[str]], Query()] = None,
+) -> StreamingResponse:
+    """
+    A coin's whole active metric history in [from, to), oldest first,
+    streamed as NDJSON or CSV without pagination or buffering.
+    """
+    _check_fields(fields)
+    stmt = metrics_export_query([coin_id], start, end, fields)
+    return _stream_response(session_factory, stmt, format, f"metrics-{coin_id}")
+
+
+@router.get(
+    "/coin/{coin_id}/history",
+    response_model=MetricHistoryOut,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_200_OK,
+)
+async def get_metric_history_endpoint(
+    coin_id: UUID,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    start: Annotated[Optional[datetime], Query(alias="from")] = None,
+    end: Annotated[Optional[datetime], Query(alias="to")] = None,
+    max_points: Annotated[int, Query(ge=10, le=5000)] = 500,
+    resolution: Literal["auto", RESOLUTION_RAW, RESOLUTION_HOUR, RESOLUTION_DAY] = "auto",
+    fields: Annotated[Optional[List[str]], Query()] = None,
+) -> MetricHistoryOut:
+    """
+    A coin's metric history in [from, to), defaulting to the last year.
+    With ``resolution=auto`` the most detailed of raw snapshots, hourly
+    and daily rollups that fits ``max_points`` is used. Raw series only
+    carry ``last``. ``fields`` limits the series returned.
+    """
+    unknown = sorted(set(fields or ()) - set(ROLLUP_FIELDS))
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown metric fields: {', '.join(unknown)}")
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(days=DEFAULT_HISTORY_DAYS)
+    if start >= end:
+        raise HTTPException(status_code=422, detail="'from' must be before 'to'")
+
+    return await get_metric_history(
+        db,
+        coin_id,
+        start,
+        end,
+        max_points,
+        resolution=None if resolution == "auto" else resolution,
+        fields=[field for field in ROLLUP_FIELDS if field in fields] if fields else ROLLUP_FIELDS,
+    )
 
 
 @router.put("/{metric_id}", response_model=MetricOut, status_code=status.HTTP_200_OK)
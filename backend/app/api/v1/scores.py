@@ -1,12 +1,14 @@
 """API endpoints for managing scoring entries."""
 
 import uuid
-from typing import List
+from datetime import datetime, timedelta
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_manager
+from app.crud.score_history import get_score_trajectory
 from app.crud.scores import (
     create_score,
     delete_score,
@@ -16,10 +18,13 @@ from app.crud.scores import (
 )
 from app.db.session import get_db
 from app.models.user import User
-from app.schemas.score import ScoreCreate, ScoreOut, ScoreUpdate
+from app.schemas.score import ScoreCreate, ScoreOut, ScoreTrajectoryOut, ScoreUpdate
 
 router = APIRouter(prefix="/scores", tags=["scores"])
 
+# Trajectory window when no start is given
+DEFAULT_HISTORY_DAYS = 90
+
 
 @router.post("/", response_model=ScoreOut, status_code=status.HTTP_201_CREATED)
 async def create_score_endpoint(
@@ -52,6 +57,41 @@ async def get_scores_by_coin_endpoint(
     return await get_scores_by_coin(db, coin_id)
 
 
+@router.get(
+    "/history/{coin_id}",
+    response_model=ScoreTrajectoryOut,
+    response_model_exclude_none=True,
+)
+async def get_score_trajectory_endpoint(
+    coin_id: uuid.UUID,
+    scoring_weight_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    limit: int = Query(1000, ge=1, le=10000),
+    components: bool = False,
+) -> ScoreTrajectoryOut:
+    """
+    A coin's score trajectory under a scoring weight in [from, to),
+    defaulting to the last 90 days; only the partitions of that window are
+    read. Component scores are included with ``components=true``.
+    """
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(days=DEFAULT_HISTORY_DAYS)
+    points = await get_score_trajectory(db, coin_id, scoring_weight_id, start, end, limit)
+
+    trajectory = ScoreTrajectoryOut(
+        coin_id=coin_id,
+        scoring_weight_id=scoring_weight_id,
+        scored_at=[point.scored_at for point in points],
+        final_score=[point.final_score for point in points],
+    )
+    if components:
+        for field in ("liquidity_score", "developer_score", "community_score", "market_score"):
+            setattr(trajectory, field, [getattr(point, field) for point in points])
+    return trajectory
+
+
 @router.put("/{score_id}", response_model=ScoreOut)
 async def update_score_endpoint(
     score_id: uuid.UUID,
@@ -3,10 +3,11 @@
 import uuid
 from typing import Annotated, List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_manager
+from app.crud.coins import get_coins_by_ids
 from app.crud.scoring_weights import (
     create_scoring_weight,
     get_scoring_weight,
@@ -17,10 +18,15 @@ from app.crud.scoring_weights import (
 from app.db.session import get_db
 from app.models.user import User
 from app.schemas.scoring_weight import (
+    ScoringWeightBase,
     ScoringWeightCreate,
     ScoringWeightOut,
     ScoringWeightUpdate,
+    WhatIfOut,
 )
+from app.services.leaderboard import delete_leaderboard
+from app.services.what_if import get_cached_components, rank_what_if
+from app.tasks.scoring_all import refresh_component_cache
 
 router = APIRouter(prefix="/scoring-weights", tags=["scoring_weights"])
 
@@ -35,6 +41,34 @@ async def create_scoring_weight_endpoint(
     return await create_scoring_weight(db, weight_in)
 
 
+@router.post("/what-if", response_model=WhatIfOut)
+async def what_if_scoring_endpoint(
+    weights_in: ScoringWeightBase,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    _: Annotated[User, Depends(get_current_manager)],
+    top_k: int = Query(20, ge=1, le=1000),
+) -> WhatIfOut:
+    """
+    Rank coins under hypothetical weights from the cached component matrix
+    without saving anything (Manager only).
+    """
+    cached = await get_cached_components()
+    if cached is None:
+        refresh_component_cache.delay()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Component scores are being cached; retry shortly",
+        )
+
+    ranking = rank_what_if(cached, weights_in, top_k)
+    coins = await get_coins_by_ids(db, [entry["coin_id"] for entry in ranking])
+    for entry in ranking:
+        coin = coins.get(entry["coin_id"])
+        if coin is not None:
+            entry.update(name=coin.name, symbol=coin.symbol)
+    return WhatIfOut(version=cached.version, coins=len(cached), ranking=ranking)
+
+
 @router.get("/{weight_id}", response_model=ScoringWeightOut)
 async def get_scoring_weight_endpoint(
     weight_id: uuid.UUID,
@@ -91,4 +125,5 @@ async def delete_scoring_weight_endpoint(
             detail="Scoring weight not found",
         )
     await delete_scoring_weight(db, db_weight)
+    await delete_leaderboard(weight_id)
     return {"detail": "Scoring weight deleted successfully"}
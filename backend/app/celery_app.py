@@ -28,16 +28,48 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.bootstrap.bootstrap_supported_coins",
         "schedule": crontab(hour=0, minute=0),  # Once daily at midnight UTC
     },
-    # 📊 Fetch and store coin data and metrics (every 6 hours)
-    "fetch_and_update_all_coins": {
-        "task": "app.tasks.coin_data.fetch_and_update_all_coins",
-        "schedule": 60 * 60 * 6,  # every 6 hours
+    # 📊 Fetch and store coin data and metrics for coins due a refresh
+    # (fetch_and_update_all_coins remains available for a full manual run)
+    "refresh_due_coins": {
+        "task": "app.tasks.coin_data.refresh_due_coins",
+        "schedule": 60 * settings.REFRESH_TICK_MINUTES,
+    },
+    # 💹 Refresh market cap / volume / liquidity in bulk (hourly)
+    "refresh_market_data_for_all_coins": {
+        "task": "app.tasks.coin_data.refresh_market_data_for_all_coins",
+        "schedule": 60 * 60,  # every hour
     },
-    # 📈 Recalculate all coin scores
-    "score_all_coins": {
-        "task": "app.tasks.scoring_all.score_all_coins",
+    # 📈 Recalculate all coin scores for every weight profile in one pass
+    # (score_all_coins remains available for a single profile)
+    "score_all_weights": {
+        "task": "app.tasks.scoring_all.score_all_weights",
         "schedule": 60 * 60 * 6,  # every 6 hours
     },
+    # 📐 Rebuild percentile-normalization sketches from the latest metrics and compact write deltas
+    "rebuild_quantile_sketches": {
+        "task": "app.tasks.scoring_all.rebuild_quantile_sketches",
+        "schedule": crontab(minute=20),  # Hourly at :20
+    },
+    # 🧮 Fold newly written metrics into the hourly/daily rollups
+    "roll_up_metrics": {
+        "task": "app.tasks.maintenance.roll_up_metrics",
+        "schedule": crontab(minute=10),  # Hourly at :10
+    },
+    # 🗂️ Create upcoming metrics partitions and retire expired ones
+    "maintain_metric_partitions": {
+        "task": "app.tasks.maintenance.maintain_metric_partitions",
+        "schedule": crontab(hour=0, minute=20),  # Once daily at 00:20 UTC
+    },
+    # 🗂️ Create upcoming score_history partitions and drop expired ones
+    "maintain_score_history_partitions": {
+        "task": "app.tasks.maintenance.maintain_score_history_partitions",
+        "schedule": crontab(hour=0, minute=30),  # Once daily at 00:30 UTC
+    },
+    # 📦 Append new metrics and score history to the Parquet export
+    "export_parquet": {
+        "task": "app.tasks.exports.export_parquet",
+        "schedule": crontab(hour=2, minute=0),  # Once daily at 02:00 UTC
+    },
     # 🔔 Notify about pending suggestions
     "notify_pending_suggestions": {
         "task": "app.tasks.notifications.notify_pending_suggestions",
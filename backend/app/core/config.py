@@ -34,6 +34,67 @@ class Settings(BaseSettings):
     # Notifications
     SLACK_WEBHOOK_URL: Optional[str] = None
 
+    # Ingestion
+    COINGECKO_RATE_LIMIT_PER_MINUTE: int = Field(30)
+    INGESTION_CONCURRENCY: int = Field(8)
+    INGESTION_SHARD_SIZE: int = Field(250)
+    # "redis" shares one request budget across all workers; "local" is per process
+    COINGECKO_RATE_LIMIT_BACKEND: str = Field("redis")
+    BOOTSTRAP_BATCH_SIZE: int = Field(1000)
+    # Parse /coins/list incrementally instead of loading the whole payload
+    BOOTSTRAP_STREAMING: bool = Field(True)
+    # The hourly market refresh only writes a coin whose market figures moved by more than this
+    MARKET_REFRESH_MIN_RELATIVE_CHANGE: float = Field(0.005)
+    METRIC_BUFFER_MAX_ROWS: int = Field(500)
+    METRIC_BUFFER_MAX_SECONDS: float = Field(5.0)
+    # Monthly metrics partitions: created this many months ahead; partitions older than the
+    # retention are detached ("detach") or dropped ("drop"), 0 keeps everything
+    METRICS_PARTITIONS_AHEAD: int = Field(2)
+    METRICS_RETENTION_MONTHS: int = Field(12)
+    METRICS_RETENTION_ACTION: str = Field("detach")
+    # Rows fetched per server-side cursor round trip by streaming metric exports
+    METRIC_STREAM_CHUNK_ROWS: int = Field(1000)
+
+    # Raw CoinGecko payload archive (zstd segments + SQLite index) for metric replays. Every
+    # ingesting worker and the host running a replay must see the same directory (a shared volume)
+    PAYLOAD_ARCHIVE_ENABLED: bool = Field(True)
+    PAYLOAD_ARCHIVE_DIR: str = Field(".archive/coingecko")
+    PAYLOAD_ARCHIVE_SEGMENT_MAX_BYTES: int = Field(64 * 1024 * 1024)
+    PAYLOAD_ARCHIVE_FRAME_RECORDS: int = Field(100)
+
+    # Incremental Parquet export of metrics and score history for offline analysis; rows newer
+    # than the lag are left for the next run so in-flight transactions have committed
+    PARQUET_EXPORT_DIR: str = Field(".exports/parquet")
+    PARQUET_EXPORT_BATCH_ROWS: int = Field(50_000)
+    PARQUET_EXPORT_LAG_MINUTES: int = Field(15)
+
+    # Scoring
+    SCORE_UPSERT_BATCH_SIZE: int = Field(1000)
+    # Incremental runs also rescore coins with metrics up to this long before the last high-water mark
+    SCORING_HIGH_WATER_MARK_OVERLAP_SECONDS: int = Field(300)
+    # "max" divides by the universe maximum; "percentile" maps values to their percentile rank
+    SCORING_NORMALIZATION: str = Field("max")
+    QUANTILE_SKETCH_K: int = Field(200)
+    # Monthly score_history partitions: created this many months ahead, dropped after the retention
+    SCORE_HISTORY_PARTITIONS_AHEAD: int = Field(2)
+    SCORE_HISTORY_RETENTION_MONTHS: int = Field(24)
+
+    # Refresh scheduling
+    REFRESH_TICK_MINUTES: int = Field(15)
+    REFRESH_MIN_INTERVAL_MINUTES: int = Field(60)
+    REFRESH_MAX_INTERVAL_MINUTES: int = Field(24 * 60)
+    REFRESH_VOLATILITY_WINDOW_HOURS: int = Field(72)
+    # Share of a tick's request quota left for market refreshes and other callers
+    REFRESH_BUDGET_RESERVE_FRACTION: float = Field(0.2)
+
+    # CoinGecko response cache ("none", "sqlite" or "redis")
+    COINGECKO_CACHE_BACKEND: str = Field("none")
+    COINGECKO_CACHE_PATH: str = Field(".cache/coingecko.sqlite3")
+    COINGECKO_CACHE_MAX_BYTES: int = Field(256 * 1024 * 1024)
+    COINGECKO_COINS_LIST_TTL: int = Field(12 * 60 * 60)
+    # Streamed `/coins/list` bodies larger than this are not cached
+    COINGECKO_COINS_LIST_CACHE_MAX_BYTES: int = Field(16 * 1024 * 1024)
+
     # CORS
     BACKEND_CORS_ORIGINS: list[str] = Field(default_factory=list)
 
@@ -2,6 +2,7 @@ from typing import Optional
 from uuid import UUID
 
 from fastapi import HTTPException
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -52,6 +53,14 @@ async def get_coins(db: AsyncSession, skip: int = 0, limit: int = 100) -> list[C
     return result.scalars().all()
 
 
+async def get_coins_by_ids(db: AsyncSession, coin_ids: list[UUID]) -> dict[UUID, Coin]:
+    """Retrieve a batch of coins keyed by ID."""
+    if not coin_ids:
+        return {}
+    result = await db.execute(select(Coin).where(Coin.id.in_(coin_ids)))
+    return {coin.id: coin for coin in result.scalars().all()}
+
+
 async def update_coin(db: AsyncSession, db_coin: Coin, coin_in: CoinUpdate) -> Coin:
     """Update a coin's fields."""
     updates = coin_in.model_dump(exclude_unset=True)
@@ -99,39 +108,98 @@ def get_all_coingeckoids_sync(db: Session) -> list[str]:
     return [row[0] for row in result.all()]
 
 
-def create_coin_sync(db: Session, coin_in: CoinCreate) -> Coin:
-    """Sync version to create a new coin."""
+def create_coin_sync(db: Session, coin_in: CoinCreate, commit: bool = True) -> Coin:
+    """
+    Sync version to create a new coin. With ``commit=False`` the row is only
+    flushed, leaving the transaction (and rolling it back on a conflict)
+    to the caller.
+    """
     coin = Coin(**coin_in.model_dump())
     db.add(coin)
 
     try:
+        if not commit:
+            db.flush()
+            return coin
         db.commit()
         db.refresh(coin)
         return coin
     except IntegrityError:
-        db.rollback()
+        if commit:
+            db.rollback()
         raise HTTPException(
             status_code=409,
             detail="Coin symbol already exists"
         )
 
 
+def bulk_create_coins_sync(db: Session, coins_in: list[CoinCreate]) -> int:
+    """
+    Insert a batch of coins with one multi-row INSERT, skipping any whose
+    coingeckoid already exists. Returns how many rows were inserted.
+    """
+    if not coins_in:
+        return 0
+    stmt = (
+        insert(Coin)
+        .values([coin_in.model_dump() for coin_in in coins_in])
+        .on_conflict_do_nothing(index_elements=[Coin.coingeckoid])
+        .returning(Coin.id)
+    )
+    inserted = len(db.execute(stmt).all())
+    db.commit()
+    return inserted
+
+
 def get_by_coingeckoid_sync(db: Session, coingeckoid: str) -> Optional[Coin]:
     return db.query(Coin).filter(Coin.coingeckoid == coingeckoid).first()
 
 
-def update_coin_sync(db: Session, db_coin: Coin, coin_in: CoinUpdate) -> Coin:
-    for field, value in coin_in.model_dump(exclude_unset=True).items():
+def get_changed_fields(db_coin: Coin, coin_in: CoinUpdate) -> dict:
+    """Fields of ``coin_in`` whose values differ from what ``db_coin`` holds."""
+    return {
+        field: value
+        for field, value in coin_in.model_dump(exclude_unset=True).items()
+        if getattr(db_coin, field) != value
+    }
+
+
+def update_coin_sync(db: Session, db_coin: Coin, coin_in: CoinUpdate, commit: bool = True) -> Coin:
+    """
+    Sync version to update a coin. Only changed fields are written; when
+    nothing changed no UPDATE, flush or commit is issued at all.
+    """
+    changes = get_changed_fields(db_coin, coin_in)
+    if not changes:
+        return db_coin
+    for field, value in changes.items():
         setattr(db_coin, field, value)
+    if not commit:
+        db.flush()
+        return db_coin
     db.commit()
     db.refresh(db_coin)
     return db_coin
 
 
+def get_coins_by_coingeckoids_sync(db: Session, coingeckoids: list[str]) -> dict[str, Coin]:
+    """Preload coins for a batch of CoinGecko IDs, keyed by CoinGecko ID."""
+    if not coingeckoids:
+        return {}
+    result = db.execute(select(Coin).where(Coin.coingeckoid.in_(coingeckoids)))
+    return {coin.coingeckoid: coin for coin in result.scalars().all()}
+
+
 def get_tracked_coins_sync(db: Session) -> list[str]:
     result = db.execute(select(Coin.coingeckoid).where(Coin.is_active == True))
     return [row[0] for row in result.all()]
 
 
+def get_tracked_coin_id_map_sync(db: Session) -> dict[str, UUID]:
+    """Map CoinGecko ID -> coin primary key for every active coin."""
+    result = db.execute(select(Coin.coingeckoid, Coin.id).where(Coin.is_active == True))
+    return {coingeckoid: coin_id for coingeckoid, coin_id in result.all()}
+
+
 def get_all_sync(db: Session) -> list:
     return db.query(Coin).all()
\ No newline at end of file
@@ -0,0 +1,18 @@
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.config import Config
+
+
+def get_config_value_sync(db: Session, key: str, default: Any = None) -> Any:
+    value = db.execute(select(Config.value).where(Config.key == key)).scalar_one_or_none()
+    return default if value is None else value
+
+
+def set_config_value_sync(db: Session, key: str, value: Any) -> None:
+    """Upsert a JSON value inside the caller's transaction."""
+    stmt = insert(Config).values(key=key, value=value)
+    db.execute(stmt.on_conflict_do_update(index_elements=[Config.key], set_={"value": stmt.excluded.value}))
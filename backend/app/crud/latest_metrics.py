@@ -0,0 +1,100 @@
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.coin_latest_metric import CoinLatestMetric
+from app.models.metric import Metric
+
+# Join a pointer to its metric; matching fetched_at as well lets Postgres
+# prune the metrics partitions instead of probing each one's id index.
+LATEST_METRIC_JOIN = and_(
+    CoinLatestMetric.metric_id == Metric.id,
+    CoinLatestMetric.fetched_at == Metric.fetched_at,
+)
+
+
+def _advance_statement(rows: list[dict]):
+    """
+    Point each coin at the given metric unless it already points at a newer
+    one. ``rows`` hold coin_id, metric_id and fetched_at, one per coin.
+    """
+    stmt = insert(CoinLatestMetric).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[CoinLatestMetric.coin_id],
+        set_={"metric_id": stmt.excluded.metric_id, "fetched_at": stmt.excluded.fetched_at},
+        where=CoinLatestMetric.fetched_at <= stmt.excluded.fetched_at,
+    )
+
+
+def _latest_pointer_rows(metrics: Iterable[dict]) -> list[dict]:
+    latest: dict = {}
+    for metric in metrics:
+        if not metric.get("is_active", True):
+            continue
+        previous = latest.get(metric["coin_id"])
+        if previous is None or metric["fetched_at"] >= previous["fetched_at"]:
+            latest[metric["coin_id"]] = metric
+    return [
+        {"coin_id": coin_id, "metric_id": metric["id"], "fetched_at": metric["fetched_at"]}
+        for coin_id, metric in latest.items()
+    ]
+
+
+def _rebuild_statements(coin_ids: Optional[list[UUID]]):
+    """Delete and re-derive pointers from the metrics themselves (all coins when ``coin_ids`` is None)."""
+    latest = (
+        select(Metric.coin_id, Metric.id, Metric.fetched_at)
+        .where(Metric.is_active == True)
+        .order_by(Metric.coin_id, Metric.fetched_at.desc())
+        .distinct(Metric.coin_id)
+    )
+    clear = delete(CoinLatestMetric)
+    if coin_ids is not None:
+        latest = latest.where(Metric.coin_id.in_(coin_ids))
+        clear = clear.where(CoinLatestMetric.coin_id.in_(coin_ids))
+    fill = insert(CoinLatestMetric).from_select(["coin_id", "metric_id", "fetched_at"], latest)
+    return clear, fill
+
+
+def advance_latest_metrics_sync(db: Session, metrics: Iterable[dict]) -> None:
+    """Move the pointers forward for freshly inserted metric rows (dicts with an ``id``)."""
+    rows = _latest_pointer_rows(metrics)
+    if rows:
+        db.execute(_advance_statement(rows))
+
+
+async def advance_latest_metrics(db: AsyncSession, metrics: Iterable[dict]) -> None:
+    rows = _latest_pointer_rows(metrics)
+    if rows:
+        await db.execute(_advance_statement(rows))
+
+
+def refresh_latest_metrics_sync(db: Session, coin_ids: Optional[list[UUID]] = None) -> None:
+    """
+    Re-derive pointers after metrics were deactivated or edited, for
+    ``coin_ids`` or, when None, every coin (a full rebuild/backfill).
+    """
+    if coin_ids is not None and not coin_ids:
+        return
+    for statement in _rebuild_statements(coin_ids):
+        db.execute(statement)
+
+
+async def refresh_latest_metrics(db: AsyncSession, coin_ids: Optional[list[UUID]] = None) -> None:
+    if coin_ids is not None and not coin_ids:
+        return
+    for statement in _rebuild_statements(coin_ids):
+        await db.execute(statement)
+
+
+def metric_pointer_row(metric: Metric) -> dict:
+    return {
+        "id": metric.id,
+        "coin_id": metric.coin_id,
+        "fetched_at": metric.fetched_at,
+        "is_active": metric.is_active,
+    }
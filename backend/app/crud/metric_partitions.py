@@ -0,0 +1,110 @@
+from datetime import datetime
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy import Connection, delete, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.normalization_stats import mark_normalization_stats_stale_sync
+from app.db.partitions import (
+    add_months,
+    drop_partitions_before_sync,
+    ensure_monthly_partitions_sync,
+    is_partitioned_sync,
+    month_start,
+    months_between,
+)
+from app.models.coin_latest_metric import CoinLatestMetric
+from app.models.metric import Metric
+
+METRICS_TABLE = Metric.__tablename__
+LEGACY_TABLE = f"{METRICS_TABLE}_legacy"
+
+# METRICS_RETENTION_ACTION values
+RETENTION_DETACH = "detach"
+RETENTION_DROP = "drop"
+
+
+def ensure_metric_partitions_sync(db: Session, now: Optional[datetime] = None) -> list[str]:
+    """Create this month's metrics partition and ``METRICS_PARTITIONS_AHEAD`` more."""
+    now = now or datetime.utcnow()
+    return ensure_monthly_partitions_sync(db, METRICS_TABLE, now, settings.METRICS_PARTITIONS_AHEAD + 1)
+
+
+def metric_retention_cutoff(now: Optional[datetime] = None) -> Optional[datetime]:
+    """Start of the oldest month of metrics kept, or None when retention is off."""
+    if settings.METRICS_RETENTION_MONTHS <= 0:
+        return None
+    return add_months(month_start(now or datetime.utcnow()), -settings.METRICS_RETENTION_MONTHS)
+
+
+def apply_metric_retention_sync(db: Session, now: Optional[datetime] = None) -> list[str]:
+    """
+    Retire metrics partitions older than ``METRICS_RETENTION_MONTHS`` (0
+    keeps everything) by detaching or dropping them, per
+    ``METRICS_RETENTION_ACTION``; no rows are DELETEd. Pointers to retired
+    metrics are removed and the normalization stats flagged for recompute.
+    """
+    cutoff = metric_retention_cutoff(now)
+    if cutoff is None:
+        return []
+    retired = drop_partitions_before_sync(
+        db, METRICS_TABLE, cutoff, detach=settings.METRICS_RETENTION_ACTION.lower() == RETENTION_DETACH
+    )
+    if retired:
+        db.execute(delete(CoinLatestMetric).where(CoinLatestMetric.fetched_at < cutoff))
+        mark_normalization_stats_stale_sync(db)
+        logger.info(f"🗄️ Retired {len(retired)} metrics partitions older than {cutoff:%Y-%m}: {retired}")
+    return retired
+
+
+def partition_metrics_table(bind: Connection, drop_legacy: bool = True) -> int:
+    """
+    Convert an unpartitioned ``metrics`` table in place: rename it (and its
+    indexes) to ``metrics_legacy``, create the partitioned table from the
+    model, create monthly partitions from the oldest metric through
+    ``METRICS_PARTITIONS_AHEAD`` months ahead, and copy the rows month by
+    month. Meant for a migration's ``upgrade()`` via ``op.get_bind()`` or
+    ``scripts/partition_metrics.py``, with ingestion paused. Everything runs
+    in the caller's transaction. Returns the number of rows moved.
+    """
+    if is_partitioned_sync(bind, METRICS_TABLE):
+        logger.info("metrics is already partitioned; nothing to convert")
+        return 0
+
+    bind.execute(text(f'ALTER TABLE "{METRICS_TABLE}" RENAME TO "{LEGACY_TABLE}"'))
+    indexes = bind.execute(
+        text("SELECT indexname FROM pg_indexes WHERE tablename = :table"), {"table": LEGACY_TABLE}
+    ).scalars().all()
+    for index in indexes:
+        bind.execute(text(f'ALTER INDEX "{index}" RENAME TO "{index}_legacy"'))
+
+    Metric.__table__.create(bind)
+
+    oldest, = bind.execute(text(f'SELECT min(fetched_at) FROM "{LEGACY_TABLE}"')).one()
+    now = datetime.utcnow()
+    start = min(oldest, now) if oldest else now
+    months = months_between(start, now) + settings.METRICS_PARTITIONS_AHEAD
+    partitions = ensure_monthly_partitions_sync(bind, METRICS_TABLE, start, months)
+
+    columns = ", ".join(f'"{column.name}"' for column in Metric.__table__.columns)
+    copy = f'INSERT INTO "{METRICS_TABLE}" ({columns}) SELECT {columns} FROM "{LEGACY_TABLE}"'
+    moved = 0
+    lower = month_start(start)
+    for name in partitions:
+        upper = add_months(lower, 1)
+        result = bind.execute(
+            text(f"{copy} WHERE fetched_at >= :lower AND fetched_at < :upper"),
+            {"lower": lower, "upper": upper},
+        )
+        moved += result.rowcount
+        logger.info(f"📦 Moved {result.rowcount} metrics into {name}")
+        lower = upper
+    # Anything past the last monthly partition lands in the DEFAULT partition
+    moved += bind.execute(text(f"{copy} WHERE fetched_at >= :lower"), {"lower": lower}).rowcount
+
+    if drop_legacy:
+        bind.execute(text(f'DROP TABLE "{LEGACY_TABLE}"'))
+    logger.success(f"✅ Partitioned metrics: {moved} rows across {len(partitions)} monthly partitions")
+    return moved
@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import ARRAY, Float, and_, delete, func, literal, literal_column, select, type_coerce
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.crud.config import get_config_value_sync, set_config_value_sync
+from app.models.metric import Metric
+from app.models.metric_rollup import ROLLUP_AGGREGATES, ROLLUP_FIELDS, ROLLUP_RESOLUTIONS, MetricRollup
+
+WATERMARK_KEY = "metric_rollups.watermark"
+# created_at is the writing transaction's start time, so a row committed
+# just after a run can carry an older stamp than the watermark; re-reading
+# a short overlap catches it, and recomputing a bucket is idempotent.
+WATERMARK_OVERLAP = timedelta(minutes=10)
+EPOCH = datetime(1970, 1, 1)
+
+ROLLUP_COLUMNS = [
+    "coin_id",
+    "resolution",
+    "bucket_start",
+    "sample_count",
+    "last_fetched_at",
+    *(f"{field}_{aggregate}" for field in ROLLUP_FIELDS for aggregate in ROLLUP_AGGREGATES),
+]
+
+
+def _last_value(column):
+    """Latest non-null value of ``column`` in the group."""
+    return type_coerce(
+        func.array_agg(aggregate_order_by(column, Metric.fetched_at.desc())).filter(column.isnot(None)),
+        ARRAY(Float),
+    )[1]
+
+
+def _touched_days(since: datetime, until: datetime):
+    """(coin_id, day) pairs with metrics written in (since, until]."""
+    return (
+        select(Metric.coin_id, func.date_trunc("day", Metric.fetched_at).label("day"))
+        .where(Metric.created_at > since, Metric.created_at <= until)
+        .distinct()
+        .cte("touched")
+    )
+
+
+def _rollup_select(resolution: str, touched):
+    # Inlined rather than bound so GROUP BY matches the selected expression
+    bucket = func.date_trunc(literal_column(f"'{resolution}'"), Metric.fetched_at)
+    aggregates = []
+    for field in ROLLUP_FIELDS:
+        column = getattr(Metric, field)
+        aggregates += [func.min(column), func.max(column), func.avg(column), _last_value(column)]
+    return (
+        select(
+            Metric.coin_id,
+            literal(resolution),
+            bucket,
+            func.count(),
+            func.max(Metric.fetched_at),
+            *aggregates,
+        )
+        .join(touched, and_(
+            Metric.coin_id == touched.c.coin_id,
+            Metric.fetched_at >= touched.c.day,
+            Metric.fetched_at < touched.c.day + timedelta(days=1),
+        ))
+        .where(Metric.is_active == True)
+        .group_by(Metric.coin_id, bucket)
+    )
+
+
+def refresh_metric_rollups_sync(db: Session, since: datetime, until: datetime) -> int:
+    """
+    Recompute, inside the caller's transaction, every hourly and daily
+    rollup of each (coin, day) that had metrics written in (since, until].
+    The day's rollups are deleted and re-aggregated from its active
+    metrics, so buckets left empty disappear; the upsert covers days a
+    concurrent commit adds between statements. Returns the rows written.
+    """
+    touched = _touched_days(since, until)
+    db.execute(delete(MetricRollup).where(
+        MetricRollup.coin_id == touched.c.coin_id,
+        MetricRollup.bucket_start >= touched.c.day,
+        MetricRollup.bucket_start < touched.c.day + timedelta(days=1),
+    ))
+    written = 0
+    for resolution in ROLLUP_RESOLUTIONS:
+        stmt = insert(MetricRollup).from_select(ROLLUP_COLUMNS, _rollup_select(resolution, touched))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[MetricRollup.coin_id, MetricRollup.resolution, MetricRollup.bucket_start],
+            set_={
+                **{column: stmt.excluded[column] for column in ROLLUP_COLUMNS[3:]},
+                "updated_at": func.timezone("UTC", func.current_timestamp()),
+            },
+        )
+        written += db.execute(stmt).rowcount
+    return written
+
+
+def roll_up_new_metrics_sync(db: Session, full: bool = False, now: Optional[datetime] = None) -> int:
+    """
+    Roll up the metrics written since the stored watermark and advance it.
+    ``full`` (and the first run) re-aggregates every day that still has
+    metrics, e.g. after soft-deletes, which leave ``created_at`` untouched.
+    """
+    watermark = None if full else get_config_value_sync(db, WATERMARK_KEY)
+    since = datetime.fromisoformat(watermark) - WATERMARK_OVERLAP if watermark else EPOCH
+    until = now or datetime.utcnow()
+    written = refresh_metric_rollups_sync(db, since, until)
+    set_config_value_sync(db, WATERMARK_KEY, until.isoformat())
+    return written
+
+
+async def get_metric_rollups(
+    db: AsyncSession,
+    coin_id: UUID,
+    resolution: str,
+    start: datetime,
+    end: datetime,
+    limit: int,
+) -> list[MetricRollup]:
+    """A coin's rollups at ``resolution`` in [start, end), oldest first, keeping the latest ``limit``."""
+    result = await db.execute(
+        select(MetricRollup)
+        .where(
+            MetricRollup.coin_id == coin_id,
+            MetricRollup.resolution == resolution,
+            MetricRollup.bucket_start >= start,
+            MetricRollup.bucket_start < end,
+        )
+        .order_by(MetricRollup.bucket_start.desc())
+        .limit(limit)
+    )
+    return list(reversed(result.scalars().all()))
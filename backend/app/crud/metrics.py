@@ -1,9 +1,28 @@
+import uuid
+from datetime import datetime
+from typing import Optional, Sequence
 from uuid import UUID
 
+from sqlalchemy import Row, Select, func, insert, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.future import select
 
+from app.crud.latest_metrics import (
+    LATEST_METRIC_JOIN,
+    advance_latest_metrics,
+    advance_latest_metrics_sync,
+    metric_pointer_row,
+    refresh_latest_metrics,
+    refresh_latest_metrics_sync,
+)
+from app.crud.normalization_stats import (
+    mark_normalization_stats_stale,
+    mark_normalization_stats_stale_sync,
+    update_normalization_stats_sync,
+)
+from app.crud.quantile_sketches import add_quantile_sketch_delta_sync
+from app.models.coin_latest_metric import CoinLatestMetric
 from app.models.metric import Metric
 from app.schemas.metric import MetricCreate, MetricUpdate
 
@@ -12,6 +31,9 @@ async def create_metric(db: AsyncSession, metric_in: MetricCreate) -> Metric:
     """Create a new metric entry in the database."""
     metric = Metric(**metric_in.model_dump())
     db.add(metric)
+    await db.flush()
+    await advance_latest_metrics(db, [metric_pointer_row(metric)])
+    await mark_normalization_stats_stale(db)
     await db.commit()
     await db.refresh(metric)
     return metric
@@ -23,10 +45,102 @@ async def get_metric_by_id(db: AsyncSession, metric_id: UUID) -> Metric | None:
     return result.scalar_one_or_none()
 
 
-async def get_metrics_by_coin(db: AsyncSession, coin_id: UUID) -> list[Metric]:
-    """Retrieve all metrics for a given coin."""
-    result = await db.execute(select(Metric).where(Metric.coin_id == coin_id, Metric.is_active == True))
-    return result.scalars().all()
+def metric_columns(fields: Optional[Sequence[str]] = None) -> list:
+    """``id``, ``fetched_at`` and ``fields`` (every other column when None), in that order."""
+    names = fields or [column.name for column in Metric.__table__.columns]
+    return [Metric.id, Metric.fetched_at] + [
+        getattr(Metric, name) for name in names if name not in ("id", "fetched_at")
+    ]
+
+
+def metrics_export_query(
+    coin_ids: Optional[Sequence[UUID]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Select:
+    """
+    Active metrics fetched in [start, end) for bulk reads. With ``coin_ids``
+    rows come per coin in ``(fetched_at, id)`` order off the keyset index;
+    without, in storage order, so no sort delays the first row.
+    """
+    stmt = select(*metric_columns(fields)).where(Metric.is_active == True)
+    if start is not None:
+        stmt = stmt.where(Metric.fetched_at >= start)
+    if end is not None:
+        stmt = stmt.where(Metric.fetched_at < end)
+    if coin_ids:
+        stmt = stmt.where(Metric.coin_id.in_(coin_ids)).order_by(Metric.coin_id, Metric.fetched_at, Metric.id)
+    return stmt
+
+
+async def get_metrics_by_coin(
+    db: AsyncSession,
+    coin_id: UUID,
+    limit: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    after: Optional[tuple[datetime, UUID]] = None,
+    descending: bool = False,
+    fields: Optional[Sequence[str]] = None,
+) -> list[Row]:
+    """
+    One page of a coin's active metrics fetched in [start, end), ordered by
+    ``(fetched_at, id)`` and starting past the ``after`` key, so every page
+    is an index range scan however deep it is. Rows carry ``id``,
+    ``fetched_at`` and ``fields`` (every column when None).
+    """
+    key = tuple_(Metric.fetched_at, Metric.id)
+    stmt = select(*metric_columns(fields)).where(Metric.coin_id == coin_id, Metric.is_active == True)
+    if start is not None:
+        stmt = stmt.where(Metric.fetched_at >= start)
+    if end is not None:
+        stmt = stmt.where(Metric.fetched_at < end)
+    if after is not None:
+        stmt = stmt.where(key < tuple_(*after) if descending else key > tuple_(*after))
+    if descending:
+        stmt = stmt.order_by(Metric.fetched_at.desc(), Metric.id.desc())
+    else:
+        stmt = stmt.order_by(Metric.fetched_at, Metric.id)
+    result = await db.execute(stmt.limit(limit))
+    return result.all()
+
+
+async def get_metrics_in_range(
+    db: AsyncSession, coin_id: UUID, start: datetime, end: datetime, limit: int
+) -> list[Metric]:
+    """A coin's active metrics fetched in [start, end), oldest first, keeping the latest ``limit``."""
+    result = await db.execute(
+        select(Metric)
+        .where(
+            Metric.coin_id == coin_id,
+            Metric.is_active == True,
+            Metric.fetched_at >= start,
+            Metric.fetched_at < end,
+        )
+        .order_by(Metric.fetched_at.desc())
+        .limit(limit)
+    )
+    return list(reversed(result.scalars().all()))
+
+
+async def count_metrics_in_range(
+    db: AsyncSession, coin_id: UUID, start: datetime, end: datetime, cap: int
+) -> int:
+    """Active metrics of a coin fetched in [start, end), counting no further than ``cap``."""
+    capped = (
+        select(Metric.id)
+        .where(
+            Metric.coin_id == coin_id,
+            Metric.is_active == True,
+            Metric.fetched_at >= start,
+            Metric.fetched_at < end,
+        )
+        .limit(cap)
+        .subquery()
+    )
+    result = await db.execute(select(func.count()).select_from(capped))
+    return result.scalar_one()
 
 
 async def update_metric(
@@ -35,6 +149,9 @@ async def update_metric(
     """Update a metric in the database."""
     for field, value in metric_in.model_dump(exclude_unset=True).items():
         setattr(db_metric, field, value)
+    await db.flush()
+    await refresh_latest_metrics(db, [db_metric.coin_id])
+    await mark_normalization_stats_stale(db)
     await db.commit()
     await db.refresh(db_metric)
     return db_metric
@@ -43,24 +160,91 @@ async def update_metric(
 async def delete_metric(db: AsyncSession, db_metric: Metric) -> None:
     """Soft delete a metric."""
     db_metric.is_active = False
+    await db.flush()
+    await refresh_latest_metrics(db, [db_metric.coin_id])
+    await mark_normalization_stats_stale(db)
     await db.commit()
 
 
 def create_metric_sync(db: Session, metric_in: MetricCreate) -> Metric:
     metric = Metric(**metric_in.model_dump())
     db.add(metric)
+    db.flush()
+    advance_latest_metrics_sync(db, [metric_pointer_row(metric)])
+    update_normalization_stats_sync(db, [metric_in])
+    add_quantile_sketch_delta_sync(db, [metric_in])
     db.commit()
     db.refresh(metric)
     return metric
 
 
+def create_metrics_sync(db: Session, metrics_in: list[MetricCreate], commit: bool = True) -> int:
+    """
+    Insert a batch of metrics as multi-row INSERTs, advance the coins'
+    latest-metric pointers, fold them into the normalization stats and
+    record a quantile sketch delta. With ``commit=False`` the rows join
+    the caller's open transaction.
+    """
+    if not metrics_in:
+        return 0
+    rows = [{"id": uuid.uuid4(), **metric_in.model_dump()} for metric_in in metrics_in]
+    db.execute(insert(Metric), rows)
+    advance_latest_metrics_sync(db, rows)
+    update_normalization_stats_sync(db, metrics_in)
+    add_quantile_sketch_delta_sync(db, metrics_in)
+    if commit:
+        db.commit()
+    return len(metrics_in)
+
+
+def deactivate_metrics_sync(
+    db: Session,
+    keys: list[tuple[UUID, datetime]],
+    source: str,
+    commit: bool = True,
+) -> int:
+    """
+    Soft-delete the active metrics from ``source`` at exactly the given
+    (coin_id, fetched_at) keys and flag the normalization stats for
+    recomputation. Returns the number of rows deactivated.
+    """
+    if not keys:
+        return 0
+    fetched = [fetched_at for _, fetched_at in keys]
+    coin_ids = list({coin_id for coin_id, _ in keys})
+    result = db.execute(
+        update(Metric)
+        .where(
+            tuple_(Metric.coin_id, Metric.fetched_at).in_(keys),
+            Metric.source == source,
+            Metric.is_active == True,
+            # Redundant with the keys, but lets Postgres prune partitions
+            Metric.fetched_at >= min(fetched),
+            Metric.fetched_at <= max(fetched),
+        )
+        .values(is_active=False)
+        .execution_options(synchronize_session=False)
+    )
+    refresh_latest_metrics_sync(db, coin_ids)
+    mark_normalization_stats_stale_sync(db)
+    if commit:
+        db.commit()
+    return result.rowcount
+
+
+def get_latest_active_metrics_sync(db: Session) -> dict[UUID, Metric]:
+    """Latest active metric of every coin, keyed by coin ID, via the latest-metric pointers."""
+    result = db.execute(
+        select(Metric).join(CoinLatestMetric, LATEST_METRIC_JOIN)
+    )
+    return {metric.coin_id: metric for metric in result.scalars().all()}
+
+
 def get_latest_active_by_coin_sync(db: Session, coin_id: UUID) -> Metric | None:
+    """Latest active metric of one coin: a primary-key probe on its pointer."""
     return (
         db.query(Metric)
-        .filter(
-            Metric.coin_id == coin_id,
-            Metric.is_active == True,
-        )
-        .order_by(Metric.fetched_at.desc())
+        .join(CoinLatestMetric, LATEST_METRIC_JOIN)
+        .filter(CoinLatestMetric.coin_id == coin_id)
         .first()
     )
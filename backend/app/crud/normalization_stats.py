@@ -0,0 +1,158 @@
+from typing import Iterable
+
+from loguru import logger
+from sqlalchemy import Float, String, column, func, select, update, values as sa_values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.crud.latest_metrics import LATEST_METRIC_JOIN
+from app.models.coin_latest_metric import CoinLatestMetric
+from app.models.metric import Metric
+from app.models.normalization_stat import NormalizationStat
+from app.schemas.metric import MetricCreate
+
+# Keys match what `find_max_metrics` has always returned.
+STAT_NAMES = ("max_liquidity", "max_github_activity", "max_community", "max_market")
+
+
+def metric_stat_values(metric: MetricCreate | Metric) -> dict[str, float]:
+    """The value each normalization stat takes from a single metric."""
+    return {
+        "max_liquidity": metric.liquidity or 0,
+        "max_github_activity": metric.github_activity or 0,
+        "max_community": (metric.twitter_sentiment or 0) + (metric.reddit_sentiment or 0),
+        "max_market": (metric.market_cap or 0) + (metric.volume_24h or 0),
+    }
+
+
+def update_normalization_stats_sync(db: Session, metrics_in: Iterable[MetricCreate | Metric]) -> None:
+    """
+    Fold freshly written metrics into the stats inside the caller's
+    transaction. A new maximum is taken over directly; a drop in the
+    current holder's value marks the stat stale, since the runner-up is
+    unknown. Both are single conditional statements that take no explicit
+    row locks, so concurrent writers only wait on the rows they change.
+    Missing stat rows are inserted stale, to be filled by the next
+    recompute.
+    """
+    latest: dict = {}
+    for metric in metrics_in:
+        previous = latest.get(metric.coin_id)
+        if previous is None or not (metric.fetched_at and previous.fetched_at) or metric.fetched_at >= previous.fetched_at:
+            latest[metric.coin_id] = metric
+    if not latest:
+        return
+
+    values = {coin_id: metric_stat_values(metric) for coin_id, metric in latest.items()}
+    candidates = []
+    for name in sorted(STAT_NAMES):
+        best_coin, best = max(
+            ((coin_id, coin_values[name]) for coin_id, coin_values in values.items()),
+            key=lambda item: item[1],
+        )
+        candidates.append({"name": name, "value": best, "holder_coin_id": best_coin, "is_stale": True})
+
+    # Rows go in name order, so concurrent writers lock them in the same order
+    stmt = insert(NormalizationStat).values(candidates)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[NormalizationStat.name],
+        set_={
+            "value": stmt.excluded.value,
+            "holder_coin_id": stmt.excluded.holder_coin_id,
+            "updated_at": func.timezone("UTC", func.current_timestamp()),
+        },
+        where=stmt.excluded.value > func.coalesce(NormalizationStat.value, 0),
+    ))
+
+    # Runs after the takeover, so a holder outrun in this batch is no longer the holder
+    batch = sa_values(
+        column("name", String), column("coin_id", PG_UUID(as_uuid=True)), column("value", Float),
+        name="batch",
+    ).data([
+        (name, coin_id, coin_values[name])
+        for name in STAT_NAMES
+        for coin_id, coin_values in values.items()
+    ])
+    db.execute(
+        update(NormalizationStat)
+        .where(
+            NormalizationStat.name == batch.c.name,
+            NormalizationStat.holder_coin_id == batch.c.coin_id,
+            batch.c.value < NormalizationStat.value,
+        )
+        .values(is_stale=True)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def mark_normalization_stats_stale_sync(db: Session) -> None:
+    """Flag every stat for recomputation, e.g. after metrics are deactivated."""
+    db.execute(update(NormalizationStat).values(is_stale=True))
+
+
+async def mark_normalization_stats_stale(db: AsyncSession) -> None:
+    await db.execute(update(NormalizationStat).values(is_stale=True))
+
+
+def latest_stat_values():
+    """Each coin's latest active metric reduced to the four stat inputs."""
+    return (
+        select(
+            Metric.coin_id,
+            Metric.liquidity.label("max_liquidity"),
+            Metric.github_activity.label("max_github_activity"),
+            (func.coalesce(Metric.twitter_sentiment, 0) + func.coalesce(Metric.reddit_sentiment, 0)).label("max_community"),
+            (func.coalesce(Metric.market_cap, 0) + func.coalesce(Metric.volume_24h, 0)).label("max_market"),
+        )
+        .join(CoinLatestMetric, LATEST_METRIC_JOIN)
+        .subquery()
+    )
+
+
+def recompute_normalization_stats_sync(db: Session, commit: bool = True) -> dict[str, float | None]:
+    """Rebuild every stat (value and holder) from the latest active metrics."""
+    latest = latest_stat_values()
+    rows = []
+    for name in STAT_NAMES:
+        column = latest.c[name]
+        top = db.execute(
+            select(latest.c.coin_id, column).order_by(column.desc().nullslast()).limit(1)
+        ).first()
+        rows.append({
+            "name": name,
+            "value": top[1] if top else None,
+            "holder_coin_id": top[0] if top else None,
+            "is_stale": False,
+        })
+
+    stmt = insert(NormalizationStat).values(rows)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[NormalizationStat.name],
+        set_={
+            "value": stmt.excluded.value,
+            "holder_coin_id": stmt.excluded.holder_coin_id,
+            "is_stale": False,
+            "updated_at": func.timezone("UTC", func.current_timestamp()),
+        },
+    ))
+    if commit:
+        db.commit()
+
+    results = {row["name"]: row["value"] for row in rows}
+    logger.info("[Scoring] Recomputed normalization stats: {}", results)
+    return results
+
+
+def get_normalization_maxima_sync(db: Session) -> dict[str, float]:
+    """
+    Normalization constants for scoring, read from the stats table. They
+    are recomputed first only if a stat is missing or stale. Zero or
+    missing maxima fall back to 1 so callers can always divide.
+    """
+    stats = {stat.name: stat for stat in db.execute(select(NormalizationStat)).scalars()}
+    if any(name not in stats or stats[name].is_stale for name in STAT_NAMES):
+        values = recompute_normalization_stats_sync(db)
+    else:
+        values = {name: stats[name].value for name in STAT_NAMES}
+    return {name: values[name] or 1 for name in STAT_NAMES}
@@ -0,0 +1,98 @@
+from typing import Iterable
+
+from loguru import logger
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.normalization_stats import STAT_NAMES, latest_stat_values, metric_stat_values
+from app.models.metric import Metric
+from app.models.quantile_sketch import QuantileSketch, QuantileSketchDelta
+from app.schemas.metric import MetricCreate
+from app.utils.quantile_sketch import KLLSketch
+
+# One sketch per scoring input, in component order; each sketches the
+# value of the matching normalization stat.
+SKETCH_NAMES = ("liquidity", "github_activity", "community", "market")
+SKETCH_STATS = dict(zip(SKETCH_NAMES, STAT_NAMES, strict=True))
+
+
+def metric_sketch_values(metric: MetricCreate | Metric) -> dict[str, float]:
+    values = metric_stat_values(metric)
+    return {name: values[stat] for name, stat in SKETCH_STATS.items()}
+
+
+def add_quantile_sketch_delta_sync(db: Session, metrics_in: Iterable[MetricCreate | Metric]) -> None:
+    """
+    Sketch a batch of freshly written metrics and store it as one delta
+    row inside the caller's transaction. A plain INSERT, so concurrent
+    ingestion shards take no shared row locks.
+    """
+    sketches = {name: KLLSketch(k=settings.QUANTILE_SKETCH_K) for name in SKETCH_NAMES}
+    for metric in metrics_in:
+        for name, value in metric_sketch_values(metric).items():
+            sketches[name].update(value)
+    count = sketches[SKETCH_NAMES[0]].count
+    if count:
+        db.execute(insert(QuantileSketchDelta).values(
+            sketches={name: sketch.to_dict() for name, sketch in sketches.items()},
+            count=count,
+        ))
+
+
+def rebuild_quantile_sketches_sync(db: Session, commit: bool = True) -> dict[str, KLLSketch]:
+    """
+    Rebuild every sketch from the latest active metric of each coin,
+    streamed in batches, and drop the deltas it supersedes. This
+    compaction also sheds the superseded values deltas accumulate.
+    """
+    sketches = {name: KLLSketch(k=settings.QUANTILE_SKETCH_K) for name in SKETCH_NAMES}
+    # Deltas committed after this point may be missed by the scan, so they are kept
+    compacted = db.execute(select(QuantileSketchDelta.id)).scalars().all()
+    latest = latest_stat_values()
+    result = db.execute(
+        select(*(latest.c[stat] for stat in SKETCH_STATS.values())).execution_options(yield_per=5000)
+    )
+    for row in result:
+        for name, value in zip(SKETCH_NAMES, row, strict=True):
+            sketches[name].update(value or 0)
+
+    stmt = insert(QuantileSketch).values([
+        {"name": name, "sketch": sketch.to_dict(), "count": sketch.count}
+        for name, sketch in sketches.items()
+    ])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[QuantileSketch.name],
+        set_={
+            "sketch": stmt.excluded.sketch,
+            "count": stmt.excluded.count,
+            "updated_at": func.timezone("UTC", func.current_timestamp()),
+        },
+    ))
+    if compacted:
+        db.execute(delete(QuantileSketchDelta).where(QuantileSketchDelta.id.in_(compacted)))
+    if commit:
+        db.commit()
+
+    logger.info(
+        "[Scoring] Rebuilt quantile sketches over {} coins, compacting {} deltas",
+        sketches[SKETCH_NAMES[0]].count, len(compacted),
+    )
+    return sketches
+
+
+def get_quantile_sketches_sync(db: Session) -> dict[str, KLLSketch]:
+    """
+    Sketches for percentile normalization: the last rebuild merged with
+    every delta written since. Rebuilt first if any sketch is missing.
+    """
+    rows = {row.name: row for row in db.execute(select(QuantileSketch)).scalars()}
+    if any(name not in rows for name in SKETCH_NAMES):
+        return rebuild_quantile_sketches_sync(db)
+    sketches = {name: KLLSketch.from_dict(rows[name].sketch) for name in SKETCH_NAMES}
+    for delta in db.execute(select(QuantileSketchDelta.sketches)).scalars():
+        for name, sketch in sketches.items():
+            if name in delta:
+                sketch.merge(KLLSketch.from_dict(delta[name]))
+    return sketches
@@ -0,0 +1,90 @@
+from datetime import datetime
+from typing import Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.partitions import (
+    add_months,
+    drop_partitions_before_sync,
+    ensure_monthly_partitions_sync,
+    month_start,
+)
+from app.models.score import Score
+from app.models.score_history import ScoreHistory
+
+HISTORY_FIELDS = (
+    "coin_id",
+    "scoring_weight_id",
+    "liquidity_score",
+    "developer_score",
+    "community_score",
+    "market_score",
+    "final_score",
+)
+
+
+def record_score_history_sync(
+    db: Session,
+    scoring_weight_ids: Sequence[UUID],
+    scored_at: datetime,
+    coin_ids: Optional[Sequence[UUID]] = None,
+) -> int:
+    """
+    Append the current scores of ``scoring_weight_ids`` (only ``coin_ids``
+    when given) to the history as one ``INSERT ... SELECT``, inside the
+    caller's transaction. Returns the rows appended.
+    """
+    if not scoring_weight_ids or (coin_ids is not None and not coin_ids):
+        return 0
+    current = select(
+        *(getattr(Score, field) for field in HISTORY_FIELDS),
+        literal(scored_at, ScoreHistory.scored_at.type),
+    ).where(Score.scoring_weight_id.in_(scoring_weight_ids))
+    if coin_ids is not None:
+        current = current.where(Score.coin_id.in_(coin_ids))
+    stmt = insert(ScoreHistory).from_select([*HISTORY_FIELDS, "scored_at"], current)
+    return db.execute(stmt.on_conflict_do_nothing()).rowcount
+
+
+async def get_score_trajectory(
+    db: AsyncSession,
+    coin_id: UUID,
+    scoring_weight_id: UUID,
+    start: datetime,
+    end: datetime,
+    limit: int,
+) -> list[ScoreHistory]:
+    """A coin's history under a weight in [start, end), oldest first, keeping the latest ``limit`` points."""
+    result = await db.execute(
+        select(ScoreHistory)
+        .where(
+            ScoreHistory.coin_id == coin_id,
+            ScoreHistory.scoring_weight_id == scoring_weight_id,
+            ScoreHistory.scored_at >= start,
+            ScoreHistory.scored_at < end,
+        )
+        .order_by(ScoreHistory.scored_at.desc())
+        .limit(limit)
+    )
+    return list(reversed(result.scalars().all()))
+
+
+def ensure_score_history_partitions_sync(db: Session, now: Optional[datetime] = None) -> list[str]:
+    """Create this month's partition and ``SCORE_HISTORY_PARTITIONS_AHEAD`` more."""
+    now = now or datetime.utcnow()
+    return ensure_monthly_partitions_sync(
+        db, ScoreHistory.__tablename__, now, settings.SCORE_HISTORY_PARTITIONS_AHEAD + 1
+    )
+
+
+def drop_expired_score_history_sync(db: Session, now: Optional[datetime] = None) -> list[str]:
+    """Drop partitions older than ``SCORE_HISTORY_RETENTION_MONTHS`` (0 keeps everything)."""
+    if settings.SCORE_HISTORY_RETENTION_MONTHS <= 0:
+        return []
+    cutoff = add_months(month_start(now or datetime.utcnow()), -settings.SCORE_HISTORY_RETENTION_MONTHS)
+    return drop_partitions_before_sync(db, ScoreHistory.__tablename__, cutoff)
@@ -3,9 +3,13 @@ from uuid import UUID
 from typing import Optional
 
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
 
 from app.models.score import Score
 from app.schemas.score import ScoreCreate, ScoreUpdate
@@ -41,6 +45,63 @@ async def get_scores_by_coin(
     return result.scalars().all()
 
 
+async def get_top_scores(
+    db: AsyncSession,
+    scoring_weight_id: UUID,
+    limit: int,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+) -> list[tuple[UUID, float]]:
+    """
+    ``(coin_id, final_score)`` pairs of a weight, best first, optionally
+    within [min_score, max_score]. Ties are broken by coin_id descending,
+    matching the order of the Redis leaderboard.
+    """
+    query = select(Score.coin_id, Score.final_score).where(Score.scoring_weight_id == scoring_weight_id)
+    if min_score is not None:
+        query = query.where(Score.final_score >= min_score)
+    if max_score is not None:
+        query = query.where(Score.final_score <= max_score)
+    result = await db.execute(
+        query.order_by(Score.final_score.desc(), Score.coin_id.desc()).limit(limit)
+    )
+    return [(coin_id, final_score) for coin_id, final_score in result.all()]
+
+
+async def count_scores(
+    db: AsyncSession, scoring_weight_id: UUID, above: Optional[float] = None
+) -> int:
+    """Number of scores of a weight, or only those strictly above ``above``."""
+    query = select(func.count()).select_from(Score).where(Score.scoring_weight_id == scoring_weight_id)
+    if above is not None:
+        query = query.where(Score.final_score > above)
+    return (await db.execute(query)).scalar_one()
+
+
+async def get_score_rank(
+    db: AsyncSession, scoring_weight_id: UUID, coin_id: UUID
+) -> Optional[tuple[int, float]]:
+    """1-based leaderboard position and final score of a coin, or None if unscored."""
+    result = await db.execute(
+        select(Score.final_score).where(
+            Score.scoring_weight_id == scoring_weight_id, Score.coin_id == coin_id
+        )
+    )
+    final_score = result.scalar_one_or_none()
+    if final_score is None:
+        return None
+    ahead = await db.execute(
+        select(func.count()).select_from(Score).where(
+            Score.scoring_weight_id == scoring_weight_id,
+            or_(
+                Score.final_score > final_score,
+                and_(Score.final_score == final_score, Score.coin_id > coin_id),
+            ),
+        )
+    )
+    return ahead.scalar_one() + 1, final_score
+
+
 async def update_score(
     db: AsyncSession, db_score: Score, score_in: ScoreUpdate
 ) -> Score:
@@ -54,3 +115,47 @@ async def update_score(
 async def delete_score(db: AsyncSession, db_score: Score) -> None:
     await db.delete(db_score)
     await db.commit()
+
+
+# Columns refreshed when a (coin, weight) score already exists
+SCORE_VALUE_FIELDS = ("liquidity_score", "developer_score", "community_score", "market_score", "final_score")
+
+
+def bulk_upsert_scores_sync(
+    db: Session,
+    scores_in: list[dict],
+    batch_size: Optional[int] = None,
+    commit: bool = True,
+) -> int:
+    """
+    Insert or update many scores with multi-row
+    ``INSERT ... ON CONFLICT ON CONSTRAINT uix_coin_weight DO UPDATE``
+    statements of ``batch_size`` rows. All batches share one transaction,
+    committed at the end (unless ``commit=False``), so readers see either
+    the previous scores or the complete new set. Each row holds coin_id,
+    scoring_weight_id and the score fields. Returns the rows written.
+    """
+    if not scores_in:
+        return 0
+    batch_size = batch_size or settings.SCORE_UPSERT_BATCH_SIZE
+    try:
+        for start in range(0, len(scores_in), batch_size):
+            stmt = insert(Score).values(scores_in[start:start + batch_size])
+            db.execute(stmt.on_conflict_do_update(
+                constraint="uix_coin_weight",
+                set_={field: stmt.excluded[field] for field in SCORE_VALUE_FIELDS},
+            ))
+        if commit:
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return len(scores_in)
+
+
+def get_final_scores_sync(db: Session, scoring_weight_id: UUID) -> list[tuple[UUID, float]]:
+    """Every ``(coin_id, final_score)`` of a weight, e.g. to rebuild its leaderboard."""
+    result = db.execute(
+        select(Score.coin_id, Score.final_score).where(Score.scoring_weight_id == scoring_weight_id)
+    )
+    return [(coin_id, final_score) for coin_id, final_score in result.all()]
@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.metric import Metric
+from app.models.scoring_run import ScoringRun
+
+
+def get_last_scoring_run_sync(db: Session, scoring_weight_id: UUID) -> Optional[ScoringRun]:
+    return db.execute(
+        select(ScoringRun)
+        .where(ScoringRun.scoring_weight_id == scoring_weight_id)
+        .order_by(ScoringRun.finished_at.desc(), ScoringRun.started_at.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+
+
+def get_metrics_high_water_mark_sync(db: Session) -> Optional[datetime]:
+    """Newest `Metric.created_at`, the point an incremental run catches up to."""
+    return db.execute(select(func.max(Metric.created_at))).scalar()
+
+
+def create_scoring_run_sync(db: Session, commit: bool = True, **fields) -> ScoringRun:
+    """Record a scoring run. With ``commit=False`` it joins the caller's transaction."""
+    run = ScoringRun(**fields)
+    db.add(run)
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    return run
@@ -60,4 +60,8 @@ async def delete_scoring_weight(
 
 
 def getsync(db: Session, weight_id: UUID) -> ScoringWeight | None:
-    return db.query(ScoringWeight).filter(ScoringWeight.id == weight_id).first()
\ No newline at end of file
+    return db.query(ScoringWeight).filter(ScoringWeight.id == weight_id).first()
+
+
+def get_all_sync(db: Session) -> list[ScoringWeight]:
+    return db.query(ScoringWeight).order_by(ScoringWeight.created_at).all()
@@ -0,0 +1,134 @@
+"""Helpers for tables range-partitioned by month on a timestamp column."""
+
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Union
+
+from sqlalchemy import DDL, Connection, Table, event, text
+from sqlalchemy.orm import Session
+
+# Partition maintenance runs from ORM sessions (tasks) and raw connections (migrations)
+Executor = Union[Session, Connection]
+
+_BOUNDS = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+@dataclass
+class Partition:
+    name: str
+    lower: Optional[datetime]  # None for the DEFAULT partition
+    upper: Optional[datetime]
+
+    @property
+    def is_default(self) -> bool:
+        return self.lower is None
+
+
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def months_between(start: datetime, end: datetime) -> int:
+    """Number of calendar months from ``start``'s month through ``end``'s, inclusive."""
+    return (end.year - start.year) * 12 + end.month - start.month + 1
+
+
+def monthly_partition_name(table: str, month: datetime) -> str:
+    return f"{table}_{month:%Y_%m}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def attach_default_partition(table: Table) -> None:
+    """
+    Create ``table``'s DEFAULT partition right after the parent, so rows
+    outside every monthly partition are still accepted. Migrations must
+    emit the same statement since Alembic does not run DDL events.
+    """
+    event.listen(
+        table,
+        "after_create",
+        DDL(f'CREATE TABLE IF NOT EXISTS "{default_partition_name(table.name)}" PARTITION OF "{table.name}" DEFAULT'),
+    )
+
+
+def ensure_monthly_partitions_sync(db: Executor, table: str, start: datetime, months: int) -> list[str]:
+    """
+    Create the monthly partitions of ``table`` covering ``months`` months
+    from ``start``'s month, skipping those that exist. Partitions must be
+    created before rows for their month land in the DEFAULT partition,
+    which is why maintenance creates them ahead of time. Returns every
+    partition name in the window.
+    """
+    names = []
+    lower = month_start(start)
+    for _ in range(months):
+        upper = add_months(lower, 1)
+        name = monthly_partition_name(table, lower)
+        db.execute(text(
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+            f"FOR VALUES FROM ('{lower.isoformat(sep=' ')}') TO ('{upper.isoformat(sep=' ')}')"
+        ))
+        names.append(name)
+        lower = upper
+    return names
+
+
+def list_partitions_sync(db: Executor, table: str) -> list[Partition]:
+    """Partitions attached to ``table`` with their bounds, oldest first, DEFAULT last."""
+    rows = db.execute(
+        text(
+            "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+            "FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table},
+    ).all()
+    partitions = []
+    for name, bound in rows:
+        match = _BOUNDS.search(bound or "")
+        if match:
+            partitions.append(Partition(name, datetime.fromisoformat(match[1]), datetime.fromisoformat(match[2])))
+        else:
+            partitions.append(Partition(name, None, None))
+    return sorted(partitions, key=lambda p: (p.is_default, p.lower or datetime.max))
+
+
+def is_partitioned_sync(db: Executor, table: str) -> bool:
+    relkind = db.execute(text("SELECT relkind FROM pg_class WHERE relname = :table"), {"table": table}).scalar()
+    return relkind == "p"
+
+
+def drop_partitions_before_sync(
+    db: Executor,
+    table: str,
+    cutoff: datetime,
+    detach: bool = False,
+) -> list[str]:
+    """
+    Drop every monthly partition of ``table`` that ends on or before
+    ``cutoff``: a metadata-only operation, unlike deleting the rows. With
+    ``detach`` the partitions are only detached and survive as standalone
+    tables (e.g. to be archived). The DEFAULT partition is never touched.
+    Returns the affected partition names.
+    """
+    retired = []
+    for partition in list_partitions_sync(db, table):
+        if partition.is_default or partition.upper > cutoff:
+            continue
+        if detach:
+            db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{partition.name}"'))
+        else:
+            db.execute(text(f'DROP TABLE IF EXISTS "{partition.name}"'))
+        retired.append(partition.name)
+    return retired
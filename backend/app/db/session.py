@@ -46,3 +46,11 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+
+
+def get_session_factory() -> sessionmaker:
+    """
+    Session factory for responses that read the database while streaming:
+    FastAPI closes ``get_db`` sessions before the body is sent.
+    """
+    return AsyncSessionLocal
@@ -3,12 +3,13 @@ from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.v1 import (
-    auth, coins,
+    auth, coins, leaderboard,
     scores, scoring_weights,
     metrics, suggestions, users
 )
 from app.core.config import settings
 from app.core.logging import logger
+from app.utils.pagination import NEXT_CURSOR_HEADER
 
 from app.api.health import router as health_router
 
@@ -26,6 +27,8 @@ tags_metadata = [
           detailed metadata"},
         {"name": "scores", "description": "Stores and retrieves evaluation \
           scores for coins based on predefined criteria"},
+        {"name": "leaderboard", "description": "Ranks coins by final score \
+          for each scoring weight"},
         {"name": "scoring_weights", "description": "Defines the weighting of \
           different scoring factors to calculate overall coin ratings"},
         {"name": "suggestions", "description": "Captures and manages analyst \
@@ -67,6 +70,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
     # Healthcheck & Root
@@ -81,6 +85,9 @@ def create_app() -> FastAPI:
     app.include_router(users.router, prefix=API_PREFIX, tags=["users"])
     app.include_router(coins.router, prefix=API_PREFIX, tags=["coins"])
     app.include_router(scores.router, prefix=API_PREFIX, tags=["scores"])
+    app.include_router(
+        leaderboard.router, prefix=API_PREFIX, tags=["leaderboard"]
+    )
     app.include_router(
         scoring_weights.router, prefix=API_PREFIX, tags=["scoring_weights"]
     )
@@ -9,3 +9,10 @@ from .scoring_weight import ScoringWeight  # noqa
 from .score import Score  # noqa
 from .suggestion import Suggestion, SuggestionStatus  # noqa
 from .user_activity import UserActivity  # noqa
+from .normalization_stat import NormalizationStat  # noqa
+from .scoring_run import ScoringRun  # noqa
+from .coin_latest_metric import CoinLatestMetric  # noqa
+from .quantile_sketch import QuantileSketch, QuantileSketchDelta  # noqa
+from .score_history import ScoreHistory  # noqa
+from .config import Config  # noqa
+from .metric_rollup import MetricRollup  # noqa
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class CoinLatestMetric(Base):
+    """
+    Pointer from each coin to its latest active metric, maintained on every
+    metric write so latest-metric lookups are a primary-key probe instead
+    of a sort over the coin's history. ``metric_id`` deliberately has no
+    foreign key so the metrics table stays free to be partitioned.
+    """
+
+    __tablename__ = "coin_latest_metrics"
+
+    coin_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("coins.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    metric_id = Column(UUID(as_uuid=True), nullable=False)
+    fetched_at = Column(DateTime, nullable=False)
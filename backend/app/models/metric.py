@@ -1,11 +1,23 @@
 import uuid
-from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, func
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Index, String, func
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
+from app.db.partitions import attach_default_partition
+
+# Where a metric row came from: a full per-coin fetch or the bulk market refresh
+METRIC_SOURCE_COIN = "coin"
+METRIC_SOURCE_MARKETS = "markets"
 
 
 class Metric(Base):
+    """
+    One snapshot of a coin's market, developer and community figures.
+    Range-partitioned by month on ``fetched_at`` (part of the primary key,
+    as Postgres requires); see `app.crud.metric_partitions`.
+    """
+
     __tablename__ = "metrics"
+    __table_args__ = {"postgresql_partition_by": "RANGE (fetched_at)"}
 
     id = Column(
         UUID(as_uuid=True),
@@ -27,8 +39,16 @@ class Metric(Base):
     twitter_sentiment = Column(Float, nullable=True)
     reddit_sentiment = Column(Float, nullable=True)
 
+    source = Column(
+        String,
+        nullable=False,
+        default=METRIC_SOURCE_COIN,
+        server_default=METRIC_SOURCE_COIN,
+    )
+
     fetched_at = Column(
         DateTime,
+        primary_key=True,
         nullable=False,
         server_default=func.timezone("UTC", func.current_timestamp()),
     )
@@ -38,3 +58,34 @@ class Metric(Base):
         nullable=False,
         server_default=func.timezone("UTC", func.current_timestamp()),
     )
+
+
+attach_default_partition(Metric.__table__)
+
+# Serves "latest active metric per coin" scans and pointer rebuilds
+Index(
+    "ix_metrics_coin_active_fetched",
+    Metric.coin_id,
+    Metric.is_active,
+    Metric.fetched_at.desc(),
+)
+
+# Last full fetch per coin for the refresh scheduler
+Index(
+    "ix_metrics_coin_full_fetch",
+    Metric.coin_id,
+    Metric.fetched_at.desc(),
+    postgresql_where=(Metric.is_active == True) & (Metric.source == METRIC_SOURCE_COIN),
+)
+
+# Keyset pagination of a coin's active history on (fetched_at, id)
+Index(
+    "ix_metrics_coin_fetched_id_active",
+    Metric.coin_id,
+    Metric.fetched_at,
+    Metric.id,
+    postgresql_where=Metric.is_active == True,
+)
+
+# Lets incremental consumers (rollups) find rows written since a watermark
+Index("ix_metrics_created_at", Metric.created_at)
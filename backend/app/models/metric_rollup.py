@@ -0,0 +1,75 @@
+from sqlalchemy import Column, DateTime, Float, Integer, String, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+# Bucket widths of a rollup row; "raw" reads the metrics table itself
+RESOLUTION_RAW = "raw"
+RESOLUTION_HOUR = "hour"
+RESOLUTION_DAY = "day"
+ROLLUP_RESOLUTIONS = (RESOLUTION_HOUR, RESOLUTION_DAY)
+
+# Metric fields summarized by every rollup row, as <field>_min/_max/_avg/_last
+ROLLUP_FIELDS = (
+    "market_cap",
+    "volume_24h",
+    "liquidity",
+    "github_activity",
+    "twitter_sentiment",
+    "reddit_sentiment",
+)
+ROLLUP_AGGREGATES = ("min", "max", "avg", "last")
+
+
+class MetricRollup(Base):
+    """
+    Hourly or daily summary of a coin's active metrics, so long-range
+    history reads one row per bucket instead of every snapshot. ``_last``
+    is the latest non-null value in the bucket. Rows are recomputed whole
+    by `app.crud.metric_rollups` and outlive metrics partition retention.
+    """
+
+    __tablename__ = "metric_rollups"
+
+    coin_id = Column(UUID(as_uuid=True), primary_key=True)
+    resolution = Column(String, primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+
+    sample_count = Column(Integer, nullable=False)
+    last_fetched_at = Column(DateTime, nullable=False)
+
+    market_cap_min = Column(Float, nullable=True)
+    market_cap_max = Column(Float, nullable=True)
+    market_cap_avg = Column(Float, nullable=True)
+    market_cap_last = Column(Float, nullable=True)
+
+    volume_24h_min = Column(Float, nullable=True)
+    volume_24h_max = Column(Float, nullable=True)
+    volume_24h_avg = Column(Float, nullable=True)
+    volume_24h_last = Column(Float, nullable=True)
+
+    liquidity_min = Column(Float, nullable=True)
+    liquidity_max = Column(Float, nullable=True)
+    liquidity_avg = Column(Float, nullable=True)
+    liquidity_last = Column(Float, nullable=True)
+
+    github_activity_min = Column(Float, nullable=True)
+    github_activity_max = Column(Float, nullable=True)
+    github_activity_avg = Column(Float, nullable=True)
+    github_activity_last = Column(Float, nullable=True)
+
+    twitter_sentiment_min = Column(Float, nullable=True)
+    twitter_sentiment_max = Column(Float, nullable=True)
+    twitter_sentiment_avg = Column(Float, nullable=True)
+    twitter_sentiment_last = Column(Float, nullable=True)
+
+    reddit_sentiment_min = Column(Float, nullable=True)
+    reddit_sentiment_max = Column(Float, nullable=True)
+    reddit_sentiment_avg = Column(Float, nullable=True)
+    reddit_sentiment_last = Column(Float, nullable=True)
+
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        server_default=func.timezone("UTC", func.current_timestamp()),
+    )
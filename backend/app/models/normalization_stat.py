@@ -0,0 +1,26 @@
+from sqlalchemy import Boolean, Column, DateTime, Float, String, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class NormalizationStat(Base):
+    """
+    Running maximum of one scoring input over every coin's latest active
+    metric, e.g. ``max_liquidity``. ``holder_coin_id`` is the coin that
+    currently sets the maximum; when its value drops the true maximum is
+    unknown, so the row is flagged ``is_stale`` until the next recompute.
+    """
+
+    __tablename__ = "normalization_stats"
+
+    name = Column(String, primary_key=True)
+    value = Column(Float, nullable=True)
+    holder_coin_id = Column(UUID(as_uuid=True), nullable=True)
+    is_stale = Column(Boolean, default=False, nullable=False)
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        server_default=func.timezone("UTC", func.current_timestamp()),
+        onupdate=func.timezone("UTC", func.current_timestamp()),
+    )
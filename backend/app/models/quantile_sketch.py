@@ -0,0 +1,47 @@
+import uuid
+
+from sqlalchemy import JSON, Column, DateTime, Integer, String, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class QuantileSketch(Base):
+    """
+    Serialized KLL sketch (see `app.utils.quantile_sketch`) of one scoring
+    input, e.g. ``market``, used for percentile-rank normalization. It is
+    rebuilt from every coin's latest active metric on a schedule; metrics
+    written since then live in `QuantileSketchDelta` rows that readers
+    merge in and the rebuild compacts away.
+    """
+
+    __tablename__ = "quantile_sketches"
+
+    name = Column(String, primary_key=True)
+    sketch = Column(JSON, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        server_default=func.timezone("UTC", func.current_timestamp()),
+        onupdate=func.timezone("UTC", func.current_timestamp()),
+    )
+
+
+class QuantileSketchDelta(Base):
+    """
+    Serialized KLL sketches, keyed by sketch name, of the metrics written
+    in one batch. Deltas are insert-only, so concurrent writers never
+    contend for the base sketch rows.
+    """
+
+    __tablename__ = "quantile_sketch_deltas"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    sketches = Column(JSON, nullable=False)
+    count = Column(Integer, nullable=False)
+    created_at = Column(
+        DateTime,
+        nullable=False,
+        server_default=func.timezone("UTC", func.current_timestamp()),
+    )
@@ -5,6 +5,7 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     UniqueConstraint,
     func,
 )
@@ -53,3 +54,12 @@ class Score(Base):
         nullable=False,
         server_default=func.timezone("UTC", func.current_timestamp()),
     )
+
+
+# Leaderboard order (best first, ties broken by coin_id like a Redis sorted set)
+Index(
+    "ix_scores_weight_final_coin",
+    Score.scoring_weight_id,
+    Score.final_score.desc(),
+    Score.coin_id.desc(),
+)
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, DateTime, Float
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+from app.db.partitions import attach_default_partition
+
+
+class ScoreHistory(Base):
+    """
+    Append-only copy of every score written by a scoring run, stamped with
+    the run's start time. Range-partitioned by month on ``scored_at`` so
+    trajectory queries prune to the months they cover and expired history
+    is dropped a partition at a time. Coins and weights are not foreign
+    keys, so history outlives them and no cascades scan the partitions.
+    """
+
+    __tablename__ = "score_history"
+    __table_args__ = {"postgresql_partition_by": "RANGE (scored_at)"}
+
+    coin_id = Column(UUID(as_uuid=True), primary_key=True)
+    scoring_weight_id = Column(UUID(as_uuid=True), primary_key=True)
+    scored_at = Column(DateTime, primary_key=True)
+
+    liquidity_score = Column(Float, nullable=False)
+    developer_score = Column(Float, nullable=False)
+    community_score = Column(Float, nullable=False)
+    market_score = Column(Float, nullable=False)
+    final_score = Column(Float, nullable=False)
+
+
+attach_default_partition(ScoreHistory.__table__)
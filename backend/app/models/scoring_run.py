@@ -0,0 +1,45 @@
+import uuid
+
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, Integer, String, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+# How a scoring run chose its coins: everything, or only coins with new metrics
+SCORING_MODE_FULL = "full"
+SCORING_MODE_INCREMENTAL = "incremental"
+
+
+class ScoringRun(Base):
+    __tablename__ = "scoring_runs"
+    __table_args__ = (
+        Index("ix_scoring_runs_weight_finished", "scoring_weight_id", "finished_at"),
+    )
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        index=True
+    )
+    scoring_weight_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("scoring_weights.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    mode = Column(String, nullable=False)
+    coins_scored = Column(Integer, nullable=False, default=0)
+
+    # Newest Metric.created_at covered by this run; the next incremental
+    # run rescores coins with metrics created after it.
+    high_water_mark = Column(DateTime, nullable=True)
+    # Inputs the scores depend on; any change forces a full rescore.
+    normalization = Column(JSON, nullable=False)
+    weights = Column(JSON, nullable=False)
+
+    started_at = Column(DateTime, nullable=False)
+    finished_at = Column(
+        DateTime,
+        nullable=False,
+        server_default=func.timezone("UTC", func.current_timestamp()),
+    )
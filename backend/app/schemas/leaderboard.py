@@ -0,0 +1,26 @@
+from typing import List
+from uuid import UUID
+
+from app.schemas import SchemaBase
+
+
+class LeaderboardEntry(SchemaBase):
+    rank: int
+    coin_id: UUID
+    final_score: float
+
+
+class LeaderboardOut(SchemaBase):
+    """A slice of a weight's leaderboard; ``source`` is "redis" or "database" (fallback)."""
+
+    scoring_weight_id: UUID
+    source: str
+    total: int
+    entries: List[LeaderboardEntry]
+
+
+class LeaderboardRankOut(SchemaBase):
+    scoring_weight_id: UUID
+    source: str
+    total: int
+    entry: LeaderboardEntry
@@ -1,6 +1,6 @@
 from uuid import UUID
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
 from app.schemas import SchemaBase
 
@@ -14,6 +14,7 @@ class MetricCreate(SchemaBase):
     twitter_sentiment: Optional[float] = None
     reddit_sentiment: Optional[float] = None
     fetched_at: datetime
+    source: str = "coin"
 
 
 class MetricUpdate(SchemaBase):
@@ -34,3 +35,39 @@ class MetricOut(SchemaBase):
     fetched_at: datetime
     is_active: bool
     created_at: datetime
+
+
+class MetricProjectionOut(SchemaBase):
+    """A metric with only the requested fields; ``id`` and ``fetched_at`` are always present."""
+
+    id: UUID
+    fetched_at: datetime
+    coin_id: Optional[UUID] = None
+    market_cap: Optional[float] = None
+    volume_24h: Optional[float] = None
+    liquidity: Optional[float] = None
+    github_activity: Optional[float] = None
+    twitter_sentiment: Optional[float] = None
+    reddit_sentiment: Optional[float] = None
+    source: Optional[str] = None
+    is_active: Optional[bool] = None
+    created_at: Optional[datetime] = None
+
+
+class MetricSeriesOut(SchemaBase):
+    """Per-bucket aggregates of one field; raw history only has ``last``."""
+
+    min: Optional[List[Optional[float]]] = None
+    max: Optional[List[Optional[float]]] = None
+    avg: Optional[List[Optional[float]]] = None
+    last: List[Optional[float]]
+
+
+class MetricHistoryOut(SchemaBase):
+    """A coin's metric history as parallel arrays per bucket, oldest first."""
+
+    coin_id: UUID
+    resolution: str
+    bucket_start: List[datetime]
+    sample_count: List[int]
+    series: Dict[str, MetricSeriesOut]
@@ -1,5 +1,6 @@
 import uuid
 from datetime import datetime
+from typing import List, Optional
 
 from pydantic import Field as field
 
@@ -28,3 +29,16 @@ class ScoreOut(ScoreBase):
     coin_id: uuid.UUID
     scoring_weight_id: uuid.UUID
     created_at: datetime
+
+
+class ScoreTrajectoryOut(SchemaBase):
+    """A coin's score history as parallel arrays, oldest first; components only on request."""
+
+    coin_id: uuid.UUID
+    scoring_weight_id: uuid.UUID
+    scored_at: List[datetime]
+    final_score: List[float]
+    liquidity_score: Optional[List[float]] = None
+    developer_score: Optional[List[float]] = None
+    community_score: Optional[List[float]] = None
+    market_score: Optional[List[float]] = None
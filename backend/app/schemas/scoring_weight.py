@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import Field as field
@@ -24,3 +25,23 @@ class ScoringWeightUpdate(ScoringWeightBase):
 class ScoringWeightOut(ScoringWeightBase):
     id: UUID
     created_at: datetime
+
+
+class WhatIfScore(SchemaBase):
+    rank: int
+    coin_id: UUID
+    name: Optional[str] = None
+    symbol: Optional[str] = None
+    liquidity_score: float
+    developer_score: float
+    community_score: float
+    market_score: float
+    final_score: float
+
+
+class WhatIfOut(SchemaBase):
+    """Ranking under hypothetical weights; ``version`` is when the component cache was built."""
+
+    version: str
+    coins: int
+    ranking: List[WhatIfScore]
@@ -4,16 +4,17 @@ from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.crud.latest_metrics import LATEST_METRIC_JOIN
+from app.models.coin_latest_metric import CoinLatestMetric
 from app.models.metric import Metric
 
 
 async def get_latest_metrics(db: AsyncSession, coin_id: uuid.UUID) -> Optional[dict]:
-    """Fetch the latest metrics for a specific coin."""
+    """Fetch the latest metrics for a specific coin through its latest-metric pointer."""
     result = await db.execute(
         select(Metric)
-        .where(Metric.coin_id == coin_id, Metric.is_active)
-        .order_by(Metric.fetched_at.desc())
-        .limit(1)
+        .join(CoinLatestMetric, LATEST_METRIC_JOIN)
+        .where(CoinLatestMetric.coin_id == coin_id)
     )
     metric = result.scalar_one_or_none()
 
@@ -22,7 +23,14 @@ async def get_latest_metrics(db: AsyncSession, coin_id: uuid.UUID) -> Optional[d
             "id": metric.id,
             "coin_id": str(metric.coin_id),
             "fetched_at": metric.fetched_at,
-            "values": metric.values,  # Adjust based on actual column names
+            "values": {
+                "market_cap": metric.market_cap,
+                "volume_24h": metric.volume_24h,
+                "liquidity": metric.liquidity,
+                "github_activity": metric.github_activity,
+                "twitter_sentiment": metric.twitter_sentiment,
+                "reddit_sentiment": metric.reddit_sentiment,
+            },
         }
 
     return None
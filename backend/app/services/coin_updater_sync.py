@@ -1,5 +1,7 @@
 import math
+from contextlib import nullcontext
 from typing import Optional
+from uuid import UUID
 from sqlalchemy.orm import Session
 from datetime import datetime
 from loguru import logger
@@ -9,6 +11,7 @@ from app.crud.coins import update_coin_sync, get_by_coingeckoid_sync, create_coi
 from app.schemas.coin import CoinCreate, CoinUpdate
 from app.schemas.metric import MetricCreate
 from app.models.coin import Coin
+from app.services.metric_buffer import MetricWriteBuffer
 from app.utils.api_clients.coingeckosync import SyncCoinGeckoClient
 
 
@@ -88,6 +91,28 @@ def calculate_liquidity(market_cap: float, volume: float) -> float:
         return 0.01
 
 
+def extract_market_metrics(market_row: dict) -> dict:
+    """
+    Derive market_cap/volume_24h/liquidity from a `/coins/markets` row,
+    using the same strategies as the full `/coins/{id}` payload.
+    """
+    data = {
+        "market_data": {
+            "market_cap": {"usd": market_row.get("market_cap") or 0},
+            "current_price": {"usd": market_row.get("current_price") or 0},
+            "circulating_supply": market_row.get("circulating_supply") or 0,
+            "total_volume": {"usd": market_row.get("total_volume") or 0},
+        }
+    }
+    market_cap = calculate_market_cap(data)
+    volume_24h = calculate_volume(data)
+    return {
+        "market_cap": market_cap,
+        "volume_24h": volume_24h,
+        "liquidity": calculate_liquidity(market_cap, volume_24h),
+    }
+
+
 def calculate_github_activity(data: dict) -> float:
     """Comprehensive GitHub activity calculation with multiple metrics."""
     try:
@@ -202,6 +227,59 @@ def update_coin_and_metrics_from_coingecko_sync(
         logger.warning(f"No valid data returned for coin ID: {coin_id}")
         return None
 
+    return apply_coingecko_data_sync(db, data)
+
+
+def build_metric_from_payload(
+    coin_id: UUID,
+    data: dict,
+    fetched_at: Optional[datetime] = None,
+) -> MetricCreate:
+    """Compute every derived metric for a coin from a raw `/coins/{id}` payload."""
+    market_cap = calculate_market_cap(data)
+    volume_24h = calculate_volume(data)
+    liquidity = calculate_liquidity(market_cap, volume_24h)
+    github_activity = calculate_github_activity(data)
+    twitter_sentiment, reddit_sentiment = calculate_social_sentiment(data)
+
+    return MetricCreate(
+        coin_id=coin_id,
+        market_cap=market_cap,
+        volume_24h=volume_24h,
+        liquidity=liquidity,
+        github_activity=github_activity,
+        twitter_sentiment=twitter_sentiment,
+        reddit_sentiment=reddit_sentiment,
+        fetched_at=fetched_at or datetime.utcnow(),
+        is_active=True
+    )
+
+
+def apply_coingecko_data_sync(
+    db: Session,
+    data: dict,
+    metric_buffer: Optional[MetricWriteBuffer] = None,
+    known_coins: Optional[dict[str, Coin]] = None,
+    fetched_at: Optional[datetime] = None,
+) -> Optional[Coin]:
+    """
+    Upsert the coin described by a CoinGecko `/coins/{id}` payload and
+    store a fresh metric row for it. Shared by the sync updater and the
+    concurrent ingestion engine, which fetches payloads itself.
+
+    Without a buffer the coin and its metric are committed together. With
+    one, the metric is queued and the coin update rides along with the
+    buffer's next commit; brand-new coins are committed straight away so
+    queued metrics never reference a coin that a later rollback could drop.
+    A failing coin only rolls back its own savepoint, leaving the other
+    coins' pending updates in the session.
+
+    ``known_coins`` is an optional preloaded CoinGecko ID -> Coin snapshot
+    that saves the per-coin lookup. Unchanged metadata is never written.
+    ``fetched_at`` defaults to now; the ingestion engine passes the time
+    it archived the payload under.
+    """
+    coin_id = data.get("id")
     try:
         # Enhanced Coin Data Extraction
         coin_data = {
@@ -230,36 +308,37 @@ def update_coin_and_metrics_from_coingecko_sync(
         # Clean out empty fields
         coin_data = {k: v for k, v in coin_data.items() if v not in ["", [], None]}
 
-        db_coin = get_by_coingeckoid_sync(db, coin_data["coingeckoid"])
-        if db_coin:
-            db_coin = update_coin_sync(db=db, db_coin=db_coin, coin_in=CoinUpdate(**coin_data))
-        else:
-            db_coin = create_coin_sync(db=db, coin_in=CoinCreate(**coin_data))
-
-        # Enhanced Metric Calculation
-        market_cap = calculate_market_cap(data)
-        volume_24h = calculate_volume(data)
-        liquidity = calculate_liquidity(market_cap, volume_24h)
-        github_activity = calculate_github_activity(data)
-        twitter_sentiment, reddit_sentiment = calculate_social_sentiment(data)
-
-        metric_data = MetricCreate(
-            coin_id=db_coin.id,
-            market_cap=market_cap,
-            volume_24h=volume_24h,
-            liquidity=liquidity,
-            github_activity=github_activity,
-            twitter_sentiment=twitter_sentiment,
-            reddit_sentiment=reddit_sentiment,
-            fetched_at=datetime.utcnow(),
-            is_active=True
-        )
+        # With a buffer the session carries other coins' unflushed updates,
+        # so this coin's writes are confined to a savepoint
+        is_new = False
+        with db.begin_nested() if metric_buffer is not None else nullcontext():
+            db_coin = None
+            if known_coins is not None:
+                db_coin = known_coins.get(coin_data["coingeckoid"])
+            if db_coin is None:
+                db_coin = get_by_coingeckoid_sync(db, coin_data["coingeckoid"])
+            if db_coin:
+                db_coin = update_coin_sync(db=db, db_coin=db_coin, coin_in=CoinUpdate(**coin_data), commit=False)
+            else:
+                db_coin = create_coin_sync(db=db, coin_in=CoinCreate(**coin_data), commit=False)
+                is_new = True
 
-        create_metric_sync(db, metric_in=metric_data)
+            metric_data = build_metric_from_payload(db_coin.id, data, fetched_at)
+
+        if metric_buffer is not None:
+            if is_new:
+                db.commit()
+            metric_buffer.add(metric_data)
+        else:
+            create_metric_sync(db, metric_in=metric_data)
+        if is_new and known_coins is not None:
+            known_coins[db_coin.coingeckoid] = db_coin
 
         logger.success(f"✅ Updated coin and metrics: {db_coin.name}")
         return db_coin
 
     except Exception as e:
+        if metric_buffer is None:
+            db.rollback()
         logger.exception(f"❌ Exception while updating coin+metrics for '{coin_id}': {e}")
         return None
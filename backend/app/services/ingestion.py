@@ -0,0 +1,327 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.coins import get_coins_by_coingeckoids_sync, get_tracked_coin_id_map_sync
+from app.crud.metrics import get_latest_active_metrics_sync
+from app.models.metric import METRIC_SOURCE_MARKETS
+from app.schemas.metric import MetricCreate
+from app.services.coin_updater_sync import apply_coingecko_data_sync, extract_market_metrics
+from app.services.metric_buffer import MetricWriteBuffer
+from app.utils.api_clients.coingecko import CoinGeckoClient
+from app.utils.api_clients.http_cache import build_response_cache
+from app.utils.payload_archive import PayloadArchive, build_payload_archive
+from app.utils.rate_limiter import build_rate_limiter
+
+
+@dataclass
+class IngestionStats:
+    """Counters collected over a single ingestion run."""
+
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    requests: int = 0
+    rate_limited: int = 0
+    # Coins a market refresh skipped because their market figures had not moved
+    unchanged: int = 0
+    # Buffered metric rows the database rejected or that never got committed
+    dropped_metrics: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+
+    @property
+    def duration(self) -> float:
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.duration if self.duration > 0 else 0.0
+
+    @property
+    def rate_limited_ratio(self) -> float:
+        return self.rate_limited / self.requests if self.requests else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "unchanged": self.unchanged,
+            "dropped_metrics": self.dropped_metrics,
+            "duration_seconds": round(self.duration, 3),
+            "requests_per_second": round(self.requests_per_second, 3),
+            "rate_limited_ratio": round(self.rate_limited_ratio, 4),
+        }
+
+
+SUMMED_STATS = ("total", "succeeded", "failed", "requests", "rate_limited", "unchanged", "dropped_metrics")
+
+
+def aggregate_shard_stats(shard_stats: list[Optional[dict]]) -> dict:
+    """
+    Combine the ``as_dict()`` results of ingestion shards into run totals.
+    Shards that crashed report None and are counted in ``failed_shards``.
+    """
+    completed = [stats for stats in shard_stats if stats]
+    totals = {
+        name: sum(stats.get(name, 0) for stats in completed)
+        for name in SUMMED_STATS
+    }
+    durations = [stats.get("duration_seconds", 0.0) for stats in completed]
+    return {
+        **totals,
+        "shards": len(shard_stats),
+        "failed_shards": len(shard_stats) - len(completed),
+        "max_shard_seconds": round(max(durations, default=0.0), 3),
+        "total_shard_seconds": round(sum(durations), 3),
+        "rate_limited_ratio": round(totals["rate_limited"] / totals["requests"], 4) if totals["requests"] else 0.0,
+    }
+
+
+# Slow-changing fields that `/coins/markets` does not carry; a market
+# refresh copies them forward from the coin's latest metric.
+CARRIED_OVER_METRIC_FIELDS = ("github_activity", "twitter_sentiment", "reddit_sentiment")
+MARKET_METRIC_FIELDS = ("market_cap", "volume_24h", "liquidity")
+MARKETS_PAGE_SIZE = 250
+
+
+def market_metrics_changed(previous, fields: dict, min_relative_change: float) -> bool:
+    """
+    Whether freshly fetched market figures differ from the coin's latest
+    metric by more than ``min_relative_change`` (0 means any change).
+    """
+    if previous is None:
+        return True
+    for name in MARKET_METRIC_FIELDS:
+        old, new = getattr(previous, name), fields[name]
+        if old is None or new is None:
+            if old != new:
+                return True
+        elif abs(new - old) > min_relative_change * abs(old) or (old == 0 and new != 0):
+            return True
+    return False
+
+
+async def _ingest_one(
+    client: CoinGeckoClient,
+    db: Session,
+    coin_id: str,
+    metric_buffer: MetricWriteBuffer,
+    known_coins: dict,
+    archive: Optional[PayloadArchive],
+    stats: IngestionStats,
+) -> None:
+    """Fetch, archive and apply one coin, counting the outcome in ``stats``."""
+    try:
+        data = await client.get_coin_data(coin_id)
+        if not data or "id" not in data:
+            logger.warning(f"❌ No valid data returned for coin: {coin_id}")
+            stats.failed += 1
+            return
+        fetched_at = datetime.utcnow()
+        if archive is not None:
+            try:
+                archive.append(data, fetched_at)
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to archive payload for {coin_id}: {e}")
+        result = apply_coingecko_data_sync(
+            db, data, metric_buffer=metric_buffer, known_coins=known_coins, fetched_at=fetched_at
+        )
+        if result:
+            stats.succeeded += 1
+            logger.debug(f"✅ Updated: {result.name}")
+        else:
+            stats.failed += 1
+            logger.warning(f"❌ Failed to update: {coin_id}")
+    except Exception as e:
+        stats.failed += 1
+        logger.exception(f"🔥 Error updating coin '{coin_id}': {e}")
+
+
+async def ingest_coins(
+    db: Session,
+    coin_ids: list[str],
+    client: Optional[CoinGeckoClient] = None,
+    concurrency: Optional[int] = None,
+    rate_limit_per_minute: Optional[int] = None,
+    archive: Optional[PayloadArchive] = None,
+) -> IngestionStats:
+    """
+    Fetch and store every coin in ``coin_ids`` with up to ``concurrency``
+    requests in flight, throttled by a token bucket of
+    ``rate_limit_per_minute`` (shared across workers via Redis by default).
+    DB writes run on the event loop thread one at a time, so the sync
+    session is never shared between threads, and metrics go through a
+    `MetricWriteBuffer` flushed in batches. Existing coins are preloaded
+    once so unchanged metadata costs no queries. Raw payloads are appended
+    to the payload archive (when enabled) so metrics can later be
+    recomputed without re-fetching.
+    """
+    concurrency = concurrency or settings.INGESTION_CONCURRENCY
+    rate_limit_per_minute = rate_limit_per_minute or settings.COINGECKO_RATE_LIMIT_PER_MINUTE
+
+    close_client = False
+    if client is None:
+        client = CoinGeckoClient(
+            rate_limiter=build_rate_limiter(rate_limit_per_minute),
+            cache=build_response_cache(),
+        )
+        close_client = True
+
+    close_archive = False
+    if archive is None:
+        try:
+            archive = build_payload_archive()
+        except Exception as e:
+            logger.warning(f"⚠️ Payload archive unavailable, ingesting without it: {e}")
+        close_archive = archive is not None
+
+    stats = IngestionStats(total=len(coin_ids))
+    known_coins = get_coins_by_coingeckoids_sync(db, coin_ids)
+    requests_before = client.request_count
+    rate_limited_before = client.rate_limited_count
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for coin_id in coin_ids:
+        queue.put_nowait(coin_id)
+
+    async def worker() -> None:
+        while not queue.empty():
+            coin_id = queue.get_nowait()
+            await _ingest_one(client, db, coin_id, metric_buffer, known_coins, archive, stats)
+
+    metric_buffer = MetricWriteBuffer(db)
+    try:
+        with metric_buffer:
+            await asyncio.gather(*(worker() for _ in range(min(concurrency, len(coin_ids)))))
+    finally:
+        stats.finished_at = time.monotonic()
+        stats.dropped_metrics = metric_buffer.dropped
+        stats.requests = client.request_count - requests_before
+        stats.rate_limited = client.rate_limited_count - rate_limited_before
+        if close_client:
+            await client.close()
+        if close_archive:
+            try:
+                archive.close()
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to close payload archive: {e}")
+
+    logger.info(
+        "📈 Ingestion finished: {succeeded}/{total} ok, {failed} failed, "
+        "{requests} requests in {duration_seconds}s "
+        "({requests_per_second} req/s, 429 rate {rate_limited_ratio})",
+        **stats.as_dict(),
+    )
+    if stats.dropped_metrics:
+        logger.warning(f"⚠️ {stats.dropped_metrics} metric rows could not be written")
+    return stats
+
+
+async def refresh_market_data(
+    db: Session,
+    client: Optional[CoinGeckoClient] = None,
+    per_page: int = MARKETS_PAGE_SIZE,
+    rate_limit_per_minute: Optional[int] = None,
+) -> IngestionStats:
+    """
+    Fast market refresh: page through `/coins/markets`, ``per_page`` coins
+    per request, and write a metric with fresh market_cap/volume_24h/
+    liquidity for every tracked coin whose figures moved by more than
+    ``MARKET_REFRESH_MIN_RELATIVE_CHANGE`` since its latest metric. Coins
+    that did not move get no row (counted in ``unchanged``), so the metrics
+    table and incremental rescoring only see real changes. ``failed``
+    counts failed pages.
+    """
+    rate_limit_per_minute = rate_limit_per_minute or settings.COINGECKO_RATE_LIMIT_PER_MINUTE
+
+    close_client = False
+    if client is None:
+        client = CoinGeckoClient(
+            rate_limiter=build_rate_limiter(rate_limit_per_minute),
+            cache=build_response_cache(),
+        )
+        close_client = True
+
+    tracked = get_tracked_coin_id_map_sync(db)
+    latest = get_latest_active_metrics_sync(db)
+    stats = IngestionStats(total=len(tracked))
+    requests_before = client.request_count
+    rate_limited_before = client.rate_limited_count
+
+    metric_buffer = MetricWriteBuffer(db)
+    try:
+        with metric_buffer:
+            await _page_through_markets(client, per_page, tracked, latest, metric_buffer, stats)
+    finally:
+        stats.finished_at = time.monotonic()
+        stats.dropped_metrics = metric_buffer.dropped
+        stats.requests = client.request_count - requests_before
+        stats.rate_limited = client.rate_limited_count - rate_limited_before
+        if close_client:
+            await client.close()
+
+    logger.info(
+        "📈 Market refresh finished: {succeeded}/{total} coins refreshed with "
+        "{requests} requests in {duration_seconds}s "
+        "({requests_per_second} req/s, 429 rate {rate_limited_ratio})",
+        **stats.as_dict(),
+    )
+    if stats.dropped_metrics:
+        logger.warning(f"⚠️ {stats.dropped_metrics} metric rows could not be written")
+    return stats
+
+
+async def _page_through_markets(
+    client: CoinGeckoClient,
+    per_page: int,
+    tracked: dict,
+    latest: dict,
+    metric_buffer: MetricWriteBuffer,
+    stats: IngestionStats,
+) -> None:
+    min_change = settings.MARKET_REFRESH_MIN_RELATIVE_CHANGE
+    page = 1
+    while True:
+        rows = await client.get_coins_markets(page=page, per_page=per_page)
+        if rows is None:
+            logger.warning(f"❌ Market page {page} failed; stopping refresh")
+            stats.failed += 1
+            return
+
+        fetched_at = datetime.utcnow()
+        metrics = []
+        for row in rows:
+            coin_id = tracked.get(row.get("id"))
+            if coin_id is None:
+                continue
+            previous = latest.get(coin_id)
+            fields = extract_market_metrics(row)
+            if not market_metrics_changed(previous, fields, min_change):
+                stats.unchanged += 1
+                continue
+            for name in CARRIED_OVER_METRIC_FIELDS:
+                fields[name] = getattr(previous, name) if previous else None
+            metrics.append(MetricCreate(
+                coin_id=coin_id,
+                fetched_at=fetched_at,
+                source=METRIC_SOURCE_MARKETS,
+                **fields,
+            ))
+
+        metric_buffer.extend(metrics)
+        stats.succeeded += len(metrics)
+        logger.debug(f"📄 Market page {page}: {len(rows)} rows, {len(metrics)} changed")
+
+        if len(rows) < per_page:
+            return
+        page += 1
@@ -0,0 +1,250 @@
+from typing import Iterable, Optional, Sequence
+from uuid import UUID
+
+import redis
+import redis.asyncio as aioredis
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.scores import count_scores, get_final_scores_sync, get_score_rank, get_top_scores
+from app.crud.scoring_weights import get_all_sync
+from app.utils.redis_client import get_async_redis
+
+# Where a leaderboard read was served from
+SOURCE_REDIS = "redis"
+SOURCE_DATABASE = "database"
+
+KEY_PREFIX = "leaderboard:"
+BUILDING_SUFFIX = ":building"
+
+# Set while a rebuild requested by a cache miss is queued or running, so
+# a cold cache triggers one rebuild rather than one per request
+REBUILD_PENDING_KEY = "leaderboards:rebuild-pending"
+REBUILD_PENDING_SECONDS = 300
+
+
+def leaderboard_key(scoring_weight_id: UUID) -> str:
+    """Sorted set of coin_id -> final_score for one scoring weight."""
+    return f"{KEY_PREFIX}{scoring_weight_id}"
+
+
+def publish_leaderboard_sync(
+    client: redis.Redis,
+    scoring_weight_id: UUID,
+    scores: Iterable[tuple[UUID, float]],
+    replace: bool,
+) -> int:
+    """
+    Write ``(coin_id, final_score)`` pairs to a weight's sorted set. With
+    ``replace`` the set is built under a temporary key and renamed over the
+    old one, so readers never see a half-written leaderboard; otherwise
+    the scores are merged in. Returns the number of coins written.
+    """
+    key = leaderboard_key(scoring_weight_id)
+    mapping = {str(coin_id): float(final_score) for coin_id, final_score in scores}
+    pipe = client.pipeline()
+    if replace:
+        building = f"{key}{BUILDING_SUFFIX}"
+        pipe.delete(building)
+        if mapping:
+            pipe.zadd(building, mapping)
+            pipe.rename(building, key)
+        else:
+            pipe.delete(key)
+    elif mapping:
+        pipe.zadd(key, mapping)
+    pipe.execute()
+    return len(mapping)
+
+
+def publish_leaderboards_sync(
+    scoring_weight_ids: Sequence[UUID],
+    coin_ids: Sequence[UUID],
+    final_scores,
+    replace: bool,
+) -> None:
+    """
+    Publish one scoring run: ``final_scores`` holds a column per weight.
+    Redis is only a read cache of the scores table, so a failure here is
+    logged rather than failing the (already committed) run.
+    """
+    client = redis.Redis.from_url(settings.REDIS_URL)
+    try:
+        for column, scoring_weight_id in enumerate(scoring_weight_ids):
+            publish_leaderboard_sync(
+                client, scoring_weight_id, zip(coin_ids, final_scores[:, column].tolist(), strict=True), replace
+            )
+    except redis.RedisError as e:
+        logger.warning(f"⚠️ Failed to publish leaderboards to Redis: {e}")
+    finally:
+        client.close()
+
+
+def remove_stale_leaderboards_sync(client: redis.Redis, scoring_weight_ids: Iterable[UUID]) -> int:
+    """Delete the sorted sets of weights that no longer exist. Returns the number of keys removed."""
+    live = {leaderboard_key(scoring_weight_id) for scoring_weight_id in scoring_weight_ids}
+    stale = [
+        key for key in client.scan_iter(match=f"{KEY_PREFIX}*")
+        if key.decode().removesuffix(BUILDING_SUFFIX) not in live
+    ]
+    if stale:
+        client.delete(*stale)
+        logger.info(f"🧹 Removed {len(stale)} leaderboards of deleted scoring weights")
+    return len(stale)
+
+
+def rebuild_leaderboards_sync(db: Session, client: Optional[redis.Redis] = None) -> dict[str, int]:
+    """
+    Replace every weight's leaderboard from the scores table, drop those
+    of deleted weights and clear the pending-rebuild flag.
+    """
+    owned = client is None
+    client = client or redis.Redis.from_url(settings.REDIS_URL)
+    try:
+        weights = get_all_sync(db)
+        published = {
+            str(weight.id): publish_leaderboard_sync(client, weight.id, get_final_scores_sync(db, weight.id), True)
+            for weight in weights
+        }
+        remove_stale_leaderboards_sync(client, [weight.id for weight in weights])
+        return published
+    finally:
+        try:
+            client.delete(REBUILD_PENDING_KEY)
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Failed to clear the pending leaderboard rebuild flag: {e}")
+        if owned:
+            client.close()
+
+
+async def claim_leaderboard_rebuild(client: Optional[aioredis.Redis] = None) -> bool:
+    """
+    Flag a leaderboard rebuild as pending. Returns False when one already
+    is, so the caller should not enqueue another. Raises redis.RedisError.
+    """
+    client = client or get_async_redis()
+    return bool(await client.set(REBUILD_PENDING_KEY, 1, nx=True, ex=REBUILD_PENDING_SECONDS))
+
+
+async def delete_leaderboard(scoring_weight_id: UUID, client: Optional[aioredis.Redis] = None) -> None:
+    """Drop a deleted weight's sorted set; the next rebuild removes it if Redis is down now."""
+    try:
+        await (client or get_async_redis()).delete(leaderboard_key(scoring_weight_id))
+    except redis.RedisError as e:
+        logger.warning(f"⚠️ Failed to delete leaderboard of scoring weight {scoring_weight_id}: {e}")
+
+
+def _entries(members: list[tuple[bytes, float]], first_rank: int) -> list[dict]:
+    return [
+        {"rank": first_rank + i, "coin_id": UUID(member.decode()), "final_score": score}
+        for i, (member, score) in enumerate(members)
+    ]
+
+
+async def _redis_read(client: aioredis.Redis, key: str, *commands) -> Optional[list]:
+    """
+    Run ``commands`` (callables taking a pipeline) after a ZCARD. Returns
+    ``[total, *results]``, or None when the set is empty or Redis is down
+    so the caller falls back to the database.
+    """
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.zcard(key)
+        for command in commands:
+            command(pipe)
+        results = await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"⚠️ Leaderboard read from Redis failed, using the database: {e}")
+        return None
+    return results if results[0] else None
+
+
+async def get_top_coins(
+    db: AsyncSession,
+    scoring_weight_id: UUID,
+    limit: int,
+    client: Optional[aioredis.Redis] = None,
+) -> dict:
+    """Best ``limit`` coins of a weight with their ranks: ``{source, total, entries}``."""
+    key = leaderboard_key(scoring_weight_id)
+    cached = await _redis_read(
+        client or get_async_redis(), key,
+        lambda pipe: pipe.zrevrange(key, 0, limit - 1, withscores=True),
+    )
+    if cached is not None:
+        total, members = cached
+        return {"source": SOURCE_REDIS, "total": total, "entries": _entries(members, 1)}
+
+    rows = await get_top_scores(db, scoring_weight_id, limit)
+    return {
+        "source": SOURCE_DATABASE,
+        "total": await count_scores(db, scoring_weight_id),
+        "entries": [
+            {"rank": rank, "coin_id": coin_id, "final_score": final_score}
+            for rank, (coin_id, final_score) in enumerate(rows, start=1)
+        ],
+    }
+
+
+async def get_coin_rank(
+    db: AsyncSession,
+    scoring_weight_id: UUID,
+    coin_id: UUID,
+    client: Optional[aioredis.Redis] = None,
+) -> Optional[dict]:
+    """A coin's rank and score under a weight (``{source, total, entry}``), or None if unscored."""
+    key, member = leaderboard_key(scoring_weight_id), str(coin_id)
+    cached = await _redis_read(
+        client or get_async_redis(), key,
+        lambda pipe: pipe.zrevrank(key, member),
+        lambda pipe: pipe.zscore(key, member),
+    )
+    if cached is not None:
+        total, rank, final_score = cached
+        if rank is None:
+            return None
+        entry = {"rank": rank + 1, "coin_id": coin_id, "final_score": final_score}
+        return {"source": SOURCE_REDIS, "total": total, "entry": entry}
+
+    ranked = await get_score_rank(db, scoring_weight_id, coin_id)
+    if ranked is None:
+        return None
+    rank, final_score = ranked
+    return {
+        "source": SOURCE_DATABASE,
+        "total": await count_scores(db, scoring_weight_id),
+        "entry": {"rank": rank, "coin_id": coin_id, "final_score": final_score},
+    }
+
+
+async def get_coins_in_range(
+    db: AsyncSession,
+    scoring_weight_id: UUID,
+    min_score: float,
+    max_score: float,
+    limit: int,
+    client: Optional[aioredis.Redis] = None,
+) -> dict:
+    """Coins with min_score <= final_score <= max_score, best first, with their overall ranks."""
+    key = leaderboard_key(scoring_weight_id)
+    cached = await _redis_read(
+        client or get_async_redis(), key,
+        lambda pipe: pipe.zcount(key, f"({max_score}", "+inf"),
+        lambda pipe: pipe.zrevrangebyscore(key, max_score, min_score, start=0, num=limit, withscores=True),
+    )
+    if cached is not None:
+        total, above, members = cached
+        return {"source": SOURCE_REDIS, "total": total, "entries": _entries(members, above + 1)}
+
+    above = await count_scores(db, scoring_weight_id, above=max_score)
+    rows = await get_top_scores(db, scoring_weight_id, limit, min_score=min_score, max_score=max_score)
+    return {
+        "source": SOURCE_DATABASE,
+        "total": await count_scores(db, scoring_weight_id),
+        "entries": [
+            {"rank": above + i, "coin_id": coin_id, "final_score": final_score}
+            for i, (coin_id, final_score) in enumerate(rows, start=1)
+        ],
+    }
@@ -0,0 +1,112 @@
+import time
+from typing import Callable, Iterable, Optional
+
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.metrics import create_metrics_sync
+from app.schemas.metric import MetricCreate
+
+
+class MetricWriteBuffer:
+    """
+    Accumulates `MetricCreate` rows and writes them with multi-row INSERTs
+    once ``max_rows`` are pending or ``max_seconds`` have passed since the
+    last flush (checked on every add). Each flush commits the session, so
+    any coin updates flushed alongside the metrics land in the same
+    transaction. Use it as a context manager so pending rows are always
+    flushed when the run ends, even on error.
+
+    A batch the database rejects is retried row by row, each in its own
+    savepoint, so one bad row only costs itself. If the commit fails the
+    rows go back into the buffer for the next flush. Rows that could not
+    be written by the end of the run are counted in ``dropped``.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        max_rows: Optional[int] = None,
+        max_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.db = db
+        self.max_rows = max_rows or settings.METRIC_BUFFER_MAX_ROWS
+        self.max_seconds = max_seconds if max_seconds is not None else settings.METRIC_BUFFER_MAX_SECONDS
+        self._clock = clock
+        self._pending: list[MetricCreate] = []
+        self._last_flush = clock()
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __enter__(self) -> "MetricWriteBuffer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pending = len(self._pending)
+        try:
+            self.flush()
+        except Exception as e:
+            logger.exception(f"🔥 Failed to flush {pending} buffered metrics on exit: {e}")
+            self.dropped += len(self._pending)
+            self._pending = []
+            if exc_type is None:
+                raise
+
+    def add(self, metric_in: MetricCreate) -> None:
+        self._pending.append(metric_in)
+        self._flush_if_due()
+
+    def extend(self, metrics_in: Iterable[MetricCreate]) -> None:
+        self._pending.extend(metrics_in)
+        self._flush_if_due()
+
+    def _flush_if_due(self) -> None:
+        if (
+            len(self._pending) >= self.max_rows
+            or self._clock() - self._last_flush >= self.max_seconds
+        ):
+            self.flush()
+
+    def _write_rows_one_by_one(self, pending: list[MetricCreate]) -> tuple[int, int]:
+        written = dropped = 0
+        for metric_in in pending:
+            try:
+                with self.db.begin_nested():
+                    written += create_metrics_sync(self.db, [metric_in], commit=False)
+            except Exception as e:
+                dropped += 1
+                logger.error(f"❌ Dropping buffered metric for coin {metric_in.coin_id}: {e}")
+        return written, dropped
+
+    def flush(self) -> int:
+        """
+        Write and commit every pending row. Returns the number written; on
+        a failed commit the rows are put back and the error is re-raised.
+        """
+        pending, self._pending = self._pending, []
+        self._last_flush = self._clock()
+        dropped = 0
+        try:
+            try:
+                with self.db.begin_nested():
+                    written = create_metrics_sync(self.db, pending, commit=False)
+            except Exception as e:
+                logger.warning(f"⚠️ Batch insert of {len(pending)} metrics failed, retrying row by row: {e}")
+                written, dropped = self._write_rows_one_by_one(pending)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            self._pending = pending + self._pending
+            raise
+        self.written += written
+        self.dropped += dropped
+        self.flushes += 1
+        if written:
+            logger.debug(f"💾 Flushed {written} buffered metrics")
+        return written
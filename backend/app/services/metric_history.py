@@ -0,0 +1,86 @@
+import math
+from datetime import datetime, timedelta
+from typing import Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.metric_partitions import metric_retention_cutoff
+from app.crud.metric_rollups import get_metric_rollups
+from app.crud.metrics import count_metrics_in_range, get_metrics_in_range
+from app.models.metric_rollup import (
+    RESOLUTION_DAY,
+    RESOLUTION_HOUR,
+    RESOLUTION_RAW,
+    ROLLUP_AGGREGATES,
+    ROLLUP_FIELDS,
+    ROLLUP_RESOLUTIONS,
+)
+
+RESOLUTION_WIDTHS = {RESOLUTION_HOUR: timedelta(hours=1), RESOLUTION_DAY: timedelta(days=1)}
+
+
+async def choose_resolution(
+    db: AsyncSession,
+    coin_id: UUID,
+    start: datetime,
+    end: datetime,
+    max_points: int,
+) -> str:
+    """
+    The most detailed resolution that covers [start, end) within
+    ``max_points``: raw metrics when the window is still retained and
+    holds few enough snapshots (counted up to the budget only), then the
+    hourly and daily rollups by bucket count. Daily when nothing fits.
+    """
+    cutoff = metric_retention_cutoff()
+    if cutoff is None or start >= cutoff:
+        if await count_metrics_in_range(db, coin_id, start, end, cap=max_points + 1) <= max_points:
+            return RESOLUTION_RAW
+    for resolution in ROLLUP_RESOLUTIONS:
+        if math.ceil((end - start) / RESOLUTION_WIDTHS[resolution]) <= max_points:
+            return resolution
+    return RESOLUTION_DAY
+
+
+async def get_metric_history(
+    db: AsyncSession,
+    coin_id: UUID,
+    start: datetime,
+    end: datetime,
+    max_points: int,
+    resolution: Optional[str] = None,
+    fields: Sequence[str] = ROLLUP_FIELDS,
+) -> dict:
+    """
+    A coin's metric history in [start, end) as parallel arrays, oldest
+    first, at ``resolution`` (chosen by `choose_resolution` when None).
+    Rollup fields carry min/max/avg/last per bucket. Raw snapshots carry
+    only ``last``, since every aggregate of a single value is the value
+    itself. At most the latest ``max_points`` buckets are returned.
+    """
+    resolution = resolution or await choose_resolution(db, coin_id, start, end, max_points)
+    if resolution == RESOLUTION_RAW:
+        metrics = await get_metrics_in_range(db, coin_id, start, end, max_points)
+        return {
+            "coin_id": coin_id,
+            "resolution": resolution,
+            "bucket_start": [metric.fetched_at for metric in metrics],
+            "sample_count": [1] * len(metrics),
+            "series": {field: {"last": [getattr(metric, field) for metric in metrics]} for field in fields},
+        }
+
+    rollups = await get_metric_rollups(db, coin_id, resolution, start, end, max_points)
+    return {
+        "coin_id": coin_id,
+        "resolution": resolution,
+        "bucket_start": [rollup.bucket_start for rollup in rollups],
+        "sample_count": [rollup.sample_count for rollup in rollups],
+        "series": {
+            field: {
+                aggregate: [getattr(rollup, f"{field}_{aggregate}") for rollup in rollups]
+                for aggregate in ROLLUP_AGGREGATES
+            }
+            for field in fields
+        },
+    }
@@ -0,0 +1,84 @@
+from datetime import datetime
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.coins import get_coins_by_coingeckoids_sync
+from app.crud.metrics import create_metrics_sync, deactivate_metrics_sync
+from app.models.metric import METRIC_SOURCE_COIN
+from app.schemas.metric import MetricCreate
+from app.services.coin_updater_sync import build_metric_from_payload
+from app.utils.payload_archive import PayloadArchive
+
+
+def _write_replayed_batch(db: Session, batch: list[MetricCreate]) -> int:
+    """Swap the stored metrics at the batch's (coin, fetched_at) keys for the replayed ones in one transaction."""
+    try:
+        deactivated = deactivate_metrics_sync(
+            db,
+            [(metric.coin_id, metric.fetched_at) for metric in batch],
+            source=METRIC_SOURCE_COIN,
+            commit=False,
+        )
+        create_metrics_sync(db, batch, commit=False)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return deactivated
+
+
+def replay_archive(
+    db: Session,
+    archive: PayloadArchive,
+    start: datetime,
+    end: datetime,
+    coingeckoids: Optional[list[str]] = None,
+    max_rows: Optional[int] = None,
+) -> dict:
+    """
+    Recompute per-coin metrics for [start, end) from archived payloads.
+
+    One metric per archived payload is rebuilt with the current formulas.
+    Only the active `coin`-source metric stored at the same (coin,
+    fetched_at) as a payload is replaced, so metrics with no archived
+    payload (e.g. written by a worker whose archive is not visible here)
+    stay active. Each batch of ``max_rows`` is deactivated and rewritten in
+    one transaction. Market-refresh metrics are left alone.
+    """
+    max_rows = max_rows or settings.METRIC_BUFFER_MAX_ROWS
+    archived_ids = archive.coingeckoids(start, end, coingeckoids)
+    coins = get_coins_by_coingeckoids_sync(db, archived_ids)
+    missing = set(archived_ids) - set(coins)
+    if missing:
+        logger.warning(f"⚠️ {len(missing)} archived coins are not in the database and will be skipped")
+
+    deactivated = replayed = skipped = 0
+    batch: list[MetricCreate] = []
+    for coingeckoid, fetched_at, payload in archive.iter_records(start, end, coingeckoids):
+        coin = coins.get(coingeckoid)
+        if coin is None:
+            skipped += 1
+            continue
+        batch.append(build_metric_from_payload(coin.id, payload, fetched_at))
+        if len(batch) >= max_rows:
+            deactivated += _write_replayed_batch(db, batch)
+            replayed += len(batch)
+            batch = []
+    if batch:
+        deactivated += _write_replayed_batch(db, batch)
+        replayed += len(batch)
+
+    stats = {
+        "coins": len(coins),
+        "deactivated": deactivated,
+        "replayed": replayed,
+        "skipped": skipped,
+    }
+    logger.success(
+        "✅ Replayed {replayed} metrics for {coins} coins ({deactivated} deactivated, {skipped} skipped)",
+        **stats,
+    )
+    return stats
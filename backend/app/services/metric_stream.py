@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Sequence
+from uuid import UUID
+
+from loguru import logger
+from sqlalchemy import Select
+from sqlalchemy.orm import sessionmaker
+
+# Streaming formats and their media types
+FORMAT_NDJSON = "ndjson"
+FORMAT_CSV = "csv"
+MEDIA_TYPES = {FORMAT_NDJSON: "application/x-ndjson", FORMAT_CSV: "text/csv"}
+
+
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_ndjson(columns: Sequence[str], rows: Sequence[Sequence]) -> bytes:
+    """One JSON object per row, each terminated by a newline."""
+    return "".join(
+        json.dumps(dict(zip(columns, map(_plain, row), strict=True)), separators=(",", ":")) + "\n" for row in rows
+    ).encode()
+
+
+def encode_csv(rows: Sequence[Sequence]) -> bytes:
+    """CSV lines for ``rows``; NULLs become empty cells."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows([("" if value is None else _plain(value)) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+async def stream_rows(
+    session_factory: sessionmaker,
+    stmt: Select,
+    fmt: str,
+    chunk_rows: int,
+) -> AsyncIterator[bytes]:
+    """
+    Run ``stmt`` on a server-side cursor in its own session and yield it
+    encoded as ``fmt``, ``chunk_rows`` rows at a time. Only one chunk is
+    held in memory, and a CSV header goes out before the first fetch.
+    """
+    columns = [column.key for column in stmt.selected_columns]
+    if fmt == FORMAT_CSV:
+        yield encode_csv([columns])
+
+    sent = 0
+    async with session_factory() as session:
+        try:
+            result = await session.stream(stmt.execution_options(yield_per=chunk_rows))
+            async for rows in result.partitions():
+                sent += len(rows)
+                yield encode_ndjson(columns, rows) if fmt == FORMAT_NDJSON else encode_csv(rows)
+        except Exception as e:
+            # Headers are already sent, so the client only sees a truncated body
+            logger.exception(f"🚨 Metric stream aborted after {sent} rows: {e}")
+            raise
+    logger.info(f"📤 Streamed {sent} metric rows as {fmt}")
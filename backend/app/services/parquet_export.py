@@ -0,0 +1,256 @@
+import json
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.metric import Metric
+from app.models.score_history import ScoreHistory
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# UUIDs repeat across rows, so they are stored as dictionary-encoded strings
+UUID_TYPE = pa.dictionary(pa.int32(), pa.string())
+TIMESTAMP_TYPE = pa.timestamp("us")
+
+
+@dataclass(frozen=True)
+class ExportDataset:
+    """
+    One exported table. Rows with ``watermark_column`` in (watermark,
+    until] are exported each run; files are partitioned by the date of
+    ``partition_column``. Rows are exported once and never rewritten, so
+    when a dataset's rows can be superseded, readers keep only the row
+    with the greatest ``version_column`` per ``key_columns`` (recorded in
+    the manifest as ``dedupe``).
+    """
+
+    name: str
+    model: type
+    watermark_column: str
+    partition_column: str
+    schema: pa.Schema
+    key_columns: tuple[str, ...] = ()
+    version_column: Optional[str] = None
+
+
+# A replay deactivates a metric and writes its replacement at the same
+# (coin_id, fetched_at) with a later created_at; the exported original
+# keeps is_active=True. Deactivations without a replacement (API deletes)
+# are not exported.
+METRICS_DATASET = ExportDataset(
+    name="metrics",
+    model=Metric,
+    watermark_column="created_at",
+    partition_column="fetched_at",
+    schema=pa.schema([
+        ("id", pa.string()),
+        ("coin_id", UUID_TYPE),
+        ("market_cap", pa.float64()),
+        ("volume_24h", pa.float64()),
+        ("liquidity", pa.float64()),
+        ("github_activity", pa.float64()),
+        ("twitter_sentiment", pa.float64()),
+        ("reddit_sentiment", pa.float64()),
+        ("source", pa.dictionary(pa.int8(), pa.string())),
+        ("is_active", pa.bool_()),
+        ("fetched_at", TIMESTAMP_TYPE),
+        ("created_at", TIMESTAMP_TYPE),
+    ]),
+    key_columns=("coin_id", "fetched_at"),
+    version_column="created_at",
+)
+
+# Scores are upserted in place, so every score ever written is read from the append-only history
+SCORES_DATASET = ExportDataset(
+    name="scores",
+    model=ScoreHistory,
+    watermark_column="scored_at",
+    partition_column="scored_at",
+    schema=pa.schema([
+        ("coin_id", UUID_TYPE),
+        ("scoring_weight_id", UUID_TYPE),
+        ("liquidity_score", pa.float64()),
+        ("developer_score", pa.float64()),
+        ("community_score", pa.float64()),
+        ("market_score", pa.float64()),
+        ("final_score", pa.float64()),
+        ("scored_at", TIMESTAMP_TYPE),
+    ]),
+)
+
+EXPORT_DATASETS = (METRICS_DATASET, SCORES_DATASET)
+
+
+def load_manifest(directory: str) -> dict:
+    path = os.path.join(directory, MANIFEST_FILENAME)
+    if not os.path.exists(path):
+        return {"version": MANIFEST_VERSION, "datasets": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_manifest(directory: str, manifest: dict) -> None:
+    """Replace the manifest atomically; it is what makes a run's files visible."""
+    path = os.path.join(directory, MANIFEST_FILENAME)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(manifest, f, indent=2, default=str)
+    os.replace(f"{path}.tmp", path)
+
+
+def _remove_orphans(directory: str, dataset: ExportDataset, listed: set[str]) -> None:
+    """Delete files left by a run that died before its manifest was written."""
+    root = os.path.join(directory, dataset.name)
+    for parent, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.relpath(os.path.join(parent, filename), directory)
+            if path not in listed:
+                logger.warning(f"🧹 Removing unlisted export file {path}")
+                os.remove(os.path.join(directory, path))
+
+
+def _to_record_batch(dataset: ExportDataset, rows: list) -> pa.RecordBatch:
+    arrays = []
+    for index, field in enumerate(dataset.schema):
+        values = [row[index] for row in rows]
+        if pa.types.is_dictionary(field.type):
+            values = [None if value is None else str(value) for value in values]
+            arrays.append(pa.array(values, pa.string()).dictionary_encode().cast(field.type))
+        elif pa.types.is_string(field.type):
+            arrays.append(pa.array([None if value is None else str(value) for value in values], field.type))
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=dataset.schema)
+
+
+class _PartitionWriters:
+    """One Parquet file per partition date for a run, written under a temporary name until closed."""
+
+    def __init__(self, directory: str, dataset: ExportDataset, run_id: str):
+        self.directory = directory
+        self.dataset = dataset
+        self.run_id = run_id
+        self._writers: dict[date, pq.ParquetWriter] = {}
+        self._files: dict[date, dict] = {}
+
+    def write(self, day: date, batch: pa.RecordBatch) -> None:
+        if day not in self._writers:
+            path = os.path.join(self.dataset.name, f"date={day.isoformat()}", f"part-{self.run_id}.parquet")
+            os.makedirs(os.path.join(self.directory, os.path.dirname(path)), exist_ok=True)
+            self._writers[day] = pq.ParquetWriter(
+                os.path.join(self.directory, f"{path}.tmp"), self.dataset.schema, compression="zstd"
+            )
+            self._files[day] = {"path": path, "date": day.isoformat(), "rows": 0}
+        self._writers[day].write_batch(batch)
+        self._files[day]["rows"] += batch.num_rows
+
+    def close(self) -> list[dict]:
+        for day, writer in self._writers.items():
+            writer.close()
+            path = os.path.join(self.directory, self._files[day]["path"])
+            os.replace(f"{path}.tmp", path)
+            self._files[day]["bytes"] = os.path.getsize(path)
+        return [self._files[day] for day in sorted(self._files)]
+
+    def abort(self) -> None:
+        for day, writer in self._writers.items():
+            writer.close()
+            os.remove(os.path.join(self.directory, f"{self._files[day]['path']}.tmp"))
+
+
+def export_dataset_sync(
+    db: Session,
+    dataset: ExportDataset,
+    directory: str,
+    since: Optional[datetime],
+    until: datetime,
+    run_id: str,
+    batch_rows: int,
+) -> list[dict]:
+    """
+    Stream ``dataset``'s rows in (since, until] from a server-side cursor
+    into one Parquet file per partition date. Returns the manifest entries
+    of the files written.
+    """
+    watermark = getattr(dataset.model, dataset.watermark_column)
+    partition_index = dataset.schema.names.index(dataset.partition_column)
+    stmt = select(*(getattr(dataset.model, name) for name in dataset.schema.names)).where(watermark <= until)
+    if since is not None:
+        stmt = stmt.where(watermark > since)
+    result = db.execute(stmt.order_by(watermark).execution_options(yield_per=batch_rows))
+
+    writers = _PartitionWriters(directory, dataset, run_id)
+    try:
+        for rows in result.partitions():
+            by_day: dict[date, list] = {}
+            for row in rows:
+                by_day.setdefault(row[partition_index].date(), []).append(row)
+            for day, day_rows in by_day.items():
+                writers.write(day, _to_record_batch(dataset, day_rows))
+    except Exception:
+        writers.abort()
+        raise
+    return writers.close()
+
+
+def export_parquet_sync(
+    db: Session,
+    directory: Optional[str] = None,
+    now: Optional[datetime] = None,
+) -> dict[str, int]:
+    """
+    Export every dataset's rows written since its watermark, then record
+    the new files and watermarks in ``manifest.json``. Rows newer than
+    ``PARQUET_EXPORT_LAG_MINUTES`` wait for the next run. A run that fails
+    leaves the manifest untouched and is redone in full next time. Metric
+    rows replaced by a replay stay in earlier files; readers must apply
+    the manifest's ``dedupe`` rule (latest created_at per coin and
+    fetched_at).
+    Returns the rows exported per dataset.
+    """
+    directory = directory or settings.PARQUET_EXPORT_DIR
+    os.makedirs(directory, exist_ok=True)
+    until = (now or datetime.utcnow()) - timedelta(minutes=settings.PARQUET_EXPORT_LAG_MINUTES)
+    run_id = f"{until:%Y%m%dT%H%M%S}"
+    manifest = load_manifest(directory)
+
+    exported = {}
+    for dataset in EXPORT_DATASETS:
+        entry = manifest["datasets"].setdefault(dataset.name, {"watermark": None, "rows": 0, "files": []})
+        _remove_orphans(directory, dataset, {file["path"] for file in entry["files"]})
+        since = datetime.fromisoformat(entry["watermark"]) if entry["watermark"] else None
+        if since is not None and since >= until:
+            exported[dataset.name] = 0
+            continue
+
+        files = export_dataset_sync(
+            db, dataset, directory, since, until, run_id, settings.PARQUET_EXPORT_BATCH_ROWS
+        )
+        for file in files:
+            file["exported_at"] = run_id
+        entry["files"].extend(files)
+        entry["rows"] += sum(file["rows"] for file in files)
+        entry["watermark"] = until.isoformat()
+        entry["watermark_column"] = dataset.watermark_column
+        entry["partition_column"] = dataset.partition_column
+        entry["schema"] = [{"name": field.name, "type": str(field.type)} for field in dataset.schema]
+        if dataset.key_columns:
+            entry["dedupe"] = {
+                "key_columns": list(dataset.key_columns),
+                "keep_greatest": dataset.version_column,
+            }
+        exported[dataset.name] = sum(file["rows"] for file in files)
+
+    manifest["version"] = MANIFEST_VERSION
+    manifest["updated_at"] = datetime.utcnow().isoformat()
+    write_manifest(directory, manifest)
+    logger.info(f"📦 Exported to Parquet up to {until.isoformat()}: {exported}")
+    return exported
@@ -0,0 +1,138 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import Coin, Metric, Score
+from app.models.metric import METRIC_SOURCE_COIN
+
+# How much the latest score vs. recent market-cap volatility drives priority
+SCORE_PRIORITY_WEIGHT = 0.7
+VOLATILITY_PRIORITY_WEIGHT = 0.3
+
+
+@dataclass
+class RefreshCandidate:
+    coingeckoid: str
+    last_fetched_at: Optional[datetime]
+    final_score: Optional[float]
+    volatility: Optional[float]
+
+
+def compute_refresh_interval(
+    final_score: Optional[float],
+    volatility: Optional[float],
+) -> timedelta:
+    """
+    Map a coin's best final_score (0..1) and market-cap volatility
+    (coefficient of variation, capped at 1) to a refresh interval between
+    REFRESH_MIN_INTERVAL_MINUTES and REFRESH_MAX_INTERVAL_MINUTES.
+    """
+    score = min(max(float(final_score or 0.0), 0.0), 1.0)
+    vol = min(max(float(volatility or 0.0), 0.0), 1.0)
+    priority = SCORE_PRIORITY_WEIGHT * score + VOLATILITY_PRIORITY_WEIGHT * vol
+
+    min_minutes = settings.REFRESH_MIN_INTERVAL_MINUTES
+    max_minutes = settings.REFRESH_MAX_INTERVAL_MINUTES
+    return timedelta(minutes=max_minutes - (max_minutes - min_minutes) * priority)
+
+
+def load_refresh_candidates(db: Session, now: datetime) -> list[RefreshCandidate]:
+    """
+    One row per active coin with the time of its last full fetch, its best
+    final_score across weights and its recent market-cap volatility. The
+    last fetch is a per-coin probe of ``ix_metrics_coin_full_fetch`` rather
+    than an aggregate over the whole metrics history.
+    """
+    last_fetched_at = (
+        select(func.max(Metric.fetched_at))
+        .where(
+            Metric.coin_id == Coin.id,
+            Metric.is_active == True,
+            Metric.source == METRIC_SOURCE_COIN,
+        )
+        .correlate(Coin)
+        .scalar_subquery()
+        .label("last_fetched_at")
+    )
+    best_score = (
+        select(Score.coin_id, func.max(Score.final_score).label("final_score"))
+        .group_by(Score.coin_id)
+        .subquery()
+    )
+    window_start = now - timedelta(hours=settings.REFRESH_VOLATILITY_WINDOW_HOURS)
+    volatility = (
+        select(
+            Metric.coin_id,
+            (
+                func.stddev_samp(Metric.market_cap)
+                / func.nullif(func.avg(Metric.market_cap), 0)
+            ).label("volatility"),
+        )
+        .where(Metric.is_active == True, Metric.fetched_at >= window_start)
+        .group_by(Metric.coin_id)
+        .subquery()
+    )
+
+    rows = db.execute(
+        select(
+            Coin.coingeckoid,
+            last_fetched_at,
+            best_score.c.final_score,
+            volatility.c.volatility,
+        )
+        .outerjoin(best_score, best_score.c.coin_id == Coin.id)
+        .outerjoin(volatility, volatility.c.coin_id == Coin.id)
+        .where(Coin.is_active == True)
+    ).all()
+    return [RefreshCandidate(*row) for row in rows]
+
+
+def select_due_coins(
+    candidates: list[RefreshCandidate],
+    now: datetime,
+    limit: Optional[int] = None,
+) -> list[str]:
+    """
+    CoinGecko IDs whose refresh interval has elapsed, most overdue first
+    (never-fetched coins lead), truncated to ``limit``.
+    """
+    due = []
+    for candidate in candidates:
+        if candidate.last_fetched_at is None:
+            due.append((float("inf"), candidate.coingeckoid))
+            continue
+        interval = compute_refresh_interval(candidate.final_score, candidate.volatility)
+        overdue = (now - candidate.last_fetched_at) / interval
+        if overdue >= 1:
+            due.append((overdue, candidate.coingeckoid))
+
+    due.sort(key=lambda item: item[0], reverse=True)
+    if limit is not None:
+        due = due[:limit]
+    return [coingeckoid for _, coingeckoid in due]
+
+
+def get_due_coins(
+    db: Session,
+    now: Optional[datetime] = None,
+    limit: Optional[int] = None,
+) -> list[str]:
+    """
+    Coins due for a full refresh this tick. By default the list is capped
+    at what the rate limit allows within one scheduler tick, less the
+    ``REFRESH_BUDGET_RESERVE_FRACTION`` kept for other CoinGecko callers.
+    """
+    now = now or datetime.utcnow()
+    if limit is None:
+        quota = settings.COINGECKO_RATE_LIMIT_PER_MINUTE * settings.REFRESH_TICK_MINUTES
+        limit = int(quota * (1 - settings.REFRESH_BUDGET_RESERVE_FRACTION))
+
+    candidates = load_refresh_candidates(db, now)
+    due = select_due_coins(candidates, now, limit)
+    logger.info(f"🗓️ {len(due)} of {len(candidates)} coins due for refresh (budget {limit})")
+    return due
@@ -0,0 +1,298 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+
+import numpy as np
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.latest_metrics import LATEST_METRIC_JOIN
+from app.crud.quantile_sketches import SKETCH_NAMES, get_quantile_sketches_sync
+from app.crud.score_history import record_score_history_sync
+from app.crud.scores import bulk_upsert_scores_sync
+from app.crud.scoring_runs import (
+    create_scoring_run_sync,
+    get_last_scoring_run_sync,
+    get_metrics_high_water_mark_sync,
+)
+from app.models import CoinLatestMetric, Metric, ScoringRun, ScoringWeight
+from app.models.scoring_run import SCORING_MODE_FULL, SCORING_MODE_INCREMENTAL
+from app.services.leaderboard import publish_leaderboards_sync
+from app.services.scoringsync import find_max_metrics
+from app.utils.quantile_sketch import KLLSketch
+
+# Column order of every component matrix; matches the ScoringWeight and Score fields.
+COMPONENTS = ("liquidity_score", "developer_score", "community_score", "market_score")
+
+# SCORING_NORMALIZATION values
+NORMALIZATION_MAX = "max"
+NORMALIZATION_PERCENTILE = "percentile"
+# Quantiles recorded on percentile runs; a shift in any of them forces a full rescore
+SNAPSHOT_QUANTILES = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9)
+
+
+@dataclass
+class MetricMatrix:
+    """Latest active metric of every coin, one row per coin, raw component inputs as columns."""
+
+    coin_ids: list[UUID]
+    values: np.ndarray  # shape (n_coins, len(COMPONENTS))
+
+    def __len__(self) -> int:
+        return len(self.coin_ids)
+
+
+def load_metric_matrix(db: Session, changed_since: Optional[datetime] = None) -> MetricMatrix:
+    """
+    Load the latest active metric of every coin in a single query through
+    the latest-metric pointers and reduce it to the raw input of each
+    component: liquidity, GitHub activity, twitter + reddit sentiment and
+    market cap + volume. With ``changed_since`` only coins with a metric
+    created after it are loaded.
+    """
+    query = (
+        select(
+            Metric.coin_id,
+            Metric.liquidity,
+            Metric.github_activity,
+            Metric.twitter_sentiment,
+            Metric.reddit_sentiment,
+            Metric.market_cap,
+            Metric.volume_24h,
+        )
+        .join(CoinLatestMetric, LATEST_METRIC_JOIN)
+    )
+    if changed_since is not None:
+        query = query.where(Metric.coin_id.in_(
+            select(Metric.coin_id).where(Metric.created_at > changed_since).distinct()
+        ))
+    rows = db.execute(query).all()
+
+    if not rows:
+        return MetricMatrix(coin_ids=[], values=np.zeros((0, len(COMPONENTS))))
+
+    raw = np.array([row[1:] for row in rows], dtype=float)
+    raw = np.nan_to_num(raw, nan=0.0)  # NULL columns arrive as NaN
+    values = np.column_stack([
+        raw[:, 0],
+        raw[:, 1],
+        raw[:, 2] + raw[:, 3],
+        raw[:, 4] + raw[:, 5],
+    ])
+    return MetricMatrix(coin_ids=[row[0] for row in rows], values=values)
+
+
+def normalization_vector(max_metrics: dict) -> np.ndarray:
+    """`find_max_metrics` output as a divisor per component column."""
+    return np.array([
+        max_metrics["max_liquidity"],
+        max_metrics["max_github_activity"],
+        max_metrics["max_community"],
+        max_metrics["max_market"],
+    ], dtype=float)
+
+
+def compute_component_matrix(matrix: MetricMatrix, max_metrics: dict) -> np.ndarray:
+    """Vectorized `calculate_component_scores`: every value normalized and capped at 1."""
+    return np.minimum(1.0, matrix.values / normalization_vector(max_metrics))
+
+
+def compute_percentile_matrix(matrix: MetricMatrix, sketches: dict[str, KLLSketch]) -> np.ndarray:
+    """
+    Percentile-rank normalization: each value becomes the fraction of the
+    universe below it according to the component's quantile sketch, so a
+    single outlier cannot squash everyone else towards 0.
+    """
+    return np.column_stack([
+        sketches[name].ranks(matrix.values[:, column]) for column, name in enumerate(SKETCH_NAMES)
+    ])
+
+
+def percentile_snapshot(sketches: dict[str, KLLSketch]) -> dict:
+    """
+    Deciles of every sketch to 3 significant digits. Recorded on each run
+    in place of the maxima, so incremental runs stay incremental until the
+    distribution itself moves.
+    """
+    snapshot: dict = {"mode": NORMALIZATION_PERCENTILE}
+    for name, sketch in sketches.items():
+        snapshot[name] = [
+            None if value is None else float(f"{value:.3g}")
+            for value in sketch.quantiles(SNAPSHOT_QUANTILES)
+        ]
+    return snapshot
+
+
+@dataclass
+class Normalizer:
+    """Maps raw component inputs to [0, 1]; ``snapshot`` is what a `ScoringRun` records."""
+
+    snapshot: dict
+    max_metrics: Optional[dict] = None
+    sketches: Optional[dict[str, KLLSketch]] = None
+
+    def components(self, matrix: MetricMatrix) -> np.ndarray:
+        if self.sketches is not None:
+            return compute_percentile_matrix(matrix, self.sketches)
+        return compute_component_matrix(matrix, self.max_metrics)
+
+
+def load_normalizer(db: Session, mode: Optional[str] = None) -> Normalizer:
+    """Normalizer for ``mode`` (default ``SCORING_NORMALIZATION``): universe maxima or quantile sketches."""
+    mode = mode or settings.SCORING_NORMALIZATION
+    if mode == NORMALIZATION_PERCENTILE:
+        sketches = get_quantile_sketches_sync(db)
+        return Normalizer(snapshot=percentile_snapshot(sketches), sketches=sketches)
+    if mode == NORMALIZATION_MAX:
+        max_metrics = find_max_metrics(db)
+        return Normalizer(snapshot=max_metrics, max_metrics=max_metrics)
+    raise ValueError(f"Unknown scoring normalization {mode!r}")
+
+
+def weight_vector(weight: ScoringWeight) -> np.ndarray:
+    return np.array([getattr(weight, name) for name in COMPONENTS], dtype=float)
+
+
+def weight_matrix(weights: list[ScoringWeight]) -> np.ndarray:
+    """One column per weight profile, shape (len(COMPONENTS), n_weights)."""
+    return np.column_stack([weight_vector(weight) for weight in weights])
+
+
+def compute_final_scores(components: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Vectorized `calculate_final_score`, rounded to 4 places and capped at 1.
+    ``weights`` is a vector for one profile or a `weight_matrix` for many,
+    giving one column of final scores per profile.
+    """
+    return np.minimum(1.0, np.round(components @ weights, 4))
+
+
+def write_scores_for_weights(
+    db: Session,
+    coin_ids: list[UUID],
+    weight_ids: list[UUID],
+    components: np.ndarray,
+    final_scores: np.ndarray,
+    commit: bool = True,
+) -> int:
+    """Bulk-upsert every (coin, weight) score of a multi-weight run in a single transaction."""
+    component_rows = [dict(zip(COMPONENTS, row, strict=True)) for row in components.tolist()]
+    rows = [
+        dict(component_rows[i], coin_id=coin_id, scoring_weight_id=weight_id, final_score=finals[j])
+        for i, (coin_id, finals) in enumerate(zip(coin_ids, final_scores.tolist(), strict=True))
+        for j, weight_id in enumerate(weight_ids)
+    ]
+    return bulk_upsert_scores_sync(db, rows, commit=commit)
+
+
+def needs_full_rescore(
+    last_run: Optional[ScoringRun],
+    normalization: dict,
+    weights: list[float],
+) -> bool:
+    """
+    A weight must be fully rescored when it has never been scored, its last
+    run saw no metrics, or the normalization snapshot or the weight profile
+    itself changed since, because every existing score is then out of date.
+    """
+    return (
+        last_run is None
+        or last_run.high_water_mark is None
+        or last_run.normalization != normalization
+        or last_run.weights != weights
+    )
+
+
+def run_scoring(db: Session, weights: list[ScoringWeight], incremental: bool = True) -> dict:
+    """
+    Score coins against ``weights`` in one vectorized pass and record a
+    `ScoringRun` per weight, committed together with the scores and their
+    `ScoreHistory` rows.
+
+    Incremental runs rescore only coins with metrics created since the
+    oldest high-water mark among the weights (minus an overlap covering
+    transactions that committed late). If any weight needs a full rescore
+    the whole universe is scored. The final scores are then published to
+    the Redis leaderboards (replacing them after a full run). Returns the
+    mode and counts.
+    """
+    started_at = datetime.utcnow()
+    high_water_mark = get_metrics_high_water_mark_sync(db)
+    normalizer = load_normalizer(db)
+    weight_vectors = {weight.id: weight_vector(weight).tolist() for weight in weights}
+    last_runs = {weight.id: get_last_scoring_run_sync(db, weight.id) for weight in weights}
+
+    full = not incremental or any(
+        needs_full_rescore(last_runs[weight.id], normalizer.snapshot, weight_vectors[weight.id])
+        for weight in weights
+    )
+    mode = SCORING_MODE_FULL if full else SCORING_MODE_INCREMENTAL
+    changed_since = None
+    if not full:
+        overlap = timedelta(seconds=settings.SCORING_HIGH_WATER_MARK_OVERLAP_SECONDS)
+        changed_since = min(run.high_water_mark for run in last_runs.values()) - overlap
+
+    matrix = load_metric_matrix(db, changed_since=changed_since)
+    written = 0
+    final_scores = None
+    if len(matrix):
+        components = normalizer.components(matrix)
+        final_scores = compute_final_scores(components, weight_matrix(weights))
+        weight_ids = [weight.id for weight in weights]
+        written = write_scores_for_weights(
+            db, matrix.coin_ids, weight_ids, components, final_scores, commit=False
+        )
+        record_score_history_sync(db, weight_ids, started_at, coin_ids=None if full else matrix.coin_ids)
+
+    for weight in weights:
+        create_scoring_run_sync(
+            db,
+            commit=False,
+            scoring_weight_id=weight.id,
+            mode=mode,
+            coins_scored=len(matrix),
+            high_water_mark=high_water_mark,
+            normalization=normalizer.snapshot,
+            weights=weight_vectors[weight.id],
+            started_at=started_at,
+        )
+    db.commit()
+
+    if final_scores is not None:
+        publish_leaderboards_sync([weight.id for weight in weights], matrix.coin_ids, final_scores, replace=full)
+
+    logger.success(
+        "[Scoring] {} run scored {} coins against {} weights ({} scores)",
+        mode, len(matrix), len(weights), written,
+    )
+    return {"mode": mode, "coins": len(matrix), "weights": len(weights), "scores": written}
+
+
+def score_universe(db: Session, weight: ScoringWeight, incremental: bool = True) -> int:
+    """
+    Score coins against ``weight`` in one pass: one query for the latest
+    metrics, O(1) normalization maxima, array arithmetic for the scores and
+    a bulk write. Only changed coins are rescored unless a full rescore is
+    due or ``incremental`` is False. Returns coins scored.
+    """
+    return run_scoring(db, [weight], incremental=incremental)["coins"]
+
+
+def score_universe_all_weights(
+    db: Session,
+    weights: list[ScoringWeight],
+    incremental: bool = True,
+) -> int:
+    """
+    Score coins against every weight profile in one pass: the component
+    matrix is computed once and multiplied by the weight matrix, so each
+    extra profile only adds a matrix column and its rows to the bulk
+    upsert. Returns the number of (coin, weight) scores written.
+    """
+    if not weights:
+        logger.warning("[Scoring] No scoring weights defined; nothing to score")
+        return 0
+    return run_scoring(db, weights, incremental=incremental)["scores"]
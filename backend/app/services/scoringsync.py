@@ -1,6 +1,6 @@
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app.crud.metrics import get_latest_active_by_coin_sync
+from app.crud.normalization_stats import get_normalization_maxima_sync
 from app.models import Metric, ScoringWeight, Score
 from app.schemas.score import ScoreCreate
 from uuid import UUID
@@ -8,24 +8,12 @@ from loguru import logger
 
 
 def find_max_metrics(db: Session) -> dict:
-    """Find the maximum values for each metric across all coins."""
+    """
+    Normalization maxima over every coin's latest active metric, read from
+    the incrementally maintained normalization stats table.
+    """
     logger.debug("[Scoring] Fetching max metrics for normalization...")
-    max_metrics = db.query(
-        func.max(Metric.liquidity).label('max_liquidity'),
-        func.max(Metric.github_activity).label('max_github_activity'),
-        func.max(func.coalesce(Metric.twitter_sentiment, 0) +
-                 func.coalesce(Metric.reddit_sentiment, 0)).label('max_community'),
-        func.max(func.coalesce(Metric.market_cap, 0) +
-                 func.coalesce(Metric.volume_24h, 0)).label('max_market')
-    ).first()
-
-    results = {
-        'max_liquidity': max_metrics.max_liquidity or 1,
-        'max_github_activity': max_metrics.max_github_activity or 1,
-        'max_community': max_metrics.max_community or 1,
-        'max_market': max_metrics.max_market or 1
-    }
-
+    results = get_normalization_maxima_sync(db)
     logger.debug("[Scoring] Max metrics: {}", results)
     return results
 
@@ -0,0 +1,130 @@
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+import numpy as np
+import redis
+import redis.asyncio as aioredis
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.scoring_engine import (
+    COMPONENTS,
+    compute_final_scores,
+    load_metric_matrix,
+    load_normalizer,
+    weight_vector,
+)
+from app.utils.redis_client import get_async_redis
+
+# Redis hash holding the whole-universe component matrix:
+# version, normalization (JSON), coin_ids (16 bytes each), components (float64, row-major)
+CACHE_KEY = "scoring:component-matrix"
+
+
+@dataclass
+class CachedComponents:
+    version: str
+    coin_ids: list[UUID]
+    components: np.ndarray  # shape (n_coins, len(COMPONENTS))
+    normalization: dict
+
+    def __len__(self) -> int:
+        return len(self.coin_ids)
+
+
+def serialize_components(cached: CachedComponents) -> dict[str, bytes | str]:
+    return {
+        "version": cached.version,
+        "normalization": json.dumps(cached.normalization),
+        "coin_ids": b"".join(coin_id.bytes for coin_id in cached.coin_ids),
+        "components": np.ascontiguousarray(cached.components, dtype=np.float64).tobytes(),
+    }
+
+
+def deserialize_components(data: dict[bytes, bytes]) -> CachedComponents:
+    raw_ids = data[b"coin_ids"]
+    return CachedComponents(
+        version=data[b"version"].decode(),
+        coin_ids=[UUID(bytes=raw_ids[i:i + 16]) for i in range(0, len(raw_ids), 16)],
+        components=np.frombuffer(data[b"components"], dtype=np.float64).reshape(-1, len(COMPONENTS)),
+        normalization=json.loads(data[b"normalization"]),
+    )
+
+
+def refresh_component_cache_sync(db: Session, client: Optional[redis.Redis] = None) -> int:
+    """
+    Recompute the normalized component matrix of every coin's latest
+    metric and publish it to Redis under a new version. Returns the number
+    of coins cached.
+    """
+    normalizer = load_normalizer(db)
+    matrix = load_metric_matrix(db)
+    cached = CachedComponents(
+        version=datetime.utcnow().isoformat(),
+        coin_ids=matrix.coin_ids,
+        components=normalizer.components(matrix) if len(matrix) else np.zeros((0, len(COMPONENTS))),
+        normalization=normalizer.snapshot,
+    )
+
+    owned = client is None
+    client = client or redis.Redis.from_url(settings.REDIS_URL)
+    try:
+        pipe = client.pipeline()
+        pipe.delete(CACHE_KEY)
+        pipe.hset(CACHE_KEY, mapping=serialize_components(cached))
+        pipe.execute()
+    finally:
+        if owned:
+            client.close()
+
+    logger.info(f"🧮 Cached component matrix for {len(cached)} coins (version {cached.version})")
+    return len(cached)
+
+
+_memo: Optional[CachedComponents] = None
+
+
+async def get_cached_components(client: Optional[aioredis.Redis] = None) -> Optional[CachedComponents]:
+    """
+    The cached component matrix, or None before the first refresh. The
+    matrix is kept in process memory and only re-downloaded when the
+    version in Redis moves, so most requests cost a single HGET.
+    """
+    global _memo
+    client = client or get_async_redis()
+    version = await client.hget(CACHE_KEY, "version")
+    if version is None:
+        return None
+    if _memo is None or _memo.version != version.decode():
+        data = await client.hgetall(CACHE_KEY)
+        if not data:
+            return None
+        _memo = deserialize_components(data)
+    return _memo
+
+
+def rank_what_if(cached: CachedComponents, weights, top_k: int) -> list[dict]:
+    """
+    Score every cached coin against hypothetical ``weights`` (anything with
+    the four ScoringWeight fields) and return the ``top_k`` best, highest
+    first, with their component scores. Nothing is written.
+    """
+    if not len(cached) or top_k <= 0:
+        return []
+    finals = compute_final_scores(cached.components, weight_vector(weights))
+    top_k = min(top_k, len(finals))
+    top = np.argpartition(-finals, top_k - 1)[:top_k]
+    top = top[np.argsort(-finals[top], kind="stable")]
+    return [
+        {
+            "rank": rank,
+            "coin_id": cached.coin_ids[i],
+            "final_score": float(finals[i]),
+            **{name: float(value) for name, value in zip(COMPONENTS, cached.components[i], strict=True)},
+        }
+        for rank, i in enumerate(top, start=1)
+    ]
@@ -1,13 +1,47 @@
 # app/tasks/__init__.py
 
 from .bootstrap import bootstrap_supported_coins
-from .coin_data import fetch_and_update_all_coins
+from .coin_data import (
+    aggregate_ingestion_stats,
+    fetch_and_update_all_coins,
+    ingest_coin_shard,
+    refresh_due_coins,
+    refresh_market_data_for_all_coins,
+)
+from .exports import export_parquet
+from .maintenance import (
+    maintain_metric_partitions,
+    maintain_score_history_partitions,
+    rebuild_latest_metric_pointers,
+    roll_up_metrics,
+)
 from .notifications import notify_pending_suggestions_async
-from .scoring_all import score_all_coins
+from .scoring_all import (
+    rebuild_leaderboards,
+    rebuild_quantile_sketches,
+    recompute_normalization_stats,
+    refresh_component_cache,
+    score_all_coins,
+    score_all_weights,
+)
 
 __all__ = [
     "bootstrap_supported_coins",
+    "aggregate_ingestion_stats",
     "fetch_and_update_all_coins",
+    "ingest_coin_shard",
+    "refresh_due_coins",
+    "refresh_market_data_for_all_coins",
     "notify_pending_suggestions_async",
+    "export_parquet",
+    "maintain_metric_partitions",
+    "maintain_score_history_partitions",
+    "rebuild_latest_metric_pointers",
+    "roll_up_metrics",
+    "rebuild_leaderboards",
+    "rebuild_quantile_sketches",
+    "recompute_normalization_stats",
+    "refresh_component_cache",
     "score_all_coins",
+    "score_all_weights",
 ]
@@ -1,61 +1,80 @@
 from loguru import logger
+from app.core.config import settings
 from app.db.session import SessionLocal
 from app.utils.api_clients.coingeckosync import SyncCoinGeckoClient
-from app.crud.coins import create_coin_sync, get_all_coingeckoids_sync
+from app.utils.api_clients.http_cache import build_response_cache
+from app.crud.coins import bulk_create_coins_sync, get_all_coingeckoids_sync
 from app.schemas.coin import CoinCreate
 from app.celery_app import celery_app
 
 
 @celery_app.task(name="app.tasks.bootstrap.bootstrap_supported_coins")
-def bootstrap_supported_coins():
-    """Sync version of the bootstrap task for Celery."""
+def bootstrap_supported_coins(
+    batch_size: int = settings.BOOTSTRAP_BATCH_SIZE,
+    streaming: bool = settings.BOOTSTRAP_STREAMING,
+):
+    """
+    Sync version of the bootstrap task for Celery. New coins are inserted in batches.
+    In streaming mode `/coins/list` is parsed incrementally and fed straight into the
+    batches, so memory stays bounded by ``batch_size`` rather than the full list.
+    """
     logger.info("📥 Bootstrapping supported coins from CoinGecko...")
-    client = SyncCoinGeckoClient()
+    client = SyncCoinGeckoClient(cache=build_response_cache())
 
     try:
-        logger.info("🔌 Fetching supported coins list from CoinGecko...")
-        supported = client.get_supported_coins()
-        logger.success(f"✅ Retrieved {len(supported)} supported coins from CoinGecko")
-
         db = SessionLocal()
 
         logger.info("🔎 Checking which coins already exist in the DB...")
-        existing_ids = get_all_coingeckoids_sync(db)
-        existing_ids_set = set(existing_ids)
-        logger.info(f"📊 {len(existing_ids)} existing coins found in the database")
+        existing_ids_set = set(get_all_coingeckoids_sync(db))
+        logger.info(f"📊 {len(existing_ids_set)} existing coins found in the database")
+
+        logger.info(f"🔌 Fetching supported coins list from CoinGecko (streaming={streaming})...")
+        if streaming:
+            supported = client.iter_supported_coins()
+        else:
+            supported = client.get_supported_coins()
+            logger.success(f"✅ Retrieved {len(supported)} supported coins from CoinGecko")
 
-        new_coins = [
-            coin for coin in supported
-            if coin.get("id") not in existing_ids_set
-        ]
-        logger.info(f"📥 {len(new_coins)} new coins will be inserted")
+        logger.info(f"📥 New coins will be inserted in batches of {batch_size}")
 
+        seen = 0
         count = 0
-        for i, coin in enumerate(new_coins, 1):
+        batch: list[CoinCreate] = []
+
+        def flush_batch() -> None:
+            nonlocal batch, count
+            try:
+                count += bulk_create_coins_sync(db, batch)
+                logger.info(f"🔄 Progress: {count} coins inserted ({seen} listed so far)")
+            except Exception as e:
+                db.rollback()
+                logger.warning(f"⚠️ Failed to insert batch of {len(batch)} coins: {e}")
+            batch = []
+
+        for coin in supported:
+            seen += 1
             coingeckoid = coin.get("id")
+            if coingeckoid in existing_ids_set:
+                continue
             name = coin.get("name")
             symbol = coin.get("symbol")
             if not coingeckoid or not name or not symbol:
                 logger.warning(f"⚠️ Skipping coin due to missing fields: {coin}")
                 continue
 
-            try:
-                create_coin_sync(db, CoinCreate(
-                    coingeckoid=coingeckoid,
-                    symbol=symbol.upper(),
-                    name=name,
-                    is_active=True,
-                ))
-                count += 1
-                logger.debug(f"[{count}] ✅ Inserted: {name} ({symbol})")
+            batch.append(CoinCreate(
+                coingeckoid=coingeckoid,
+                symbol=symbol.upper(),
+                name=name,
+                is_active=True,
+            ))
+            if len(batch) >= batch_size:
+                flush_batch()
 
-                if count % 100 == 0:
-                    logger.info(f"🔄 Progress: {count}/{len(new_coins)} coins inserted")
-            except Exception as e:
-                logger.warning(f"⚠️ Failed to insert coin '{coingeckoid}': {e}")
+        if batch:
+            flush_batch()
 
-        db.commit()
-        logger.success(f"🎉 Inserted {count} new coins into the database")
+        logger.success(f"🎉 Inserted {count} new coins into the database ({seen} listed by CoinGecko)")
         logger.info("🔁 Triggering follow-up task: fetch_and_update_all_coins...")
         logger.success("✅ Bootstrapping complete.")
 
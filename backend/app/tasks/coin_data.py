@@ -1,22 +1,29 @@
-import time
+import asyncio
+from celery import chord
 from loguru import logger
+from app.core.config import settings
 from app.db.session import SessionLocal
-from app.services.coin_updater_sync import update_coin_and_metrics_from_coingecko_sync
-from app.utils.api_clients.coingeckosync import SyncCoinGeckoClient
+from app.services.ingestion import aggregate_shard_stats, ingest_coins, refresh_market_data
 from app.celery_app import celery_app
 from app.crud.coins import get_tracked_coins_sync
+from app.services.refresh_scheduler import get_due_coins
+from app.tasks.scoring_all import refresh_component_cache
+from app.utils.redis_client import acquire_task_lock, release_task_lock
+
+# Held from a scheduler tick's dispatch until its chord callback
+REFRESH_LOCK_NAME = "refresh_due_coins"
 
 
 @celery_app.task(name="app.tasks.coin_data.fetch_and_update_all_coins")
-def fetch_and_update_all_coins():
+def fetch_and_update_all_coins(shard_size: int = settings.INGESTION_SHARD_SIZE):
     """
     Sync version of Celery task to fetch & update all tracked coins and their metrics from CoinGecko.
-    Updates are done sequentially with sleep to avoid rate limits.
+    Coin IDs are split into shards of ``shard_size`` and fanned out as a chord, so any number of
+    workers share the load; a Redis-backed rate limiter keeps their combined request rate in quota.
     """
     logger.info("🚀 Starting unified coin + metrics update task from CoinGecko...")
 
     db = SessionLocal()
-    client = SyncCoinGeckoClient()
 
     try:
         coin_ids = get_tracked_coins_sync(db)
@@ -25,22 +32,128 @@ def fetch_and_update_all_coins():
             logger.warning("⚠️ No tracked coins found to update.")
             return
 
-        for coin_id in coin_ids:
-            try:
-                logger.info(f"🔄 Updating coin + metrics: {coin_id}")
-                result = update_coin_and_metrics_from_coingecko_sync(db, coin_id, coingecko_client=client)
-                if result:
-                    logger.success(f"✅ Updated: {result.name}")
-                else:
-                    logger.warning(f"❌ Failed to update: {coin_id}")
-            except Exception as e:
-                logger.exception(f"🔥 Error updating coin '{coin_id}': {e}")
-            time.sleep(1)  # 🕒 Avoid CoinGecko rate limits
+        shards = [coin_ids[i:i + shard_size] for i in range(0, len(coin_ids), shard_size)]
+        chord([ingest_coin_shard.s(shard) for shard in shards])(aggregate_ingestion_stats.s())
 
-        logger.info("🎉 Coin + metrics update task completed.")
+        logger.info(f"📤 Dispatched {len(coin_ids)} coins in {len(shards)} shards of up to {shard_size}")
+        return {"total": len(coin_ids), "shards": len(shards)}
 
     except Exception as e:
         logger.exception(f"🚨 Failed during coin update task: {e}")
 
     finally:
-        client.close()
+        db.close()
+
+
+@celery_app.task(name="app.tasks.coin_data.ingest_coin_shard")
+def ingest_coin_shard(coin_ids: list[str]):
+    """Fetch & update one shard of coins through the ingestion engine and return its stats."""
+    logger.info(f"🧩 Ingesting shard of {len(coin_ids)} coins...")
+
+    db = SessionLocal()
+
+    try:
+        stats = asyncio.run(ingest_coins(db, coin_ids))
+        return stats.as_dict()
+
+    except Exception as e:
+        db.rollback()
+        logger.exception(f"🚨 Failed during ingestion shard: {e}")
+
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.coin_data.aggregate_ingestion_stats")
+def aggregate_ingestion_stats(shard_stats: list):
+    """Chord callback: combine per-shard stats into totals for the whole run."""
+    totals = aggregate_shard_stats(shard_stats)
+    logger.info(
+        "🎉 Coin + metrics update completed: {succeeded}/{total} ok, {failed} failed, "
+        "{rate_limited} rate-limited of {requests} requests across {shards} shards "
+        "({failed_shards} crashed, slowest {max_shard_seconds}s)",
+        **totals,
+    )
+    refresh_component_cache.delay()
+    return totals
+
+
+@celery_app.task(name="app.tasks.coin_data.refresh_market_data_for_all_coins")
+def refresh_market_data_for_all_coins():
+    """
+    Fast market refresh: update market cap, volume and liquidity for every tracked coin
+    from paginated `/coins/markets`, leaving the per-coin call for slow-changing data.
+    """
+    logger.info("🚀 Starting fast market refresh from CoinGecko...")
+
+    db = SessionLocal()
+
+    try:
+        stats = asyncio.run(refresh_market_data(db))
+        logger.info("🎉 Fast market refresh completed.")
+        refresh_component_cache.delay()
+        return stats.as_dict()
+
+    except Exception as e:
+        db.rollback()
+        logger.exception(f"🚨 Failed during market refresh task: {e}")
+
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.coin_data.refresh_due_coins")
+def refresh_due_coins(shard_size: int = settings.INGESTION_SHARD_SIZE):
+    """
+    Scheduler tick: fully refresh only the coins whose priority-based refresh interval has elapsed,
+    most overdue first, within the rate-limit budget of one tick. Due coins are fanned out in shards
+    as a chord, like `fetch_and_update_all_coins`; a Redis lock held until the chord callback keeps
+    a slow tick from overlapping the next one.
+    """
+    logger.info("🗓️ Starting scheduled refresh of due coins...")
+
+    token = acquire_task_lock(REFRESH_LOCK_NAME, timeout=settings.REFRESH_TICK_MINUTES * 60)
+    if token is None:
+        logger.warning("⏭️ Previous refresh tick still running; skipping this one.")
+        return
+
+    db = SessionLocal()
+    dispatched = False
+
+    try:
+        coin_ids = get_due_coins(db)
+        if not coin_ids:
+            logger.info("✅ No coins due for refresh this tick.")
+            return
+
+        shards = [coin_ids[i:i + shard_size] for i in range(0, len(coin_ids), shard_size)]
+        chord([ingest_coin_shard.s(shard) for shard in shards])(finish_due_refresh.s(token))
+        dispatched = True
+
+        logger.info(f"📤 Dispatched {len(coin_ids)} due coins in {len(shards)} shards of up to {shard_size}")
+        return {"total": len(coin_ids), "shards": len(shards)}
+
+    except Exception as e:
+        db.rollback()
+        logger.exception(f"🚨 Failed during scheduled refresh: {e}")
+
+    finally:
+        db.close()
+        if not dispatched:
+            release_task_lock(REFRESH_LOCK_NAME, token)
+
+
+@celery_app.task(name="app.tasks.coin_data.finish_due_refresh")
+def finish_due_refresh(shard_stats: list, lock_token: str):
+    """Chord callback for a scheduler tick: combine shard stats and release the tick's lock."""
+    try:
+        totals = aggregate_shard_stats(shard_stats)
+        logger.info(
+            "🎉 Scheduled refresh completed: {succeeded}/{total} ok, {failed} failed "
+            "across {shards} shards ({failed_shards} crashed)",
+            **totals,
+        )
+        refresh_component_cache.delay()
+        return totals
+    finally:
+        release_task_lock(REFRESH_LOCK_NAME, lock_token)
@@ -0,0 +1,25 @@
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.celery_app import celery_app
+from app.db.session import SessionLocal
+from app.services.parquet_export import export_parquet_sync
+
+
+@celery_app.task(name="app.tasks.exports.export_parquet")
+def export_parquet() -> dict:
+    """
+    Append metrics and score history written since the last export to the
+    date-partitioned Parquet files under ``PARQUET_EXPORT_DIR``.
+    """
+    logger.info("📦 Exporting new metrics and scores to Parquet...")
+    db: Session = SessionLocal()
+    try:
+        exported = export_parquet_sync(db)
+        logger.success(f"✅ Parquet export finished: {exported}")
+        return exported
+    except Exception as e:
+        logger.exception(f"🚨 Parquet export failed: {e}")
+        raise e
+    finally:
+        db.close()
@@ -0,0 +1,94 @@
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.celery_app import celery_app
+from app.crud.latest_metrics import refresh_latest_metrics_sync
+from app.crud.metric_partitions import apply_metric_retention_sync, ensure_metric_partitions_sync
+from app.crud.metric_rollups import roll_up_new_metrics_sync
+from app.crud.score_history import drop_expired_score_history_sync, ensure_score_history_partitions_sync
+from app.db.session import SessionLocal
+
+
+@celery_app.task(name="app.tasks.maintenance.rebuild_latest_metric_pointers")
+def rebuild_latest_metric_pointers() -> None:
+    """
+    Re-derive every coin's latest-metric pointer from the metrics table.
+    Run once after deploying the coin_latest_metrics table to backfill it.
+    """
+    logger.info("🧭 Rebuilding latest-metric pointers...")
+    db: Session = SessionLocal()
+    try:
+        refresh_latest_metrics_sync(db)
+        db.commit()
+        logger.success("✅ Latest-metric pointers rebuilt")
+    except Exception as e:
+        db.rollback()
+        logger.exception(f"🚨 Failed to rebuild latest-metric pointers: {e}")
+        raise e
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.maintenance.maintain_score_history_partitions")
+def maintain_score_history_partitions() -> dict:
+    """
+    Create the upcoming monthly score_history partitions before any run
+    writes into them, and drop the partitions past the retention window.
+    """
+    logger.info("🗂️ Maintaining score_history partitions...")
+    db: Session = SessionLocal()
+    try:
+        ensured = ensure_score_history_partitions_sync(db)
+        dropped = drop_expired_score_history_sync(db)
+        db.commit()
+        logger.success(f"✅ score_history partitions ready through {ensured[-1]}; dropped {len(dropped)}")
+        return {"ensured": ensured, "dropped": dropped}
+    except Exception as e:
+        db.rollback()
+        logger.exception(f"🚨 Failed to maintain score_history partitions: {e}")
+        raise e
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.maintenance.maintain_metric_partitions")
+def maintain_metric_partitions() -> dict:
+    """
+    Create the upcoming monthly metrics partitions before ingestion writes into them, and
+    detach or drop the partitions past the retention window instead of DELETEing rows.
+    """
+    logger.info("🗂️ Maintaining metrics partitions...")
+    db: Session = SessionLocal()
+    try:
+        ensured = ensure_metric_partitions_sync(db)
+        retired = apply_metric_retention_sync(db)
+        db.commit()
+        logger.success(f"✅ metrics partitions ready through {ensured[-1]}; retired {len(retired)}")
+        return {"ensured": ensured, "retired": retired}
+    except Exception as e:
+        db.rollback()
+        logger.exception(f"🚨 Failed to maintain metrics partitions: {e}")
+        raise e
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.maintenance.roll_up_metrics")
+def roll_up_metrics(full: bool = False) -> int:
+    """
+    Fold metrics written since the last run into the hourly and daily
+    rollups. ``full`` re-aggregates every day still in the metrics table.
+    """
+    logger.info(f"🧮 Rolling up {'all' if full else 'new'} metrics...")
+    db: Session = SessionLocal()
+    try:
+        written = roll_up_new_metrics_sync(db, full=full)
+        db.commit()
+        logger.success(f"✅ Wrote {written} metric rollups")
+        return written
+    except Exception as e:
+        db.rollback()
+        logger.exception(f"🚨 Failed to roll up metrics: {e}")
+        raise e
+    finally:
+        db.close()
@@ -2,16 +2,19 @@
 from app.celery_app import celery_app
 from sqlalchemy.orm import Session
 from app.db.session import SessionLocal
-from app.services.scoringsync import score_coin
-from app.crud.scoring_weights import getsync
-from app.crud.coins import get_all_sync
+from app.services.scoring_engine import score_universe, score_universe_all_weights
+from app.crud.scoring_weights import get_all_sync, getsync
+from app.crud.normalization_stats import recompute_normalization_stats_sync
+from app.crud.quantile_sketches import rebuild_quantile_sketches_sync
+from app.services.leaderboard import rebuild_leaderboards_sync
+from app.services.what_if import refresh_component_cache_sync
 from uuid import UUID
 
 from loguru import logger
 
 
 @celery_app.task(name="app.tasks.scoring_all.score_all_coins")
-def score_all_coins(scoring_weight_id: str = "f890475c-ad0e-4b52-8cc2-ba3d02e5cacf") -> str:
+def score_all_coins(scoring_weight_id: str = "f890475c-ad0e-4b52-8cc2-ba3d02e5cacf", full: bool = False) -> str:
     logger.info(f"[Scoring Task] Starting bulk scoring with weight_id={scoring_weight_id}")
     db: Session = SessionLocal()
     try:
@@ -20,15 +23,13 @@ def score_all_coins(scoring_weight_id: str = "f890475c-ad0e-4b52-8cc2-ba3d02e5ca
             logger.warning(f"[Scoring Task] ScoringWeight {scoring_weight_id} not found")
             return f"ScoringWeight {scoring_weight_id} not found"
 
-        coins = get_all_sync(db)
-        logger.info(f"[Scoring Task] Found {len(coins)} coins to score")
+        # Vectorized pass over coins with new metrics (or all of them when a full rescore is due);
+        # per-coin scoring stays in scoringsync
+        scored = score_universe(db, weight, incremental=not full)
+        refresh_component_cache.delay()
 
-        for coin in coins:
-            logger.debug(f"[Scoring Task] Scoring coin_id={coin.id}")
-            score_coin(db, coin.id, weight)
-
-        logger.success(f"[Scoring Task] Successfully scored {len(coins)} coins with weight_id={scoring_weight_id}")
-        return f"Scored {len(coins)} coins using ScoringWeight {scoring_weight_id}"
+        logger.success(f"[Scoring Task] Successfully scored {scored} coins with weight_id={scoring_weight_id}")
+        return f"Scored {scored} coins using ScoringWeight {scoring_weight_id}"
 
     except Exception as e:
         db.rollback()
@@ -36,4 +37,94 @@ def score_all_coins(scoring_weight_id: str = "f890475c-ad0e-4b52-8cc2-ba3d02e5ca
         raise e
     finally:
         db.close()
-        logger.info(f"[Scoring Task] Database session closed for weight_id={scoring_weight_id}")
\ No newline at end of file
+        logger.info(f"[Scoring Task] Database session closed for weight_id={scoring_weight_id}")
+
+@celery_app.task(name="app.tasks.scoring_all.score_all_weights")
+def score_all_weights(full: bool = False) -> str:
+    """
+    Score coins against every ScoringWeight profile in a single pass. Only coins with new
+    metrics are rescored unless ``full`` is set or a full rescore is due.
+    """
+    logger.info("[Scoring Task] Starting bulk scoring for all weight profiles")
+    db: Session = SessionLocal()
+    try:
+        weights = get_all_sync(db)
+        if not weights:
+            logger.warning("[Scoring Task] No ScoringWeight profiles found")
+            return "No ScoringWeight profiles found"
+
+        scored = score_universe_all_weights(db, weights, incremental=not full)
+        refresh_component_cache.delay()
+
+        logger.success(f"[Scoring Task] Wrote {scored} scores across {len(weights)} weight profiles")
+        return f"Wrote {scored} scores across {len(weights)} ScoringWeight profiles"
+
+    except Exception as e:
+        db.rollback()
+        logger.exception(f"[Scoring Task] Failed scoring all weight profiles: {e}")
+        raise e
+    finally:
+        db.close()
+        logger.info("[Scoring Task] Database session closed for all-weights scoring")
+
+
+@celery_app.task(name="app.tasks.scoring_all.recompute_normalization_stats")
+def recompute_normalization_stats() -> dict:
+    """Rebuild the normalization stats table from every coin's latest active metric."""
+    logger.info("[Scoring Task] Recomputing normalization stats")
+    db: Session = SessionLocal()
+    try:
+        return recompute_normalization_stats_sync(db)
+    except Exception as e:
+        db.rollback()
+        logger.exception(f"[Scoring Task] Failed to recompute normalization stats: {e}")
+        raise e
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.scoring_all.rebuild_quantile_sketches")
+def rebuild_quantile_sketches() -> dict:
+    """
+    Rebuild the percentile-normalization sketches from every coin's latest active metric,
+    compacting the per-batch deltas written since the last rebuild.
+    """
+    logger.info("[Scoring Task] Rebuilding quantile sketches")
+    db: Session = SessionLocal()
+    try:
+        sketches = rebuild_quantile_sketches_sync(db)
+        return {name: sketch.count for name, sketch in sketches.items()}
+    except Exception as e:
+        db.rollback()
+        logger.exception(f"[Scoring Task] Failed to rebuild quantile sketches: {e}")
+        raise e
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.scoring_all.refresh_component_cache")
+def refresh_component_cache() -> int:
+    """Publish the normalized component matrix of every coin to Redis for what-if scoring."""
+    logger.info("[Scoring Task] Refreshing the component matrix cache")
+    db: Session = SessionLocal()
+    try:
+        return refresh_component_cache_sync(db)
+    except Exception as e:
+        logger.exception(f"[Scoring Task] Failed to refresh the component matrix cache: {e}")
+        raise e
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.scoring_all.rebuild_leaderboards")
+def rebuild_leaderboards() -> dict:
+    """Republish every weight's Redis leaderboard from the scores table, e.g. after a Redis flush."""
+    logger.info("[Scoring Task] Rebuilding leaderboards")
+    db: Session = SessionLocal()
+    try:
+        return rebuild_leaderboards_sync(db)
+    except Exception as e:
+        logger.exception(f"[Scoring Task] Failed to rebuild leaderboards: {e}")
+        raise e
+    finally:
+        db.close()
@@ -1,57 +1,123 @@
+import json
 import httpx
 import asyncio
 from typing import Any, Optional
 from loguru import logger
 
+from app.core.config import settings
+from app.utils.api_clients.http_cache import ResponseCache, lookup_response, store_response
+from app.utils.rate_limiter import RateLimiter
+
 COINGECKO_BASE_URL = "https://api.coingecko.com/api/v3"
 
 
 class CoinGeckoClient:
-    def __init__(self, base_url: str = COINGECKO_BASE_URL, timeout: int = 10):
+    def __init__(
+        self,
+        base_url: str = COINGECKO_BASE_URL,
+        timeout: int = 10,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+    ):
         self.base_url = base_url
         self.timeout = timeout
         self.client = httpx.AsyncClient(timeout=self.timeout)
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.request_count = 0
+        self.rate_limited_count = 0
+        self.cache_hits = 0
+
+    async def _get(self, url: str, **kwargs) -> httpx.Response:
+        """Issue a GET, waiting on the rate limiter first when one is set."""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        self.request_count += 1
+        return await self.client.get(url, **kwargs)
+
+    async def _get_json(
+        self, url: str, params: Optional[dict[str, Any]] = None, min_ttl: float = 0
+    ) -> Any:
+        """
+        GET ``url`` and decode JSON through the response cache: fresh entries
+        are served without a request, stale ones are revalidated with
+        If-None-Match / If-Modified-Since. Raises httpx.HTTPStatusError.
+        """
+        if self.cache is None:
+            response = await self._get(url, params=params)
+            response.raise_for_status()
+            return response.json()
+
+        lookup = lookup_response(self.cache, url, params)
+        if lookup.is_fresh():
+            self.cache_hits += 1
+            return lookup.entry.json()
+
+        response = await self._get(url, params=params, headers=lookup.conditional_headers())
+        if lookup.is_not_modified(response):
+            self.cache_hits += 1
+        return json.loads(store_response(self.cache, lookup, response, min_ttl))
 
     async def get_coin_data(self, coin_id: str) -> Optional[dict[str, Any]]:
         """
         Fetch detailed data for a specific coin by its CoinGecko ID.
         Retries on 429 Too Many Requests and other temporary errors.
         """
-        params = "?localization=false&tickers=false&market_data=true&\
-            community_data=true&developer_data=true&sparkline=false"
+        params = "?localization=false&tickers=false&market_data=true&"\
+                 "community_data=true&developer_data=true&sparkline=false"
 
         url = f"{self.base_url}/coins/{coin_id.lower()}{params}"
+        return await self._get_json_with_retries(url, label=coin_id)
+
+    async def get_coins_markets(
+        self, page: int = 1, per_page: int = 250, vs_currency: str = "usd"
+    ) -> Optional[list[dict[str, Any]]]:
+        """
+        Fetch one page of `/coins/markets`: price, market cap and volume for
+        up to ``per_page`` coins in a single request.
+        """
+        url = f"{self.base_url}/coins/markets"
+        params = {
+            "vs_currency": vs_currency,
+            "order": "market_cap_desc",
+            "per_page": per_page,
+            "page": page,
+            "sparkline": "false",
+        }
+        return await self._get_json_with_retries(url, label=f"markets p{page}", params=params)
+
+    async def _get_json_with_retries(
+        self, url: str, label: str, params: Optional[dict[str, Any]] = None
+    ) -> Optional[Any]:
+        """GET ``url`` and decode JSON, backing off on 429 Too Many Requests."""
         max_retries = 3
         delay = 2
 
         for attempt in range(1, max_retries + 1):
             try:
-                response = await self.client.get(url)
-                response.raise_for_status()
-                return response.json()
+                return await self._get_json(url, params=params)
             except httpx.HTTPStatusError as e:
                 status = e.response.status_code
                 if status == 429:
-                    logger.warning(f"[{coin_id}] ⚠️ Rate limited (429). Attempt {attempt}/{max_retries}. Retrying in {delay}s...")
+                    self.rate_limited_count += 1
+                    logger.warning(f"[{label}] ⚠️ Rate limited (429). Attempt {attempt}/{max_retries}. Retrying in {delay}s...")
                     await asyncio.sleep(delay)
                     delay *= 2
                 else:
-                    logger.error(f"[{coin_id}] ❌ HTTP error {status}: {e}")
+                    logger.error(f"[{label}] ❌ HTTP error {status}: {e}")
                     break
             except httpx.HTTPError as e:
-                logger.error(f"[{coin_id}] ❌ Connection error: {e}")
+                logger.error(f"[{label}] ❌ Connection error: {e}")
                 break
 
-        logger.warning(f"[{coin_id}] 🚫 Failed after {max_retries} retries")
+        logger.warning(f"[{label}] 🚫 Failed after {max_retries} retries")
         return None
 
     async def get_market_chart(self, coin_id: str, vs_currency: str = "usd", days: int = 30) -> Optional[dict[str, Any]]:
         url = f"{self.base_url}/coins/{coin_id}/market_chart"
         params = {"vs_currency": vs_currency, "days": days}
         try:
-            response = await self.client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+            return await self._get_json(url, params=params)
         except httpx.HTTPError as e:
             logger.error(f"CoinGecko market chart error for '{coin_id}': {e}")
             return None
@@ -59,12 +125,14 @@ class CoinGeckoClient:
     async def get_supported_coins(self) -> list[dict[str, Any]]:
         url = f"{self.base_url}/coins/list"
         try:
-            response = await self.client.get(url)
-            response.raise_for_status()
-            return response.json()
+            return await self._get_json(url, min_ttl=settings.COINGECKO_COINS_LIST_TTL)
         except httpx.HTTPError as e:
             logger.error(f"CoinGecko failed to fetch supported coins: {e}")
             return []
 
     async def close(self):
         await self.client.aclose()
+        if self.rate_limiter is not None:
+            await self.rate_limiter.close()
+        if self.cache is not None:
+            self.cache.close()
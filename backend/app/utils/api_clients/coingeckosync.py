@@ -1,16 +1,51 @@
+import json
 import time
 import httpx
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 from loguru import logger
 
+from app.core.config import settings
+from app.utils.api_clients.http_cache import ResponseCache, lookup_response, store_response
+from app.utils.json_stream import iter_json_array
+
 COINGECKO_BASE_URL = "https://api.coingecko.com/api/v3"
 
 
 class SyncCoinGeckoClient:
-    def __init__(self, base_url: str = COINGECKO_BASE_URL, timeout: int = 10):
+    def __init__(
+        self,
+        base_url: str = COINGECKO_BASE_URL,
+        timeout: int = 10,
+        cache: Optional[ResponseCache] = None,
+    ):
         self.base_url = base_url
         self.timeout = timeout
         self.client = httpx.Client(timeout=self.timeout)
+        self.cache = cache
+        self.cache_hits = 0
+
+    def _get_json(
+        self, url: str, params: Optional[dict[str, Any]] = None, min_ttl: float = 0
+    ) -> Any:
+        """
+        GET ``url`` and decode JSON through the response cache: fresh entries
+        are served without a request, stale ones are revalidated with
+        If-None-Match / If-Modified-Since. Raises httpx.HTTPStatusError.
+        """
+        if self.cache is None:
+            response = self.client.get(url, params=params)
+            response.raise_for_status()
+            return response.json()
+
+        lookup = lookup_response(self.cache, url, params)
+        if lookup.is_fresh():
+            self.cache_hits += 1
+            return lookup.entry.json()
+
+        response = self.client.get(url, params=params, headers=lookup.conditional_headers())
+        if lookup.is_not_modified(response):
+            self.cache_hits += 1
+        return json.loads(store_response(self.cache, lookup, response, min_ttl))
 
     def get_coin_data(self, coin_id: str) -> Optional[dict[str, Any]]:
         """
@@ -26,9 +61,7 @@ class SyncCoinGeckoClient:
 
         for attempt in range(1, max_retries + 1):
             try:
-                response = self.client.get(url)
-                response.raise_for_status()
-                return response.json()
+                return self._get_json(url)
             except httpx.HTTPStatusError as e:
                 status = e.response.status_code
                 if status == 429:
@@ -49,9 +82,7 @@ class SyncCoinGeckoClient:
         url = f"{self.base_url}/coins/{coin_id}/market_chart"
         params = {"vs_currency": vs_currency, "days": days}
         try:
-            response = self.client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+            return self._get_json(url, params=params)
         except httpx.HTTPError as e:
             logger.error(f"CoinGecko market chart error for '{coin_id}': {e}")
             return None
@@ -59,12 +90,64 @@ class SyncCoinGeckoClient:
     def get_supported_coins(self) -> list[dict[str, Any]]:
         url = f"{self.base_url}/coins/list"
         try:
-            response = self.client.get(url)
-            response.raise_for_status()
-            return response.json()
+            return self._get_json(url, min_ttl=settings.COINGECKO_COINS_LIST_TTL)
         except httpx.HTTPError as e:
             logger.error(f"CoinGecko failed to fetch supported coins: {e}")
             return []
 
+    def iter_supported_coins(self, chunk_size: int = 64 * 1024) -> Iterator[dict[str, Any]]:
+        """
+        Stream `/coins/list`, yielding coin dicts while the body downloads so
+        the parsed list is never held in memory. With a cache, fresh or
+        revalidated entries are parsed from the stored body, and a fully
+        read 200 body is stored afterwards (raw bytes only, a fraction of
+        the decoded list). Bodies over ``COINGECKO_COINS_LIST_CACHE_MAX_BYTES``
+        are streamed without being kept or cached, so memory stays bounded.
+        Stops early on HTTP errors.
+        """
+        url = f"{self.base_url}/coins/list"
+        min_ttl = settings.COINGECKO_COINS_LIST_TTL
+        max_bytes = settings.COINGECKO_COINS_LIST_CACHE_MAX_BYTES
+        lookup = lookup_response(self.cache, url) if self.cache is not None else None
+        if lookup is not None and lookup.is_fresh():
+            self.cache_hits += 1
+            yield from iter_json_array([lookup.entry.body])
+            return
+
+        headers = lookup.conditional_headers() if lookup is not None else {}
+        try:
+            with self.client.stream("GET", url, headers=headers) as response:
+                if lookup is not None and lookup.is_not_modified(response):
+                    self.cache_hits += 1
+                    yield from iter_json_array([store_response(self.cache, lookup, response, min_ttl)])
+                    return
+
+                response.raise_for_status()
+                received: Optional[list[bytes]] = [] if lookup is not None else None
+                if received is not None and int(response.headers.get("content-length") or 0) > max_bytes:
+                    received = None
+
+                def chunks() -> Iterator[bytes]:
+                    nonlocal received
+                    size = 0
+                    for chunk in response.iter_bytes(chunk_size):
+                        if received is not None:
+                            size += len(chunk)
+                            if size > max_bytes:
+                                received = None
+                            else:
+                                received.append(chunk)
+                        yield chunk
+
+                yield from iter_json_array(chunks())
+                if received is not None:
+                    store_response(self.cache, lookup, response, min_ttl, body=b"".join(received))
+                elif lookup is not None:
+                    logger.info(f"🗃️ Supported coins list exceeds {max_bytes} bytes, not caching it")
+        except httpx.HTTPError as e:
+            logger.error(f"CoinGecko failed to stream supported coins: {e}")
+
     def close(self):
         self.client.close()
+        if self.cache is not None:
+            self.cache.close()
@@ -0,0 +1,309 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+from urllib.parse import urlencode
+
+import httpx
+import redis
+from loguru import logger
+
+from app.core.config import settings
+
+
+@dataclass
+class CachedResponse:
+    """A stored response body plus the validators needed to revalidate it."""
+
+    body: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    expires_at: float = 0.0
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (now if now is not None else time.time()) < self.expires_at
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+def cache_key(url: str, params: Optional[dict[str, Any]] = None) -> str:
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted(params.items()))}"
+
+
+def freshness_lifetime(headers: httpx.Headers, min_ttl: float = 0) -> Optional[float]:
+    """
+    Seconds a response may be served without revalidation, from
+    Cache-Control (s-maxage/max-age) or Expires, floored at ``min_ttl``.
+    ``no-cache`` responses are stored but always revalidated, whatever
+    ``min_ttl`` says. Returns None when the response must not be stored.
+    """
+    directives = {}
+    for part in headers.get("cache-control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+
+    lifetime = 0.0
+    for name in ("s-maxage", "max-age"):
+        if name in directives:
+            try:
+                lifetime = float(directives[name])
+                break
+            except ValueError:
+                continue
+    else:
+        expires = headers.get("expires")
+        if expires:
+            try:
+                lifetime = parsedate_to_datetime(expires).timestamp() - time.time()
+            except (TypeError, ValueError):
+                lifetime = 0.0
+
+    return max(lifetime, float(min_ttl), 0.0)
+
+
+def build_cached_response(
+    response: httpx.Response,
+    min_ttl: float = 0,
+    previous: Optional[CachedResponse] = None,
+    body: Optional[bytes] = None,
+) -> Optional[CachedResponse]:
+    """
+    Turn a 200 response into a cache entry, or refresh ``previous`` from a
+    304 Not Modified. ``body`` stands in for the content of a streamed
+    response. Returns None if the response must not be stored.
+    """
+    lifetime = freshness_lifetime(response.headers, min_ttl)
+    if lifetime is None:
+        return None
+    if previous is not None and response.status_code == 304:
+        return CachedResponse(
+            body=previous.body,
+            etag=response.headers.get("etag") or previous.etag,
+            last_modified=response.headers.get("last-modified") or previous.last_modified,
+            expires_at=time.time() + lifetime,
+        )
+    return CachedResponse(
+        body=response.content if body is None else body,
+        etag=response.headers.get("etag"),
+        last_modified=response.headers.get("last-modified"),
+        expires_at=time.time() + lifetime,
+    )
+
+
+class ResponseCache(ABC):
+    """Interface for response cache backends."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedResponse]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, entry: CachedResponse) -> None:
+        ...
+
+    @abstractmethod
+    def close(self) -> None:
+        ...
+
+
+@dataclass
+class CacheLookup:
+    """The cache key of one request and the entry stored under it, if any."""
+
+    key: str
+    entry: Optional[CachedResponse] = None
+
+    def is_fresh(self) -> bool:
+        return self.entry is not None and self.entry.is_fresh()
+
+    def conditional_headers(self) -> dict[str, str]:
+        return self.entry.conditional_headers() if self.entry is not None else {}
+
+    def is_not_modified(self, response: httpx.Response) -> bool:
+        return response.status_code == 304 and self.entry is not None
+
+
+def lookup_response(cache: ResponseCache, url: str, params: Optional[dict[str, Any]] = None) -> CacheLookup:
+    key = cache_key(url, params)
+    return CacheLookup(key=key, entry=cache.get(key))
+
+
+def store_response(
+    cache: ResponseCache,
+    lookup: CacheLookup,
+    response: httpx.Response,
+    min_ttl: float = 0,
+    body: Optional[bytes] = None,
+) -> bytes:
+    """
+    Record the response to a request made with ``lookup``'s conditional
+    headers and return the body to use: the stored one on 304 Not
+    Modified, otherwise the response's own (``body`` for a streamed
+    response the caller already read). Raises httpx.HTTPStatusError.
+    """
+    if lookup.is_not_modified(response):
+        refreshed = build_cached_response(response, min_ttl, previous=lookup.entry)
+        if refreshed is not None:
+            cache.set(lookup.key, refreshed)
+        return lookup.entry.body
+
+    response.raise_for_status()
+    fresh = build_cached_response(response, min_ttl, body=body)
+    if fresh is not None:
+        cache.set(lookup.key, fresh)
+    return response.content if body is None else body
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    On-disk cache in a single SQLite file, shared safely between processes.
+    Once the stored bodies exceed ``max_bytes`` the least recently used
+    entries are evicted.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                expires_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_responses_accessed_at ON responses (accessed_at)"
+        )
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, expires_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+        body, etag, last_modified, expires_at = row
+        return CachedResponse(body=body, etag=etag, last_modified=last_modified, expires_at=expires_at)
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        size = len(entry.body)
+        if size > self.max_bytes:
+            logger.debug(f"Response for {key} ({size} bytes) exceeds cache size; not stored")
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, entry.body, entry.etag, entry.last_modified, entry.expires_at, size, time.time()),
+                )
+                self._evict()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall():
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class RedisResponseCache(ResponseCache):
+    """
+    Cache stored in Redis hashes, shared by every worker. Size bounding and
+    LRU eviction are delegated to the server's ``maxmemory`` policy
+    (``allkeys-lru``); entries also expire ``stale_ttl`` seconds after they
+    go stale so unused validators do not linger.
+    """
+
+    def __init__(self, url: str, prefix: str = "http-cache:", stale_ttl: int = 7 * 24 * 3600):
+        self.redis = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.stale_ttl = stale_ttl
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        data = self.redis.hgetall(self.prefix + key)
+        if not data:
+            return None
+        return CachedResponse(
+            body=data[b"body"],
+            etag=data.get(b"etag", b"").decode() or None,
+            last_modified=data.get(b"last_modified", b"").decode() or None,
+            expires_at=float(data[b"expires_at"]),
+        )
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        redis_key = self.prefix + key
+        ttl = max(int(entry.expires_at - time.time()), 0) + self.stale_ttl
+        pipe = self.redis.pipeline()
+        pipe.hset(redis_key, mapping={
+            "body": entry.body,
+            "etag": entry.etag or "",
+            "last_modified": entry.last_modified or "",
+            "expires_at": entry.expires_at,
+        })
+        pipe.expire(redis_key, ttl)
+        pipe.execute()
+
+    def close(self) -> None:
+        self.redis.close()
+
+
+def build_response_cache() -> Optional[ResponseCache]:
+    """Create the cache backend selected by ``COINGECKO_CACHE_BACKEND``."""
+    backend = settings.COINGECKO_CACHE_BACKEND.lower()
+    if backend == "sqlite":
+        return SQLiteResponseCache(settings.COINGECKO_CACHE_PATH, settings.COINGECKO_CACHE_MAX_BYTES)
+    if backend == "redis":
+        return RedisResponseCache(settings.REDIS_URL)
+    if backend not in ("", "none"):
+        logger.warning(f"Unknown COINGECKO_CACHE_BACKEND '{backend}'; caching disabled")
+    return None
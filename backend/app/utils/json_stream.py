@@ -0,0 +1,86 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+_WHITESPACE = " \t\n\r"
+
+
+class _ChunkReader:
+    """Decoded text of a chunked body, holding only the unconsumed tail."""
+
+    def __init__(self, chunks: Iterable[bytes], encoding: str):
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder(encoding)()
+        self._decoder = json.JSONDecoder()
+        self._exhausted = False
+        self.buffer = ""
+        self.pos = 0
+
+    def read_more(self) -> bool:
+        if self._exhausted:
+            return False
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._exhausted = True
+            self.buffer = self.buffer[self.pos:] + self._text_decoder.decode(b"", final=True)
+            self.pos = 0
+            return False
+        self.buffer = self.buffer[self.pos:] + self._text_decoder.decode(chunk)
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """The next non-whitespace character, or "" once the stream is done."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.read_more() and self.pos >= len(self.buffer):
+                return ""
+
+    def decode_value(self) -> Any:
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as exc:
+                if self.read_more():
+                    continue
+                raise ValueError("Truncated or malformed JSON array element") from exc
+            # A value ending exactly at the buffer edge (e.g. a number) may
+            # continue in the next chunk; only accept it once more text follows.
+            if end == len(self.buffer) and self.read_more():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array as they arrive, given the
+    body as an iterable of byte chunks. Only the undecoded tail of the
+    stream is buffered, so memory is bounded by the largest element rather
+    than the whole document. Raises ValueError on malformed input.
+    """
+    reader = _ChunkReader(chunks, encoding)
+    if reader.peek() != "[":
+        raise ValueError("Expected a JSON array")
+    reader.pos += 1
+
+    started = False
+    while True:
+        char = reader.peek()
+        if char == "]":
+            return
+        if started:
+            if char != ",":
+                raise ValueError(
+                    f"Expected ',' or ']' in JSON array, got {char!r}" if char else "Unterminated JSON array"
+                )
+            reader.pos += 1
+            char = reader.peek()
+        if not char:
+            raise ValueError("Unterminated JSON array")
+        yield reader.decode_value()
+        started = True
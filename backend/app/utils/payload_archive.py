@@ -0,0 +1,214 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Optional
+
+import zstandard
+from loguru import logger
+
+from app.core.config import settings
+
+# A frame's records are JSON lines of {"id", "fetched_at", "payload"}.
+INDEX_FILENAME = "index.sqlite3"
+SEGMENT_SUFFIX = ".zst"
+# Writer processes share the index; wait this long for another's write lock.
+INDEX_BUSY_TIMEOUT_MS = 30_000
+
+
+class PayloadArchive:
+    """
+    Append-only archive of raw CoinGecko `/coins/{id}` payloads.
+
+    Records are buffered and written as independent zstd frames appended to
+    segment files; each writer process owns its own segments, rotated once
+    they reach ``segment_max_bytes``. A SQLite index in the same directory
+    maps (coin, fetched_at) to the frame holding the record, so a replay
+    can read only the frames it needs, sequentially, segment by segment.
+    Use it as a context manager so buffered records are always written.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_max_bytes: Optional[int] = None,
+        frame_max_records: Optional[int] = None,
+        level: int = 3,
+    ):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes or settings.PAYLOAD_ARCHIVE_SEGMENT_MAX_BYTES
+        self.frame_max_records = frame_max_records or settings.PAYLOAD_ARCHIVE_FRAME_RECORDS
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._pending: list[tuple[str, str, bytes]] = []
+        self._segment: Optional[str] = None
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(directory, INDEX_FILENAME),
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=INDEX_BUSY_TIMEOUT_MS / 1000,
+        )
+        self._conn.execute(f"PRAGMA busy_timeout={INDEX_BUSY_TIMEOUT_MS}")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS records (
+                coingeckoid TEXT NOT NULL,
+                fetched_at TEXT NOT NULL,
+                segment TEXT NOT NULL,
+                frame_offset INTEGER NOT NULL,
+                frame_size INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_records_coin_fetched ON records (coingeckoid, fetched_at)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_records_fetched ON records (fetched_at)")
+        self.appended = 0
+
+    def __enter__(self) -> "PayloadArchive":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def append(self, data: dict, fetched_at: datetime) -> None:
+        """Buffer one payload; a frame is written every ``frame_max_records``."""
+        fetched = fetched_at.isoformat()
+        line = json.dumps(
+            {"id": data["id"], "fetched_at": fetched, "payload": data}, separators=(",", ":")
+        ).encode()
+        with self._lock:
+            self._pending.append((data["id"], fetched, line))
+            self.appended += 1
+            if len(self._pending) >= self.frame_max_records:
+                self._write_frame()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._write_frame()
+
+    def _segment_path(self) -> str:
+        if self._segment is not None:
+            path = os.path.join(self.directory, self._segment)
+            if os.path.getsize(path) < self.segment_max_bytes:
+                return path
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        self._segment = f"{stamp}-{os.getpid()}-{uuid.uuid4().hex[:8]}{SEGMENT_SUFFIX}"
+        return os.path.join(self.directory, self._segment)
+
+    def _write_frame(self) -> None:
+        if not self._pending:
+            return
+        pending = self._pending
+        frame = self._compressor.compress(b"\n".join(line for _, _, line in pending))
+        path = self._segment_path()
+        with open(path, "ab") as segment:
+            offset = segment.tell()
+            segment.write(frame)
+        # If indexing fails the frame is left unreferenced and the records
+        # stay pending, so the next flush writes and indexes them again.
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany(
+                "INSERT INTO records VALUES (?, ?, ?, ?, ?)",
+                [(coingeckoid, fetched, self._segment, offset, len(frame)) for coingeckoid, fetched, _ in pending],
+            )
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+        self._pending = []
+        logger.debug(f"🗜️ Archived {len(pending)} payloads ({len(frame)} bytes) to {self._segment}")
+
+    def _where(
+        self,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        coingeckoids: Optional[Iterable[str]],
+    ) -> tuple[str, list[Any]]:
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("fetched_at >= ?")
+            params.append(start.isoformat())
+        if end is not None:
+            clauses.append("fetched_at < ?")
+            params.append(end.isoformat())
+        if coingeckoids is not None:
+            ids = list(coingeckoids)
+            clauses.append(f"coingeckoid IN ({', '.join('?' * len(ids))})" if ids else "0")
+            params.extend(ids)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def coingeckoids(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        coingeckoids: Optional[Iterable[str]] = None,
+    ) -> list[str]:
+        """Distinct CoinGecko IDs with archived payloads in [start, end)."""
+        where, params = self._where(start, end, coingeckoids)
+        rows = self._conn.execute(f"SELECT DISTINCT coingeckoid FROM records{where}", params)
+        return [row[0] for row in rows]
+
+    def iter_records(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        coingeckoids: Optional[Iterable[str]] = None,
+    ) -> Iterator[tuple[str, datetime, dict]]:
+        """
+        Yield ``(coingeckoid, fetched_at, payload)`` for archived records in
+        [start, end), optionally limited to ``coingeckoids``. Frames are read
+        in segment/offset order so disk access stays sequential.
+        """
+        self.flush()
+        ids = set(coingeckoids) if coingeckoids is not None else None
+        where, params = self._where(start, end, ids)
+        frames = self._conn.execute(
+            f"SELECT DISTINCT segment, frame_offset, frame_size FROM records{where} "
+            "ORDER BY segment, frame_offset",
+            params,
+        ).fetchall()
+
+        lower = start.isoformat() if start is not None else None
+        upper = end.isoformat() if end is not None else None
+        decompressor = zstandard.ZstdDecompressor()
+        current, handle = None, None
+        try:
+            for segment, offset, size in frames:
+                if segment != current:
+                    if handle is not None:
+                        handle.close()
+                    current, handle = segment, open(os.path.join(self.directory, segment), "rb")
+                handle.seek(offset)
+                for line in decompressor.decompress(handle.read(size)).splitlines():
+                    record = json.loads(line)
+                    fetched = record["fetched_at"]
+                    if lower is not None and fetched < lower:
+                        continue
+                    if upper is not None and fetched >= upper:
+                        continue
+                    if ids is not None and record["id"] not in ids:
+                        continue
+                    yield record["id"], datetime.fromisoformat(fetched), record["payload"]
+        finally:
+            if handle is not None:
+                handle.close()
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._conn.close()
+
+
+def build_payload_archive() -> Optional[PayloadArchive]:
+    """Open the archive at ``PAYLOAD_ARCHIVE_DIR`` unless archiving is disabled."""
+    if not settings.PAYLOAD_ARCHIVE_ENABLED:
+        return None
+    return PayloadArchive(settings.PAYLOAD_ARCHIVE_DIR)
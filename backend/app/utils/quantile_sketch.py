@@ -0,0 +1,124 @@
+import math
+import random
+from typing import Iterable, Optional
+
+import numpy as np
+
+
+class KLLSketch:
+    """
+    Mergeable KLL quantile sketch (Karnin, Lang & Liberty) over a stream of
+    floats.
+
+    Items live in a stack of compactors; an item at level ``h`` stands for
+    ``2 ** h`` stream items. When the sketch is full, a level is sorted and
+    every other item (random offset) is promoted to the level above, so the
+    retained size stays O(k) and rank error is roughly O(1/k) of the stream.
+    Rank queries run against a sorted view of the retained items, which is
+    rebuilt lazily after updates.
+    """
+
+    def __init__(self, k: int = 200, c: float = 2 / 3, rng: Optional[random.Random] = None):
+        self.k = k
+        self.c = c
+        self.count = 0
+        self.compactors: list[list[float]] = [[]]
+        self._rng = rng or random.Random()
+        self._sorted: Optional[tuple[np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return int(math.ceil(self.k * self.c ** depth)) + 1
+
+    def _size(self) -> int:
+        return sum(len(compactor) for compactor in self.compactors)
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(level) for level in range(len(self.compactors)))
+
+    def _compress(self) -> None:
+        while self._size() >= self._max_size():
+            for level, compactor in enumerate(self.compactors):
+                if len(compactor) < self._capacity(level):
+                    continue
+                if level + 1 == len(self.compactors):
+                    self.compactors.append([])
+                compactor.sort()
+                # An odd item out stays behind so no weight is lost
+                keep = [compactor.pop(0)] if len(compactor) % 2 else []
+                offset = self._rng.randint(0, 1)
+                self.compactors[level + 1].extend(compactor[offset::2])
+                self.compactors[level] = keep
+                break
+
+    def update(self, value: float) -> None:
+        self.compactors[0].append(float(value))
+        self.count += 1
+        self._sorted = None
+        if len(self.compactors[0]) >= self._capacity(0):
+            self._compress()
+
+    def update_many(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.update(value)
+
+    def merge(self, other: "KLLSketch") -> None:
+        """Fold ``other`` into this sketch; the result summarizes both streams."""
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for level, compactor in enumerate(other.compactors):
+            self.compactors[level].extend(compactor)
+        self.count += other.count
+        self._sorted = None
+        self._compress()
+
+    def _weighted(self) -> tuple[np.ndarray, np.ndarray]:
+        """Retained items in ascending order with the cumulative weight below each."""
+        if self._sorted is None:
+            values = np.array([item for compactor in self.compactors for item in compactor], dtype=float)
+            weights = np.concatenate([
+                np.full(len(compactor), 2.0 ** level) for level, compactor in enumerate(self.compactors)
+            ])
+            order = np.argsort(values, kind="stable")
+            values, weights = values[order], weights[order]
+            self._sorted = (values, np.concatenate(([0.0], np.cumsum(weights))))
+        return self._sorted
+
+    def ranks(self, values: np.ndarray) -> np.ndarray:
+        """
+        Fraction of the stream strictly below each of ``values``, in [0, 1).
+        A binary search per value: O(log k) after the sorted view is built.
+        """
+        values = np.asarray(values, dtype=float)
+        if not self.count:
+            return np.zeros(values.shape)
+        items, below = self._weighted()
+        return below[np.searchsorted(items, values, side="left")] / below[-1]
+
+    def rank(self, value: float) -> float:
+        return float(self.ranks(np.array([value]))[0])
+
+    def quantiles(self, fractions: Iterable[float]) -> list[Optional[float]]:
+        """Approximate values at each fraction of the stream (None when empty)."""
+        fractions = list(fractions)
+        if not self.count:
+            return [None] * len(fractions)
+        items, below = self._weighted()
+        positions = np.searchsorted(below[1:], np.asarray(fractions, dtype=float) * below[-1], side="left")
+        return items[np.minimum(positions, len(items) - 1)].tolist()
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        return self.quantiles([fraction])[0]
+
+    def to_dict(self) -> dict:
+        return {"k": self.k, "c": self.c, "count": self.count, "compactors": [list(c) for c in self.compactors]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "KLLSketch":
+        sketch = cls(k=data["k"], c=data.get("c", 2 / 3))
+        sketch.count = data["count"]
+        sketch.compactors = [list(compactor) for compactor in data["compactors"]] or [[]]
+        return sketch
@@ -0,0 +1,112 @@
+import asyncio
+import math
+import time
+from typing import Optional, Union
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+
+class TokenBucket:
+    """
+    Async token bucket limiting callers to ``rate_per_minute`` acquisitions.
+    Tokens refill continuously; ``capacity`` bounds how large a burst can get.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity or max(1.0, math.ceil(self.rate_per_second))
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_second)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available, then consume it."""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate_per_second)
+
+    async def close(self) -> None:
+        pass
+
+
+# Refill and take one token atomically. Uses the Redis server clock so all
+# workers agree on elapsed time; returns "0" on success, otherwise the
+# number of seconds to wait before a token will be available.
+_ACQUIRE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return tostring(wait)
+"""
+
+
+class RedisTokenBucket:
+    """
+    Token bucket kept in Redis so every worker process draws from the same
+    budget; the aggregate request rate across all Celery workers stays
+    within ``rate_per_minute`` however many shards run at once.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: Optional[float] = None,
+        url: Optional[str] = None,
+        key: str = "rate-limit:coingecko",
+    ):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity or max(1.0, math.ceil(self.rate_per_second))
+        self.key = key
+        self.redis = aioredis.Redis.from_url(url or settings.REDIS_URL)
+        self._script = self.redis.register_script(_ACQUIRE_SCRIPT)
+
+    async def acquire(self) -> None:
+        """Wait until the shared bucket has a token, then consume it."""
+        while True:
+            wait = float(await self._script(keys=[self.key], args=[self.rate_per_second, self.capacity]))
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+RateLimiter = Union[TokenBucket, RedisTokenBucket]
+
+
+def build_rate_limiter(rate_per_minute: Optional[float] = None) -> RateLimiter:
+    """Create the limiter selected by ``COINGECKO_RATE_LIMIT_BACKEND``."""
+    rate_per_minute = rate_per_minute or settings.COINGECKO_RATE_LIMIT_PER_MINUTE
+    if settings.COINGECKO_RATE_LIMIT_BACKEND.lower() == "redis":
+        return RedisTokenBucket(rate_per_minute)
+    return TokenBucket(rate_per_minute)
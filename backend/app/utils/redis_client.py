@@ -0,0 +1,48 @@
+from typing import Optional
+from uuid import uuid4
+
+import redis
+import redis.asyncio as aioredis
+from loguru import logger
+from redis.exceptions import LockError
+
+from app.core.config import settings
+
+_async_client: Optional[aioredis.Redis] = None
+_sync_client: Optional[redis.Redis] = None
+
+
+def get_async_redis() -> aioredis.Redis:
+    """Process-wide asyncio Redis client for the API, connected lazily on first use."""
+    global _async_client
+    if _async_client is None:
+        _async_client = aioredis.Redis.from_url(settings.REDIS_URL)
+    return _async_client
+
+
+def get_sync_redis() -> redis.Redis:
+    """Process-wide blocking Redis client for Celery tasks, connected lazily on first use."""
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = redis.Redis.from_url(settings.REDIS_URL)
+    return _sync_client
+
+
+def acquire_task_lock(name: str, timeout: float) -> Optional[str]:
+    """
+    Try once to take a Redis lock shared by every worker. Returns the token
+    needed to release it (possibly from another task), or None if it is
+    held. ``timeout`` bounds how long a crashed holder can keep it.
+    """
+    token = uuid4().hex
+    lock = get_sync_redis().lock(f"lock:{name}", timeout=timeout, thread_local=False)
+    return token if lock.acquire(blocking=False, token=token) else None
+
+
+def release_task_lock(name: str, token: str) -> None:
+    """Release a lock taken by `acquire_task_lock`, unless it already expired."""
+    lock = get_sync_redis().lock(f"lock:{name}", thread_local=False)
+    try:
+        lock.do_release(token)
+    except LockError:
+        logger.warning(f"⚠️ Lock '{name}' expired before it was released")
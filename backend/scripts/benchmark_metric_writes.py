@@ -0,0 +1,80 @@
+# scripts/benchmark_metric_writes.py
+import sys
+import os
+import time
+import uuid
+import random
+import argparse
+from datetime import datetime
+from sqlalchemy.orm import Session
+from app.db.session import SessionLocal
+from app.crud.coins import create_coin_sync, get_by_coingeckoid_sync
+from app.schemas.coin import CoinCreate
+from app.schemas.metric import MetricCreate
+from app.services.metric_buffer import MetricWriteBuffer
+from loguru import logger
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def benchmark_metric_writes(db: Session, rows: int, coins: int, max_rows: int) -> float:
+    """
+    Write ``rows`` synthetic metrics spread over ``coins`` throwaway coins
+    through MetricWriteBuffer and return the achieved rows/second. The
+    coins (and, via cascade, their metrics) are deleted afterwards.
+    """
+    run_id = uuid.uuid4().hex[:8]
+    coin_ids = [
+        create_coin_sync(db, CoinCreate(
+            coingeckoid=f"bench-{run_id}-{i}",
+            symbol=f"BENCH{i}",
+            name=f"Benchmark {run_id} {i}",
+        )).id
+        for i in range(coins)
+    ]
+
+    try:
+        start = time.perf_counter()
+        with MetricWriteBuffer(db, max_rows=max_rows, max_seconds=float("inf")) as buffer:
+            for i in range(rows):
+                buffer.add(MetricCreate(
+                    coin_id=coin_ids[i % coins],
+                    market_cap=random.uniform(1e5, 1e9),
+                    volume_24h=random.uniform(1e3, 1e8),
+                    liquidity=random.uniform(0, 100),
+                    github_activity=random.uniform(0, 100),
+                    twitter_sentiment=random.uniform(0, 100),
+                    reddit_sentiment=random.uniform(0, 100),
+                    fetched_at=datetime.utcnow(),
+                ))
+        elapsed = time.perf_counter() - start
+    finally:
+        for i in range(coins):
+            coin = get_by_coingeckoid_sync(db, f"bench-{run_id}-{i}")
+            if coin:
+                db.delete(coin)
+        db.commit()
+
+    rate = rows / elapsed if elapsed > 0 else float("inf")
+    logger.success(
+        "✅ Wrote {} metrics in {:.2f}s ({:.0f} rows/s, {} rows per flush, {} flushes)",
+        rows, elapsed, rate, max_rows, buffer.flushes,
+    )
+    return rate
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the metric write path without any HTTP calls")
+
+    parser.add_argument("--rows", type=int, default=20000, help="Number of metric rows to write")
+    parser.add_argument("--coins", type=int, default=100, help="Number of synthetic coins to spread rows over")
+    parser.add_argument("--max-rows", type=int, default=500, help="Buffer size (rows per flush)")
+
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        benchmark_metric_writes(db, rows=args.rows, coins=args.coins, max_rows=args.max_rows)
+    finally:
+        db.close()
+        logger.info("Database session closed.")
@@ -0,0 +1,26 @@
+# scripts/partition_metrics.py
+import sys
+import os
+import argparse
+from app.crud.metric_partitions import partition_metrics_table
+from app.db.session import sync_engine
+from loguru import logger
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert the metrics table to monthly range partitions on fetched_at (pause ingestion first)"
+    )
+
+    parser.add_argument(
+        "--keep-legacy", action="store_true", help="Keep the old table as metrics_legacy instead of dropping it"
+    )
+
+    args = parser.parse_args()
+
+    # One transaction: the table is either fully converted or left untouched
+    with sync_engine.begin() as connection:
+        moved = partition_metrics_table(connection, drop_legacy=not args.keep_legacy)
+    logger.info(f"Done; {moved} metrics moved.")
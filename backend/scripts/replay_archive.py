@@ -0,0 +1,34 @@
+# scripts/replay_archive.py
+import sys
+import os
+import argparse
+from datetime import datetime
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.metric_replay import replay_archive
+from app.utils.payload_archive import PayloadArchive
+from loguru import logger
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Recompute coin metrics from archived CoinGecko payloads instead of re-fetching"
+    )
+
+    parser.add_argument("--start", type=datetime.fromisoformat, required=True, help="Window start (UTC, ISO 8601)")
+    parser.add_argument("--end", type=datetime.fromisoformat, required=True, help="Window end, exclusive (UTC, ISO 8601)")
+    parser.add_argument("--coin", action="append", dest="coins", help="CoinGecko ID to replay (repeatable; default all)")
+    parser.add_argument("--archive-dir", default=settings.PAYLOAD_ARCHIVE_DIR, help="Payload archive directory")
+    parser.add_argument("--max-rows", type=int, default=5000, help="Metric rows per INSERT batch")
+
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        with PayloadArchive(args.archive_dir) as archive:
+            replay_archive(db, archive, args.start, args.end, coingeckoids=args.coins, max_rows=args.max_rows)
+    finally:
+        db.close()
+        logger.info("Database session closed.")
@@ -11,11 +11,12 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.sql import func
 
+from app.crud.latest_metrics import refresh_latest_metrics
 from app.core.config import settings
 from app.core.logging import configure_logging
 from app.core.security import create_access_token, get_password_hash
 from app.db.base import Base
-from app.db.session import get_db
+from app.db.session import get_db, get_session_factory
 from app.main import app
 from app.models import (
     Coin, Metric, ScoringWeight, User, UserRole, Suggestion, SuggestionStatus
@@ -58,7 +59,9 @@ async def clean_db(db_session: AsyncSession):
     """Truncate all tables before each test."""
     tables = [
         "coins", "metrics", "scores", "scoring_weights",
-        "suggestions", "user_activities", "users"
+        "suggestions", "user_activities", "users", "normalization_stats", "scoring_runs",
+        "coin_latest_metrics", "quantile_sketches", "quantile_sketch_deltas", "score_history",
+        "metric_rollups", "config",
     ]
     for table in tables:
         await db_session.execute(text(f'TRUNCATE TABLE "{table}" RESTART IDENTITY CASCADE'))
@@ -72,6 +75,7 @@ async def override_get_db():
         async with TestingSessionLocal() as session:
             yield session
     app.dependency_overrides[get_db] = _get_test_db
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
     yield
     app.dependency_overrides.clear()
 
@@ -218,6 +222,8 @@ async def test_metrics(db_session, test_coin):
         db_session.add(m)
         metrics.append(m)
     await db_session.commit()
+    await refresh_latest_metrics(db_session, [test_coin.id])
+    await db_session.commit()
     for m in metrics:
         await db_session.refresh(m)
     return metrics
@@ -0,0 +1,91 @@
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.models.score import Score
+
+URL = f"{settings.API_V1_STR}/leaderboard"
+
+
+@pytest.fixture(autouse=True)
+def redis_empty(mocker):
+    """Serve every read from the database fallback."""
+    mocker.patch("app.services.leaderboard._redis_read", return_value=None)
+    mocker.patch("app.api.v1.leaderboard.claim_leaderboard_rebuild", new_callable=AsyncMock, return_value=True)
+    return mocker.patch("app.api.v1.leaderboard.rebuild_leaderboards")
+
+
+@pytest_asyncio.fixture(scope="function")
+async def ranked_scores(db_session, test_coins, scoring_weight):
+    scores = []
+    for coin, final_score in zip(test_coins, (0.9, 0.5, 0.1)):
+        score = Score(
+            coin_id=coin.id, scoring_weight_id=scoring_weight.id, liquidity_score=final_score,
+            developer_score=0, community_score=0, market_score=0, final_score=final_score,
+        )
+        db_session.add(score)
+        scores.append(score)
+    await db_session.commit()
+    return scores
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_top_coins_database_fallback(client: AsyncClient, ranked_scores, scoring_weight, redis_empty):
+    response = await client.get(f"{URL}/{scoring_weight.id}?limit=2")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["source"] == "database"
+    assert data["total"] == 3
+    assert [entry["final_score"] for entry in data["entries"]] == [0.9, 0.5]
+    redis_empty.delay.assert_called_once()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_fallback_skips_rebuild_already_pending(client: AsyncClient, ranked_scores, scoring_weight, redis_empty, mocker):
+    mocker.patch("app.api.v1.leaderboard.claim_leaderboard_rebuild", new_callable=AsyncMock, return_value=False)
+
+    response = await client.get(f"{URL}/{scoring_weight.id}")
+
+    assert response.status_code == 200
+    redis_empty.delay.assert_not_called()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_fallback_survives_broker_outage(client: AsyncClient, ranked_scores, scoring_weight, redis_empty):
+    redis_empty.delay.side_effect = ConnectionError("broker down")
+
+    response = await client.get(f"{URL}/{scoring_weight.id}")
+
+    assert response.status_code == 200
+    assert response.json()["source"] == "database"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_coin_rank(client: AsyncClient, ranked_scores, scoring_weight):
+    response = await client.get(f"{URL}/{scoring_weight.id}/coins/{ranked_scores[1].coin_id}")
+    assert response.status_code == 200
+    assert response.json()["entry"]["rank"] == 2
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_coin_rank_not_found(client: AsyncClient, scoring_weight):
+    response = await client.get(f"{URL}/{scoring_weight.id}/coins/{uuid.uuid4()}")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_score_range(client: AsyncClient, ranked_scores, scoring_weight):
+    response = await client.get(f"{URL}/{scoring_weight.id}/range?min_score=0.2&max_score=0.6")
+    assert response.status_code == 200
+    entries = response.json()["entries"]
+    assert [(entry["rank"], entry["final_score"]) for entry in entries] == [(2, 0.5)]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_score_range_rejects_inverted_bounds(client: AsyncClient, scoring_weight):
+    response = await client.get(f"{URL}/{scoring_weight.id}/range?min_score=0.8&max_score=0.2")
+    assert response.status_code == 422
@@ -1,9 +1,12 @@
+import json
 import uuid
 import pytest
 from httpx import AsyncClient
 from app.schemas.metric import MetricOut
 from app.core.config import settings
-from datetime import datetime
+from app.models.metric import Metric
+from app.models.metric_rollup import MetricRollup
+from datetime import datetime, timedelta
 
 URL = f"{settings.API_V1_STR}/metrics"
 
@@ -71,6 +74,60 @@ async def test_list_metrics_by_coin(manager_client, test_coin, test_metrics):
     assert len(data) >= len(test_metrics)
 
 
+@pytest.mark.asyncio(loop_scope="session")
+async def test_list_metrics_by_coin_pages(client, db_session, test_coin):
+    start = datetime(2024, 3, 1)
+    for hours in range(5):
+        db_session.add(Metric(
+            id=uuid.uuid4(), coin_id=test_coin.id, liquidity=float(hours),
+            fetched_at=start + timedelta(hours=hours), is_active=True,
+        ))
+    await db_session.commit()
+
+    seen, cursor = [], None
+    for _ in range(3):
+        params = {"limit": 2, "fields": ["liquidity"], **({"cursor": cursor} if cursor else {})}
+        response = await client.get(f"{URL}/coin/{test_coin.id}", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert all(set(item) == {"id", "fetched_at", "liquidity"} for item in page)
+        seen += [item["liquidity"] for item in page]
+        cursor = response.headers.get("X-Next-Cursor")
+    assert seen == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert cursor is None
+
+    params = {"from": str(start + timedelta(hours=1)), "to": str(start + timedelta(hours=3)), "order": "desc"}
+    response = await client.get(f"{URL}/coin/{test_coin.id}", params=params)
+    assert [item["liquidity"] for item in response.json()] == [2.0, 1.0]
+    assert response.json()[0]["coin_id"] == str(test_coin.id)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_export_metrics_by_coin_streams(client, test_metrics, test_coin):
+    response = await client.get(f"{URL}/coin/{test_coin.id}/export", params={"fields": ["liquidity"]})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["liquidity"] for row in rows] == [100_000, 100_000, 100_000]
+
+    response = await client.get(f"{URL}/coin/{test_coin.id}/export", params={"format": "csv", "fields": ["liquidity"]})
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines()[0] == "id,fetched_at,liquidity"
+    assert len(response.text.splitlines()) == 4
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_bulk_export_requires_manager(normal_client):
+    response = await normal_client.get(f"{URL}/export")
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_list_metrics_by_coin_rejects_bad_cursor(client, test_coin):
+    response = await client.get(f"{URL}/coin/{test_coin.id}", params={"cursor": "bogus"})
+    assert response.status_code == 422
+
+
 @pytest.mark.asyncio(loop_scope="session")
 async def test_update_metric(manager_client, test_metrics):
     metric = test_metrics[0]
@@ -121,3 +178,42 @@ async def test_delete_metric_unauthorized(normal_client, test_metrics):
 async def test_delete_metric_not_found(manager_client):
     response = await manager_client.delete(f"{URL}/{uuid.uuid4()}")
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_metric_history_raw(client, test_metrics, test_coin):
+    now = datetime.utcnow()
+    params = {"from": str(now - timedelta(days=2)), "to": str(now + timedelta(days=2)), "fields": ["liquidity"]}
+    response = await client.get(f"{URL}/coin/{test_coin.id}/history", params=params)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["resolution"] == "raw"
+    assert data["sample_count"] == [1, 1, 1]
+    assert list(data["series"]) == ["liquidity"]
+    assert data["series"]["liquidity"] == {"last": [100_000, 100_000, 100_000]}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_metric_history_daily_rollups(client, db_session, test_coin):
+    day = datetime(2024, 1, 1)
+    for offset in range(3):
+        db_session.add(MetricRollup(
+            coin_id=test_coin.id, resolution="day", bucket_start=day + timedelta(days=offset),
+            sample_count=4, last_fetched_at=day + timedelta(days=offset, hours=18),
+            liquidity_min=1.0, liquidity_max=3.0, liquidity_avg=2.0, liquidity_last=float(offset),
+        ))
+    await db_session.commit()
+
+    params = {"from": "2024-01-01T00:00:00", "to": "2024-01-03T00:00:00", "resolution": "day"}
+    response = await client.get(f"{URL}/coin/{test_coin.id}/history", params=params)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["sample_count"] == [4, 4]
+    assert data["series"]["liquidity"]["last"] == [0.0, 1.0]
+    assert data["series"]["market_cap"]["avg"] == [None, None]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_metric_history_unknown_field(client, test_coin):
+    response = await client.get(f"{URL}/coin/{test_coin.id}/history", params={"fields": ["price"]})
+    assert response.status_code == 422
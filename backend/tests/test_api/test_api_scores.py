@@ -1,9 +1,11 @@
 import uuid
+from datetime import datetime, timedelta
 
 import pytest
 from httpx import AsyncClient
 
 from app.core.config import settings
+from app.models.score_history import ScoreHistory
 from app.schemas.score import ScoreOut
 
 URL = f"{settings.API_V1_STR}/scores"
@@ -136,3 +138,31 @@ async def test_score_permissions(normal_client: AsyncClient, test_coin, scoring_
     # Non-manager update
     r3 = await normal_client.put(f"{URL}/{uuid.uuid4()}", json=payload)
     assert r3.status_code == 403
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_score_trajectory(client: AsyncClient, db_session, test_coin, scoring_weight):
+    now = datetime.utcnow().replace(microsecond=0)
+    for days_ago, final_score in ((2, 0.4), (1, 0.5), (200, 0.1)):
+        db_session.add(ScoreHistory(
+            coin_id=test_coin.id, scoring_weight_id=scoring_weight.id, scored_at=now - timedelta(days=days_ago),
+            liquidity_score=0, developer_score=0, community_score=0, market_score=final_score,
+            final_score=final_score,
+        ))
+    await db_session.commit()
+
+    response = await client.get(
+        f"{URL}/history/{test_coin.id}", params={"scoring_weight_id": str(scoring_weight.id)}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["final_score"] == [0.4, 0.5]
+    assert "market_score" not in data
+
+    response = await client.get(
+        f"{URL}/history/{test_coin.id}",
+        params={"scoring_weight_id": str(scoring_weight.id), "components": "true", "limit": 1},
+    )
+    data = response.json()
+    assert data["final_score"] == [0.5]
+    assert data["market_score"] == [0.5]
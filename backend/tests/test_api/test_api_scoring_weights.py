@@ -1,9 +1,12 @@
 import uuid
+from unittest.mock import AsyncMock
 
+import numpy as np
 import pytest
 from httpx import AsyncClient
 
 from app.core.config import settings
+from app.services.what_if import CachedComponents
 
 URL = f"{settings.API_V1_STR}/scoring-weights/"
 
@@ -97,3 +100,40 @@ async def test_delete_scoring_weight(manager_client: AsyncClient, scoring_weight
 async def test_delete_scoring_weight_not_found(manager_client: AsyncClient):
     response = await manager_client.delete(f"{URL}{uuid.uuid4()}")
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_what_if_ranks_from_cache(manager_client: AsyncClient, test_coin, mocker):
+    cached = CachedComponents(
+        version="2025-01-01T00:00:00",
+        coin_ids=[test_coin.id, uuid.uuid4()],
+        components=np.array([[1, 0, 0, 0], [0, 1, 0, 0]], dtype=float),
+        normalization={},
+    )
+    mocker.patch("app.api.v1.scoring_weights.get_cached_components", new_callable=AsyncMock, return_value=cached)
+
+    response = await manager_client.post(f"{URL}what-if?top_k=1", json=get_unique_weight_payload())
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["coins"] == 2
+    assert [entry["coin_id"] for entry in data["ranking"]] == [str(test_coin.id)]
+    assert data["ranking"][0]["symbol"] == test_coin.symbol
+    assert data["ranking"][0]["final_score"] == 0.3
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_what_if_warms_empty_cache(manager_client: AsyncClient, mocker):
+    mocker.patch("app.api.v1.scoring_weights.get_cached_components", new_callable=AsyncMock, return_value=None)
+    mock_refresh = mocker.patch("app.api.v1.scoring_weights.refresh_component_cache")
+
+    response = await manager_client.post(f"{URL}what-if", json=get_unique_weight_payload())
+
+    assert response.status_code == 503
+    mock_refresh.delay.assert_called_once()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_what_if_unauthorized(normal_client: AsyncClient):
+    response = await normal_client.post(f"{URL}what-if", json=get_unique_weight_payload())
+    assert response.status_code == 403
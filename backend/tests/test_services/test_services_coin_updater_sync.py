@@ -2,7 +2,11 @@ import pytest
 from unittest.mock import MagicMock
 from uuid import uuid4
 
+from app.crud.coins import get_changed_fields, update_coin_sync
+from app.models import Coin
+from app.schemas.coin import CoinUpdate
 from app.services.coin_updater_sync import (
+    apply_coingecko_data_sync,
     update_coin_and_metrics_from_coingecko_sync,
     calculate_market_cap,
     calculate_volume,
@@ -11,6 +15,7 @@ from app.services.coin_updater_sync import (
     calculate_social_sentiment,
     extract_description,
     extract_link,
+    extract_market_metrics,
 )
 
 
@@ -83,6 +88,59 @@ def test_update_coin_and_metrics_success(mock_db, mock_client, mock_coin_data, m
     mock_client.get_coin_data.assert_called_once_with("bitcoin")
 
 
+def test_apply_coingecko_data_uses_known_coins(mock_db, mock_coin_data, mocker):
+    known = MagicMock()
+    known.id = uuid4()
+    mock_lookup = mocker.patch("app.services.coin_updater_sync.get_by_coingeckoid_sync")
+    mock_update = mocker.patch("app.services.coin_updater_sync.update_coin_sync", return_value=known)
+    mocker.patch("app.services.coin_updater_sync.create_metric_sync")
+
+    coin = apply_coingecko_data_sync(mock_db, mock_coin_data, known_coins={"bitcoin": known})
+
+    assert coin is known
+    mock_lookup.assert_not_called()
+    assert mock_update.call_args.kwargs["db_coin"] is known
+
+
+def test_apply_coingecko_data_buffered_failure_keeps_other_updates(mock_db, mock_coin_data, mocker):
+    savepoint = mock_db.begin_nested.return_value
+    savepoint.__exit__.return_value = False
+    mocker.patch("app.services.coin_updater_sync.get_by_coingeckoid_sync", return_value=MagicMock())
+    mocker.patch("app.services.coin_updater_sync.update_coin_sync", side_effect=Exception("bad row"))
+    metric_buffer = MagicMock()
+
+    coin = apply_coingecko_data_sync(mock_db, mock_coin_data, metric_buffer=metric_buffer)
+
+    assert coin is None
+    mock_db.begin_nested.assert_called_once()
+    assert savepoint.__exit__.call_args.args[0] is Exception
+    mock_db.rollback.assert_not_called()
+    metric_buffer.add.assert_not_called()
+
+
+def test_update_coin_sync_skips_unchanged_coin(mock_db):
+    db_coin = Coin(coingeckoid="bitcoin", name="Bitcoin", symbol="BTC", description="Digital gold")
+
+    update_coin_sync(mock_db, db_coin, CoinUpdate(name="Bitcoin", description="Digital gold"))
+
+    mock_db.flush.assert_not_called()
+    mock_db.commit.assert_not_called()
+    mock_db.add.assert_not_called()
+
+
+def test_update_coin_sync_writes_only_changed_fields(mock_db):
+    db_coin = Coin(coingeckoid="bitcoin", name="Bitcoin", symbol="BTC", description="Old")
+    coin_in = CoinUpdate(name="Bitcoin", description="New")
+
+    assert get_changed_fields(db_coin, coin_in) == {"description": "New"}
+
+    update_coin_sync(mock_db, db_coin, coin_in, commit=False)
+
+    assert db_coin.description == "New"
+    mock_db.flush.assert_called_once()
+    mock_db.commit.assert_not_called()
+
+
 def test_update_coin_and_metrics_invalid_data(mock_db, mock_client, mocker):
     mock_client.get_coin_data.return_value = {}
 
@@ -172,3 +230,16 @@ def test_extract_link_from_string():
     data = {"links": {"subreddit_url": "https://reddit.com/r/test"}}
     result = extract_link(data, [["links", "subreddit_url"]])
     assert result == "https://reddit.com/r/test"
+
+
+def test_extract_market_metrics():
+    row = {"id": "bitcoin", "market_cap": 1000000, "total_volume": 50000, "current_price": 10}
+    metrics = extract_market_metrics(row)
+    assert metrics["market_cap"] == 1000000
+    assert metrics["volume_24h"] == 50000
+    assert metrics["liquidity"] == 5.0
+
+
+def test_extract_market_metrics_missing_values():
+    metrics = extract_market_metrics({"id": "newcoin", "market_cap": None, "total_volume": None})
+    assert metrics == {"market_cap": 0.01, "volume_24h": 0.01, "liquidity": 100}
@@ -0,0 +1,260 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from unittest.mock import MagicMock
+
+from app.services.ingestion import (
+    IngestionStats,
+    ingest_coins,
+    market_metrics_changed,
+    refresh_market_data,
+)
+from app.utils.rate_limiter import RedisTokenBucket, TokenBucket
+
+
+class FakeClient:
+    """Stands in for CoinGeckoClient and records peak concurrency."""
+
+    def __init__(self, failing=(), rate_limited=0):
+        self.failing = set(failing)
+        self.request_count = 0
+        self.rate_limited_count = 0
+        self._rate_limited = rate_limited
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_coin_data(self, coin_id):
+        self.request_count += 1
+        if self._rate_limited:
+            self._rate_limited -= 1
+            self.rate_limited_count += 1
+            self.request_count += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if coin_id in self.failing:
+            return None
+        return {"id": coin_id}
+
+
+@pytest.fixture(autouse=True)
+def patch_known_coins(mocker):
+    return mocker.patch("app.services.ingestion.get_coins_by_coingeckoids_sync", return_value={})
+
+
+@pytest.fixture(autouse=True)
+def patch_archive(mocker):
+    return mocker.patch("app.services.ingestion.build_payload_archive", return_value=None)
+
+
+@pytest.fixture
+def patch_apply(mocker):
+    return mocker.patch(
+        "app.services.ingestion.apply_coingecko_data_sync",
+        side_effect=lambda db, data, metric_buffer, known_coins, fetched_at: MagicMock(name=data["id"]),
+    )
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_ingest_coins_runs_concurrently(patch_apply):
+    client = FakeClient()
+    coin_ids = [f"coin-{i}" for i in range(20)]
+
+    stats = await ingest_coins(MagicMock(), coin_ids, client=client, concurrency=5)
+
+    assert stats.total == 20
+    assert stats.succeeded == 20
+    assert stats.failed == 0
+    assert patch_apply.call_count == 20
+    assert client.max_in_flight == 5
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_ingest_coins_preloads_known_coins_once(patch_apply, patch_known_coins):
+    snapshot = {"coin-0": MagicMock()}
+    patch_known_coins.return_value = snapshot
+
+    await ingest_coins(MagicMock(), ["coin-0", "coin-1"], client=FakeClient(), concurrency=2)
+
+    patch_known_coins.assert_called_once()
+    assert all(call.kwargs["known_coins"] is snapshot for call in patch_apply.call_args_list)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_ingest_coins_archives_raw_payloads(patch_apply):
+    archive = MagicMock()
+
+    await ingest_coins(MagicMock(), ["coin-0", "bad"], client=FakeClient(failing={"bad"}), archive=archive)
+
+    archive.append.assert_called_once()
+    data, fetched_at = archive.append.call_args.args
+    assert data == {"id": "coin-0"}
+    assert patch_apply.call_args.kwargs["fetched_at"] == fetched_at
+    archive.close.assert_not_called()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_ingest_coins_applies_payloads_when_archive_fails(patch_apply, patch_archive):
+    archive = MagicMock()
+    archive.append.side_effect = OSError("disk full")
+    archive.close.side_effect = OSError("disk full")
+    patch_archive.return_value = archive
+
+    stats = await ingest_coins(MagicMock(), ["coin-0", "coin-1"], client=FakeClient())
+
+    assert stats.succeeded == 2
+    assert patch_apply.call_count == 2
+    archive.close.assert_called_once()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_ingest_coins_counts_failures_and_429s(patch_apply):
+    client = FakeClient(failing={"bad"}, rate_limited=2)
+
+    stats = await ingest_coins(MagicMock(), ["good", "bad"], client=client, concurrency=2)
+
+    assert stats.succeeded == 1
+    assert stats.failed == 1
+    assert stats.requests == 4
+    assert stats.rate_limited == 2
+    assert stats.as_dict()["rate_limited_ratio"] == 0.5
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_ingest_coins_survives_write_errors(mocker):
+    mocker.patch("app.services.ingestion.apply_coingecko_data_sync", side_effect=Exception("DB down"))
+
+    stats = await ingest_coins(MagicMock(), ["bitcoin"], client=FakeClient(), concurrency=1)
+
+    assert stats.failed == 1
+    assert stats.finished_at is not None
+
+
+def test_ingestion_stats_rates():
+    stats = IngestionStats(requests=10, rate_limited=1, started_at=0.0, finished_at=5.0)
+    assert stats.requests_per_second == 2.0
+    assert stats.rate_limited_ratio == 0.1
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_token_bucket_throttles_after_burst():
+    bucket = TokenBucket(rate_per_minute=600, capacity=2)  # 10 tokens/s
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    for _ in range(4):
+        await bucket.acquire()
+    elapsed = loop.time() - start
+
+    # Two tokens come from the burst, the other two need ~0.1s each
+    assert elapsed >= 0.15
+
+
+class FakeMarketsClient:
+    """Serves fixed `/coins/markets` pages."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.request_count = 0
+        self.rate_limited_count = 0
+
+    async def get_coins_markets(self, page=1, per_page=250):
+        self.request_count += 1
+        return self.pages[page - 1] if page <= len(self.pages) else []
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_redis_token_bucket_waits_for_shared_budget(mocker):
+    bucket = RedisTokenBucket(rate_per_minute=60, url="redis://localhost:6379/0")
+    bucket._script = mocker.AsyncMock(side_effect=["0.01", "0"])
+    mock_sleep = mocker.patch("app.utils.rate_limiter.asyncio.sleep", new_callable=mocker.AsyncMock)
+
+    await bucket.acquire()
+
+    assert bucket._script.await_count == 2
+    mock_sleep.assert_awaited_once_with(0.01)
+    await bucket.close()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_refresh_market_data_pages_until_short_page(mocker):
+    coin_a, coin_b = uuid4(), uuid4()
+    mocker.patch(
+        "app.services.ingestion.get_tracked_coin_id_map_sync",
+        return_value={"a": coin_a, "b": coin_b},
+    )
+    previous = MagicMock(
+        market_cap=900, volume_24h=90, liquidity=0.1,
+        github_activity=12.0, twitter_sentiment=3.0, reddit_sentiment=4.0,
+    )
+    mocker.patch("app.services.ingestion.get_latest_active_metrics_sync", return_value={coin_a: previous})
+    mock_create = mocker.patch(
+        "app.services.metric_buffer.create_metrics_sync",
+        side_effect=lambda db, metrics, commit: len(metrics),
+    )
+    client = FakeMarketsClient([
+        [{"id": "a", "market_cap": 1000, "total_volume": 100}, {"id": "untracked"}],
+        [{"id": "b", "market_cap": 500, "total_volume": 50}],
+    ])
+
+    stats = await refresh_market_data(MagicMock(), client=client, per_page=2)
+
+    assert client.request_count == 2
+    assert stats.succeeded == 2
+    # Both pages are written together when the buffer flushes on exit
+    mock_create.assert_called_once()
+    written = {metric.coin_id: metric for metric in mock_create.call_args.args[1]}
+    assert written[coin_a].market_cap == 1000
+    assert written[coin_a].github_activity == 12.0
+    assert written[coin_b].github_activity is None
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_refresh_market_data_stops_on_failed_page(mocker):
+    mocker.patch("app.services.ingestion.get_tracked_coin_id_map_sync", return_value={})
+    mocker.patch("app.services.ingestion.get_latest_active_metrics_sync", return_value={})
+    client = FakeMarketsClient([None])
+
+    stats = await refresh_market_data(MagicMock(), client=client)
+
+    assert stats.failed == 1
+    assert client.request_count == 1
+
+
+@pytest.mark.parametrize(
+    "previous, fields, changed",
+    [
+        (None, {"market_cap": 1.0, "volume_24h": 1.0, "liquidity": 1.0}, True),
+        (MagicMock(market_cap=1000.0, volume_24h=100.0, liquidity=0.1),
+         {"market_cap": 1001.0, "volume_24h": 100.0, "liquidity": 0.1}, False),
+        (MagicMock(market_cap=1000.0, volume_24h=100.0, liquidity=0.1),
+         {"market_cap": 1000.0, "volume_24h": 120.0, "liquidity": 0.1}, True),
+        (MagicMock(market_cap=0.0, volume_24h=0.0, liquidity=None),
+         {"market_cap": 0.0, "volume_24h": 0.0, "liquidity": 0.0}, True),
+    ],
+)
+def test_market_metrics_changed(previous, fields, changed):
+    assert market_metrics_changed(previous, fields, 0.005) is changed
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_refresh_market_data_skips_unchanged_coins(mocker):
+    coin_id = uuid4()
+    mocker.patch("app.services.ingestion.get_tracked_coin_id_map_sync", return_value={"a": coin_id})
+    previous = MagicMock(market_cap=1000.0, volume_24h=100.0, liquidity=None)
+    mocker.patch("app.services.ingestion.get_latest_active_metrics_sync", return_value={coin_id: previous})
+    mocker.patch("app.services.ingestion.extract_market_metrics", return_value={
+        "market_cap": 1000.0, "volume_24h": 100.0, "liquidity": None,
+    })
+    mock_create = mocker.patch(
+        "app.services.metric_buffer.create_metrics_sync",
+        side_effect=lambda db, metrics, commit: len(metrics),
+    )
+    client = FakeMarketsClient([[{"id": "a"}]])
+
+    stats = await refresh_market_data(MagicMock(), client=client)
+
+    assert (stats.succeeded, stats.unchanged) == (0, 1)
+    assert mock_create.call_args.args[1] == []
@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from unittest.mock import MagicMock
+
+from app.crud.latest_metrics import (
+    advance_latest_metrics,
+    advance_latest_metrics_sync,
+    metric_pointer_row,
+    refresh_latest_metrics,
+    refresh_latest_metrics_sync,
+)
+from app.crud.metrics import create_metrics_sync
+from app.models import CoinLatestMetric, Metric
+from app.schemas.metric import MetricCreate
+
+NOW = datetime(2025, 1, 1)
+
+
+def compiled(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_advance_keeps_newest_row_per_coin():
+    coin_a, coin_b = uuid4(), uuid4()
+    newest = uuid4()
+    db = MagicMock()
+
+    advance_latest_metrics_sync(db, [
+        {"id": uuid4(), "coin_id": coin_a, "fetched_at": NOW - timedelta(hours=1)},
+        {"id": newest, "coin_id": coin_a, "fetched_at": NOW},
+        {"id": uuid4(), "coin_id": coin_b, "fetched_at": NOW, "is_active": False},
+    ])
+
+    statement = db.execute.call_args.args[0]
+    params = statement.compile(dialect=postgresql.dialect()).params
+    assert params["coin_id_m0"] == coin_a
+    assert params["metric_id_m0"] == newest
+    assert "coin_id_m1" not in params
+    sql = compiled(statement)
+    assert "ON CONFLICT (coin_id) DO UPDATE" in sql
+    assert "WHERE coin_latest_metrics.fetched_at <= excluded.fetched_at" in sql
+
+
+def test_advance_without_active_rows_is_a_no_op():
+    db = MagicMock()
+
+    advance_latest_metrics_sync(db, [{"id": uuid4(), "coin_id": uuid4(), "fetched_at": NOW, "is_active": False}])
+
+    db.execute.assert_not_called()
+
+
+def test_refresh_rebuilds_pointers_for_given_coins():
+    coin_id = uuid4()
+    db = MagicMock()
+
+    refresh_latest_metrics_sync(db, [coin_id])
+
+    clear, fill = (call.args[0] for call in db.execute.call_args_list)
+    assert compiled(clear).startswith("DELETE FROM coin_latest_metrics WHERE coin_latest_metrics.coin_id IN")
+    sql = compiled(fill)
+    assert sql.startswith("INSERT INTO coin_latest_metrics (coin_id, metric_id, fetched_at) SELECT DISTINCT ON (metrics.coin_id)")
+    assert "ORDER BY metrics.coin_id, metrics.fetched_at DESC" in sql
+
+
+def test_refresh_with_no_coins_is_a_no_op():
+    db = MagicMock()
+
+    refresh_latest_metrics_sync(db, [])
+
+    db.execute.assert_not_called()
+
+
+def test_create_metrics_sync_points_coins_at_inserted_rows(mocker):
+    mock_advance = mocker.patch("app.crud.metrics.advance_latest_metrics_sync")
+    mocker.patch("app.crud.metrics.update_normalization_stats_sync")
+    mocker.patch("app.crud.metrics.add_quantile_sketch_delta_sync")
+    db = MagicMock()
+    metrics_in = [MetricCreate(coin_id=uuid4(), fetched_at=NOW) for _ in range(2)]
+
+    assert create_metrics_sync(db, metrics_in) == 2
+
+    inserted = db.execute.call_args.args[1]
+    assert mock_advance.call_args.args[1] is inserted
+    assert all(row["id"] for row in inserted)
+
+
+async def add_metric(session, coin_id, fetched_at) -> Metric:
+    metric = Metric(coin_id=coin_id, liquidity=1.0, fetched_at=fetched_at)
+    session.add(metric)
+    await session.flush()
+    return metric
+
+
+async def pointer(session, coin_id) -> CoinLatestMetric:
+    session.expire_all()
+    return (await session.execute(
+        select(CoinLatestMetric).where(CoinLatestMetric.coin_id == coin_id)
+    )).scalar_one()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_older_metric_arriving_late_keeps_newer_pointer(db_session, test_coin):
+    newer = await add_metric(db_session, test_coin.id, NOW)
+    await advance_latest_metrics(db_session, [metric_pointer_row(newer)])
+    await db_session.commit()
+
+    older = await add_metric(db_session, test_coin.id, NOW - timedelta(hours=1))
+    await advance_latest_metrics(db_session, [metric_pointer_row(older)])
+    await db_session.commit()
+
+    latest = await pointer(db_session, test_coin.id)
+    assert (latest.metric_id, latest.fetched_at) == (newer.id, NOW)
+
+    newest = await add_metric(db_session, test_coin.id, NOW + timedelta(hours=1))
+    await advance_latest_metrics(db_session, [metric_pointer_row(newest)])
+    await db_session.commit()
+
+    assert (await pointer(db_session, test_coin.id)).metric_id == newest.id
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_refresh_falls_back_to_latest_active_metric(db_session, test_coin):
+    older = await add_metric(db_session, test_coin.id, NOW - timedelta(hours=1))
+    newer = await add_metric(db_session, test_coin.id, NOW)
+    await advance_latest_metrics(db_session, [metric_pointer_row(older), metric_pointer_row(newer)])
+    newer.is_active = False
+    await db_session.flush()
+
+    await refresh_latest_metrics(db_session, [test_coin.id])
+    await db_session.commit()
+
+    latest = await pointer(db_session, test_coin.id)
+    assert (latest.metric_id, latest.fetched_at) == (older.id, NOW - timedelta(hours=1))
@@ -0,0 +1,181 @@
+from uuid import uuid4
+
+import numpy as np
+import pytest
+import redis
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.leaderboard import (
+    SOURCE_DATABASE,
+    SOURCE_REDIS,
+    REBUILD_PENDING_KEY,
+    claim_leaderboard_rebuild,
+    get_coin_rank,
+    get_coins_in_range,
+    get_top_coins,
+    leaderboard_key,
+    publish_leaderboard_sync,
+    publish_leaderboards_sync,
+    rebuild_leaderboards_sync,
+)
+
+WEIGHT_ID = uuid4()
+KEY = leaderboard_key(WEIGHT_ID)
+
+
+def redis_returning(*results) -> MagicMock:
+    client = MagicMock()
+    client.pipeline.return_value.execute = AsyncMock(return_value=list(results))
+    return client
+
+
+def test_publish_replace_swaps_in_a_new_set():
+    coin_a, coin_b = uuid4(), uuid4()
+    client = MagicMock()
+
+    assert publish_leaderboard_sync(client, WEIGHT_ID, [(coin_a, 0.5), (coin_b, 0.25)], replace=True) == 2
+
+    pipe = client.pipeline.return_value
+    pipe.zadd.assert_called_once_with(f"{KEY}:building", {str(coin_a): 0.5, str(coin_b): 0.25})
+    pipe.rename.assert_called_once_with(f"{KEY}:building", KEY)
+    pipe.execute.assert_called_once()
+
+
+def test_publish_incremental_merges_scores():
+    coin_id = uuid4()
+    client = MagicMock()
+
+    publish_leaderboard_sync(client, WEIGHT_ID, [(coin_id, 0.75)], replace=False)
+
+    pipe = client.pipeline.return_value
+    pipe.zadd.assert_called_once_with(KEY, {str(coin_id): 0.75})
+    pipe.rename.assert_not_called()
+    pipe.delete.assert_not_called()
+
+
+def test_publish_run_writes_a_column_per_weight(mocker):
+    client = mocker.patch("app.services.leaderboard.redis.Redis.from_url").return_value
+    second = uuid4()
+    coin_ids = [uuid4(), uuid4()]
+
+    publish_leaderboards_sync([WEIGHT_ID, second], coin_ids, np.array([[0.1, 0.9], [0.2, 0.8]]), replace=False)
+
+    zadds = client.pipeline.return_value.zadd.call_args_list
+    assert zadds[0].args == (KEY, {str(coin_ids[0]): 0.1, str(coin_ids[1]): 0.2})
+    assert zadds[1].args == (leaderboard_key(second), {str(coin_ids[0]): 0.9, str(coin_ids[1]): 0.8})
+    client.close.assert_called_once()
+
+
+def test_publish_run_tolerates_redis_errors(mocker):
+    client = mocker.patch("app.services.leaderboard.redis.Redis.from_url").return_value
+    client.pipeline.return_value.execute.side_effect = redis.ConnectionError("down")
+
+    publish_leaderboards_sync([WEIGHT_ID], [uuid4()], np.array([[0.5]]), replace=True)
+
+    client.close.assert_called_once()
+
+
+def test_rebuild_drops_deleted_weights_and_clears_pending_flag(mocker):
+    weight = MagicMock(id=WEIGHT_ID)
+    deleted = leaderboard_key(uuid4())
+    mocker.patch("app.services.leaderboard.get_all_sync", return_value=[weight])
+    mocker.patch("app.services.leaderboard.get_final_scores_sync", return_value=[(uuid4(), 0.5)])
+    client = MagicMock()
+    client.scan_iter.return_value = [KEY.encode(), f"{KEY}:building".encode(), deleted.encode()]
+
+    assert rebuild_leaderboards_sync(MagicMock(), client) == {str(WEIGHT_ID): 1}
+
+    assert client.delete.call_args_list[0].args == (deleted.encode(),)
+    assert client.delete.call_args_list[1].args == (REBUILD_PENDING_KEY,)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_claim_rebuild_only_once():
+    client = MagicMock()
+    client.set = AsyncMock(side_effect=[True, None])
+
+    assert await claim_leaderboard_rebuild(client) is True
+    assert await claim_leaderboard_rebuild(client) is False
+    assert client.set.call_args.kwargs["nx"] is True
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_top_coins_from_redis(mocker):
+    coin_a, coin_b = uuid4(), uuid4()
+    client = redis_returning(5, [(str(coin_a).encode(), 0.9), (str(coin_b).encode(), 0.7)])
+    mock_db_top = mocker.patch("app.services.leaderboard.get_top_scores", new_callable=AsyncMock)
+
+    result = await get_top_coins(MagicMock(), WEIGHT_ID, 2, client=client)
+
+    assert result == {
+        "source": SOURCE_REDIS,
+        "total": 5,
+        "entries": [
+            {"rank": 1, "coin_id": coin_a, "final_score": 0.9},
+            {"rank": 2, "coin_id": coin_b, "final_score": 0.7},
+        ],
+    }
+    client.pipeline.return_value.zrevrange.assert_called_once_with(KEY, 0, 1, withscores=True)
+    mock_db_top.assert_not_awaited()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("client", [
+    redis_returning(0, []),
+    MagicMock(pipeline=MagicMock(return_value=MagicMock(execute=AsyncMock(side_effect=redis.ConnectionError())))),
+])
+async def test_top_coins_fall_back_to_database(client, mocker):
+    coin_id = uuid4()
+    mocker.patch("app.services.leaderboard.get_top_scores", new_callable=AsyncMock, return_value=[(coin_id, 0.4)])
+    mocker.patch("app.services.leaderboard.count_scores", new_callable=AsyncMock, return_value=1)
+
+    result = await get_top_coins(MagicMock(), WEIGHT_ID, 10, client=client)
+
+    assert result["source"] == SOURCE_DATABASE
+    assert result["entries"] == [{"rank": 1, "coin_id": coin_id, "final_score": 0.4}]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_coin_rank_from_redis():
+    coin_id = uuid4()
+
+    result = await get_coin_rank(MagicMock(), WEIGHT_ID, coin_id, client=redis_returning(10, 3, 0.55))
+
+    assert result == {
+        "source": SOURCE_REDIS, "total": 10, "entry": {"rank": 4, "coin_id": coin_id, "final_score": 0.55},
+    }
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_coin_rank_unscored_coin():
+    assert await get_coin_rank(MagicMock(), WEIGHT_ID, uuid4(), client=redis_returning(10, None, None)) is None
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_range_ranks_continue_after_higher_scores():
+    coin_id = uuid4()
+    client = redis_returning(10, 4, [(str(coin_id).encode(), 0.5)])
+
+    result = await get_coins_in_range(MagicMock(), WEIGHT_ID, 0.4, 0.6, 20, client=client)
+
+    assert result["entries"] == [{"rank": 5, "coin_id": coin_id, "final_score": 0.5}]
+    pipe = client.pipeline.return_value
+    pipe.zcount.assert_called_once_with(KEY, "(0.6", "+inf")
+    pipe.zrevrangebyscore.assert_called_once_with(KEY, 0.6, 0.4, start=0, num=20, withscores=True)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_range_database_fallback(mocker):
+    coin_id = uuid4()
+    mocker.patch("app.services.leaderboard.count_scores", new_callable=AsyncMock, side_effect=[2, 7])
+    mock_top = mocker.patch(
+        "app.services.leaderboard.get_top_scores", new_callable=AsyncMock, return_value=[(coin_id, 0.5)]
+    )
+    db = MagicMock()
+
+    result = await get_coins_in_range(db, WEIGHT_ID, 0.4, 0.6, 20, client=redis_returning(0, 0, []))
+
+    assert result == {
+        "source": SOURCE_DATABASE, "total": 7, "entries": [{"rank": 3, "coin_id": coin_id, "final_score": 0.5}],
+    }
+    mock_top.assert_awaited_once_with(db, WEIGHT_ID, 20, min_score=0.4, max_score=0.6)
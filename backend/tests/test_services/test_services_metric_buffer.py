@@ -0,0 +1,124 @@
+import contextlib
+
+import pytest
+from datetime import datetime
+from uuid import uuid4
+from unittest.mock import MagicMock
+
+from app.schemas.metric import MetricCreate
+from app.services.metric_buffer import MetricWriteBuffer
+
+
+def make_metric():
+    return MetricCreate(coin_id=uuid4(), market_cap=1.0, fetched_at=datetime.utcnow())
+
+
+def make_db():
+    db = MagicMock()
+    db.begin_nested.side_effect = contextlib.nullcontext
+    return db
+
+
+@pytest.fixture
+def mock_create(mocker):
+    return mocker.patch(
+        "app.services.metric_buffer.create_metrics_sync",
+        side_effect=lambda db, metrics, commit: len(metrics),
+    )
+
+
+def test_buffer_flushes_every_max_rows(mock_create):
+    db = make_db()
+    buffer = MetricWriteBuffer(db, max_rows=3, max_seconds=3600)
+
+    for _ in range(7):
+        buffer.add(make_metric())
+
+    assert [len(call.args[1]) for call in mock_create.call_args_list] == [3, 3]
+    assert len(buffer) == 1
+    assert db.commit.call_count == 2
+    mock_create.assert_called_with(db, mock_create.call_args.args[1], commit=False)
+
+
+def test_buffer_flushes_after_max_seconds(mock_create):
+    now = [0.0]
+    buffer = MetricWriteBuffer(make_db(), max_rows=100, max_seconds=5, clock=lambda: now[0])
+
+    buffer.add(make_metric())
+    mock_create.assert_not_called()
+
+    now[0] = 6.0
+    buffer.add(make_metric())
+    assert len(mock_create.call_args.args[1]) == 2
+    assert buffer.written == 2
+
+
+def test_buffer_flushes_on_exit(mock_create):
+    with MetricWriteBuffer(make_db(), max_rows=100, max_seconds=3600) as buffer:
+        buffer.add(make_metric())
+        buffer.add(make_metric())
+
+    assert len(mock_create.call_args.args[1]) == 2
+    assert len(buffer) == 0
+
+
+def test_buffer_flushes_on_exit_after_error(mock_create):
+    with pytest.raises(RuntimeError):
+        with MetricWriteBuffer(make_db(), max_rows=100, max_seconds=3600) as buffer:
+            buffer.add(make_metric())
+            raise RuntimeError("ingestion crashed")
+
+    assert len(mock_create.call_args.args[1]) == 1
+
+
+def test_buffer_retries_failed_batch_row_by_row(mocker):
+    bad = make_metric()
+
+    def create(db, metrics, commit):
+        if bad in metrics:
+            raise Exception("bad row")
+        return len(metrics)
+
+    mocker.patch("app.services.metric_buffer.create_metrics_sync", side_effect=create)
+    db = make_db()
+    buffer = MetricWriteBuffer(db, max_rows=3, max_seconds=3600)
+
+    buffer.extend([make_metric(), bad, make_metric()])
+
+    assert buffer.written == 2
+    assert buffer.dropped == 1
+    assert db.begin_nested.call_count == 4
+    db.commit.assert_called_once()
+    db.rollback.assert_not_called()
+
+
+def test_buffer_keeps_rows_when_commit_fails(mock_create):
+    db = make_db()
+    db.commit.side_effect = [Exception("DB down"), None]
+    buffer = MetricWriteBuffer(db, max_rows=2, max_seconds=3600)
+    buffer.add(make_metric())
+
+    with pytest.raises(Exception, match="DB down"):
+        buffer.add(make_metric())
+
+    db.rollback.assert_called_once()
+    assert len(buffer) == 2
+    assert buffer.written == 0
+
+    buffer.flush()
+    assert buffer.written == 2
+    assert len(buffer) == 0
+
+
+def test_buffer_counts_rows_dropped_on_exit(mock_create):
+    db = make_db()
+    db.commit.side_effect = Exception("DB down")
+
+    with pytest.raises(RuntimeError):
+        with MetricWriteBuffer(db, max_rows=100, max_seconds=3600) as buffer:
+            buffer.add(make_metric())
+            buffer.add(make_metric())
+            raise RuntimeError("ingestion crashed")
+
+    assert buffer.dropped == 2
+    assert len(buffer) == 0
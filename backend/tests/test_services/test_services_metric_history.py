@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from unittest.mock import MagicMock
+
+from app.core.config import settings
+from app.crud.metric_rollups import (
+    EPOCH,
+    WATERMARK_KEY,
+    WATERMARK_OVERLAP,
+    refresh_metric_rollups_sync,
+    roll_up_new_metrics_sync,
+)
+from app.services.metric_history import choose_resolution, get_metric_history
+
+COIN_ID = uuid4()
+NOW = datetime(2025, 6, 10, 12, 0)
+
+
+def compiled(db: MagicMock, index: int) -> str:
+    return str(db.execute.call_args_list[index].args[0].compile(dialect=postgresql.dialect()))
+
+
+@pytest.fixture
+def snapshots(mocker):
+    def configure(count):
+        return mocker.patch("app.services.metric_history.count_metrics_in_range", return_value=count)
+    return configure
+
+
+def test_refresh_recomputes_touched_days():
+    db = MagicMock()
+    db.execute.return_value.rowcount = 5
+
+    assert refresh_metric_rollups_sync(db, EPOCH, NOW) == 10
+
+    assert compiled(db, 0).startswith("WITH touched AS")
+    assert "DELETE FROM metric_rollups USING touched" in compiled(db, 0)
+    for index, resolution in ((1, "hour"), (2, "day")):
+        sql = compiled(db, index)
+        assert f"GROUP BY metrics.coin_id, date_trunc('{resolution}', metrics.fetched_at)" in sql
+        assert "FILTER (WHERE metrics.liquidity IS NOT NULL)" in sql
+        assert "ON CONFLICT (coin_id, resolution, bucket_start) DO UPDATE" in sql
+
+
+@pytest.mark.parametrize(
+    "watermark, full, since",
+    [
+        (None, False, EPOCH),
+        ("2025-06-10T11:00:00", False, datetime(2025, 6, 10, 11) - WATERMARK_OVERLAP),
+        ("2025-06-10T11:00:00", True, EPOCH),
+    ],
+)
+def test_roll_up_advances_watermark(mocker, watermark, full, since):
+    mocker.patch("app.crud.metric_rollups.get_config_value_sync", return_value=watermark)
+    mock_set = mocker.patch("app.crud.metric_rollups.set_config_value_sync")
+    mock_refresh = mocker.patch("app.crud.metric_rollups.refresh_metric_rollups_sync", return_value=7)
+    db = MagicMock()
+
+    assert roll_up_new_metrics_sync(db, full=full, now=NOW) == 7
+
+    mock_refresh.assert_called_once_with(db, since, NOW)
+    mock_set.assert_called_once_with(db, WATERMARK_KEY, NOW.isoformat())
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_choose_raw_when_snapshots_fit(snapshots, mocker):
+    mocker.patch.object(settings, "METRICS_RETENTION_MONTHS", 0)
+    mock_count = snapshots(120)
+
+    assert await choose_resolution(MagicMock(), COIN_ID, NOW - timedelta(days=30), NOW, 500) == "raw"
+    assert mock_count.call_args.kwargs == {"cap": 501}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("days, resolution", [(20, "hour"), (300, "day"), (3000, "day")])
+async def test_choose_rollups_when_snapshots_overflow(snapshots, mocker, days, resolution):
+    mocker.patch.object(settings, "METRICS_RETENTION_MONTHS", 0)
+    snapshots(501)
+
+    assert await choose_resolution(MagicMock(), COIN_ID, NOW - timedelta(days=days), NOW, 500) == resolution
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_choose_skips_raw_beyond_retention(snapshots, mocker):
+    mocker.patch.object(settings, "METRICS_RETENTION_MONTHS", 1)
+    mock_count = snapshots(1)
+
+    assert await choose_resolution(MagicMock(), COIN_ID, NOW - timedelta(days=400), NOW, 500) == "day"
+    mock_count.assert_not_called()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_history_from_rollups(mocker):
+    rollups = [
+        SimpleNamespace(bucket_start=NOW, sample_count=6, liquidity_min=1.0, liquidity_max=3.0,
+                        liquidity_avg=2.0, liquidity_last=3.0),
+    ]
+    mock_rollups = mocker.patch("app.services.metric_history.get_metric_rollups", return_value=rollups)
+    db = MagicMock()
+
+    history = await get_metric_history(db, COIN_ID, NOW - timedelta(days=1), NOW, 100, "hour", ["liquidity"])
+
+    mock_rollups.assert_called_once_with(db, COIN_ID, "hour", NOW - timedelta(days=1), NOW, 100)
+    assert history["resolution"] == "hour"
+    assert history["sample_count"] == [6]
+    assert history["series"] == {"liquidity": {"min": [1.0], "max": [3.0], "avg": [2.0], "last": [3.0]}}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_history_from_raw_snapshots(mocker):
+    metrics = [SimpleNamespace(fetched_at=NOW, market_cap=5.0)]
+    mocker.patch("app.services.metric_history.choose_resolution", return_value="raw")
+    mocker.patch("app.services.metric_history.get_metrics_in_range", return_value=metrics)
+
+    history = await get_metric_history(MagicMock(), COIN_ID, NOW - timedelta(days=1), NOW, 100, fields=["market_cap"])
+
+    assert history["resolution"] == "raw"
+    assert history["bucket_start"] == [NOW]
+    assert history["series"]["market_cap"] == {"last": [5.0]}
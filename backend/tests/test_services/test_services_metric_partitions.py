@@ -0,0 +1,173 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import insert, text
+from sqlalchemy.dialects import postgresql
+from unittest.mock import MagicMock
+
+from app.core.config import settings
+from app.crud.metric_partitions import (
+    apply_metric_retention_sync,
+    ensure_metric_partitions_sync,
+    partition_metrics_table,
+)
+from app.db.partitions import drop_partitions_before_sync, is_partitioned_sync, months_between
+from app.models import Metric
+
+NOW = datetime(2025, 6, 10)
+
+
+async def rows_by_partition(session) -> dict[str, int]:
+    rows = await session.execute(text("SELECT tableoid::regclass::text, count(*) FROM metrics GROUP BY 1"))
+    return dict(rows.all())
+
+
+async def table_exists(session, name: str) -> bool:
+    return (await session.execute(text("SELECT to_regclass(:name)"), {"name": name})).scalar() is not None
+
+
+@pytest.fixture
+def retention(mocker):
+    def configure(months, action="detach"):
+        mocker.patch.object(settings, "METRICS_RETENTION_MONTHS", months)
+        mocker.patch.object(settings, "METRICS_RETENTION_ACTION", action)
+    return configure
+
+
+def test_months_between_is_inclusive():
+    assert months_between(datetime(2024, 11, 30), datetime(2025, 2, 1)) == 4
+
+
+def test_ensure_covers_current_month_and_ahead(mocker):
+    mocker.patch.object(settings, "METRICS_PARTITIONS_AHEAD", 2)
+
+    names = ensure_metric_partitions_sync(MagicMock(), now=NOW)
+
+    assert names == ["metrics_2025_06", "metrics_2025_07", "metrics_2025_08"]
+
+
+def test_detach_keeps_partition_tables():
+    db = MagicMock()
+    db.execute.return_value.all.return_value = [
+        ("metrics_2024_01", "FOR VALUES FROM ('2024-01-01 00:00:00') TO ('2024-02-01 00:00:00')"),
+    ]
+
+    assert drop_partitions_before_sync(db, "metrics", datetime(2025, 1, 1), detach=True) == ["metrics_2024_01"]
+    assert db.execute.call_count == 2
+
+
+@pytest.mark.parametrize("action, detach", [("detach", True), ("drop", False)])
+def test_retention_retires_old_partitions(retention, action, detach, mocker):
+    retention(12, action)
+    mock_retire = mocker.patch(
+        "app.crud.metric_partitions.drop_partitions_before_sync", return_value=["metrics_2024_05"]
+    )
+    mock_stale = mocker.patch("app.crud.metric_partitions.mark_normalization_stats_stale_sync")
+    db = MagicMock()
+
+    assert apply_metric_retention_sync(db, now=NOW) == ["metrics_2024_05"]
+
+    assert mock_retire.call_args.args[1:] == ("metrics", datetime(2024, 6, 1))
+    assert mock_retire.call_args.kwargs == {"detach": detach}
+    db.execute.assert_called_once()
+    mock_stale.assert_called_once_with(db)
+
+
+def test_retention_without_expired_partitions(retention, mocker):
+    retention(12)
+    mocker.patch("app.crud.metric_partitions.drop_partitions_before_sync", return_value=[])
+    db = MagicMock()
+
+    assert apply_metric_retention_sync(db, now=NOW) == []
+    db.execute.assert_not_called()
+
+
+def test_retention_disabled(retention, mocker):
+    retention(0)
+    mock_retire = mocker.patch("app.crud.metric_partitions.drop_partitions_before_sync")
+
+    assert apply_metric_retention_sync(MagicMock(), now=NOW) == []
+    mock_retire.assert_not_called()
+
+
+def test_conversion_skips_partitioned_table(mocker):
+    mocker.patch("app.crud.metric_partitions.is_partitioned_sync", return_value=True)
+    bind = MagicMock()
+
+    assert partition_metrics_table(bind) == 0
+    bind.execute.assert_not_called()
+
+
+def test_conversion_moves_rows_month_by_month(mocker):
+    mocker.patch("app.crud.metric_partitions.is_partitioned_sync", return_value=False)
+    mocker.patch("app.crud.metric_partitions.datetime", MagicMock(utcnow=MagicMock(return_value=NOW)))
+    mocker.patch.object(settings, "METRICS_PARTITIONS_AHEAD", 1)
+    mock_create = mocker.patch("app.crud.metric_partitions.Metric.__table__.create")
+    bind = MagicMock()
+    bind.execute.return_value.scalars.return_value.all.return_value = ["metrics_pkey", "ix_metrics_coin_id"]
+    bind.execute.return_value.one.return_value = (datetime(2025, 4, 20),)
+    bind.execute.return_value.rowcount = 10
+
+    moved = partition_metrics_table(bind)
+
+    mock_create.assert_called_once_with(bind)
+    assert moved == 50  # April through July, then the DEFAULT partition
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("action", ["detach", "drop"])
+async def test_metrics_route_into_partitions_and_retire(db_session, test_coin, retention, mocker, action):
+    mocker.patch.object(settings, "METRICS_PARTITIONS_AHEAD", 1)
+    retention(1, action)
+    created = await db_session.run_sync(lambda session: ensure_metric_partitions_sync(session, now=datetime(2020, 1, 10)))
+    try:
+        assert created == ["metrics_2020_01", "metrics_2020_02"]
+        for fetched_at in (datetime(2019, 6, 1), datetime(2020, 1, 15), datetime(2020, 2, 15)):
+            db_session.add(Metric(coin_id=test_coin.id, liquidity=1.0, fetched_at=fetched_at))
+        await db_session.commit()
+
+        assert await rows_by_partition(db_session) == {"metrics_default": 1, "metrics_2020_01": 1, "metrics_2020_02": 1}
+
+        retired = await db_session.run_sync(lambda session: apply_metric_retention_sync(session, now=datetime(2020, 3, 5)))
+        await db_session.commit()
+
+        assert retired == ["metrics_2020_01"]
+        assert await rows_by_partition(db_session) == {"metrics_default": 1, "metrics_2020_02": 1}
+        assert await table_exists(db_session, "metrics_2020_01") is (action == "detach")
+    finally:
+        await db_session.rollback()
+        for name in created:
+            await db_session.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
+        await db_session.commit()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_conversion_partitions_a_plain_metrics_table(db_session, test_coin, mocker):
+    mocker.patch("app.crud.metric_partitions.datetime", MagicMock(utcnow=MagicMock(return_value=NOW)))
+    mocker.patch.object(settings, "METRICS_PARTITIONS_AHEAD", 1)
+    dialect = postgresql.dialect()
+    columns = ", ".join(f'"{c.name}" {c.type.compile(dialect=dialect)}' for c in Metric.__table__.columns)
+    rows = [
+        {"id": uuid4(), "coin_id": test_coin.id, "source": "coin", "is_active": True,
+         "fetched_at": fetched_at, "created_at": fetched_at}
+        for fetched_at in (datetime(2025, 4, 20), datetime(2025, 6, 1), datetime(2030, 1, 1))
+    ]
+
+    # Everything runs in one transaction and is rolled back, restoring the partitioned table
+    try:
+        await db_session.execute(text("DROP TABLE metrics CASCADE"))
+        await db_session.execute(text(f"CREATE TABLE metrics ({columns}, PRIMARY KEY (id))"))
+        await db_session.execute(insert(Metric.__table__), rows)
+
+        moved = await db_session.run_sync(lambda session: partition_metrics_table(session.connection()))
+
+        assert moved == 3
+        assert await db_session.run_sync(lambda session: is_partitioned_sync(session, "metrics"))
+        assert await rows_by_partition(db_session) == {
+            "metrics_2025_04": 1, "metrics_2025_06": 1, "metrics_default": 1,
+        }
+        assert not await table_exists(db_session, "metrics_legacy")
+        assert await db_session.run_sync(lambda session: partition_metrics_table(session.connection())) == 0
+    finally:
+        await db_session.rollback()
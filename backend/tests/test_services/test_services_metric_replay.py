@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.models.metric import METRIC_SOURCE_COIN
+from app.services.metric_replay import replay_archive
+
+START = datetime(2025, 1, 1)
+END = START + timedelta(days=1)
+
+
+def test_replay_archive_rebuilds_metrics(mocker):
+    coin = MagicMock(id=uuid4())
+    archive = MagicMock()
+    archive.coingeckoids.return_value = ["bitcoin", "delisted"]
+    archive.iter_records.return_value = [
+        ("bitcoin", START + timedelta(hours=1), {"id": "bitcoin", "market_data": {"market_cap": {"usd": 5}}}),
+        ("delisted", START + timedelta(hours=2), {"id": "delisted"}),
+    ]
+    mocker.patch("app.services.metric_replay.get_coins_by_coingeckoids_sync", return_value={"bitcoin": coin})
+    mock_deactivate = mocker.patch("app.services.metric_replay.deactivate_metrics_sync", return_value=1)
+    mock_create = mocker.patch("app.services.metric_replay.create_metrics_sync")
+    db = MagicMock()
+
+    stats = replay_archive(db, archive, START, END)
+
+    assert mock_deactivate.call_args.args[1] == [(coin.id, START + timedelta(hours=1))]
+    assert mock_deactivate.call_args.kwargs == {"source": METRIC_SOURCE_COIN, "commit": False}
+    metric = mock_create.call_args.args[1][0]
+    assert metric.coin_id == coin.id
+    assert metric.market_cap == 5
+    assert metric.fetched_at == START + timedelta(hours=1)
+    db.commit.assert_called_once()
+    assert stats == {"coins": 1, "deactivated": 1, "replayed": 1, "skipped": 1}
+
+
+def test_replay_archive_batches_and_rolls_back_failed_batch(mocker):
+    coin = MagicMock(id=uuid4())
+    archive = MagicMock()
+    archive.coingeckoids.return_value = ["bitcoin"]
+    archive.iter_records.return_value = [
+        ("bitcoin", START + timedelta(hours=hour), {"id": "bitcoin"}) for hour in range(3)
+    ]
+    mocker.patch("app.services.metric_replay.get_coins_by_coingeckoids_sync", return_value={"bitcoin": coin})
+    mock_deactivate = mocker.patch("app.services.metric_replay.deactivate_metrics_sync", return_value=2)
+    mocker.patch("app.services.metric_replay.create_metrics_sync", side_effect=[2, Exception("DB down")])
+    db = MagicMock()
+
+    with pytest.raises(Exception, match="DB down"):
+        replay_archive(db, archive, START, END, max_rows=2)
+
+    assert [len(call.args[1]) for call in mock_deactivate.call_args_list] == [2, 1]
+    db.commit.assert_called_once()
+    db.rollback.assert_called_once()
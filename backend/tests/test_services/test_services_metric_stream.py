@@ -0,0 +1,70 @@
+import json
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from unittest.mock import AsyncMock, MagicMock
+
+from app.crud.metrics import metrics_export_query
+from app.services.metric_stream import FORMAT_CSV, FORMAT_NDJSON, encode_csv, encode_ndjson, stream_rows
+
+COIN_ID = uuid4()
+FETCHED_AT = datetime(2025, 6, 10, 12, 0)
+
+
+def session_factory(batches) -> MagicMock:
+    async def partitions():
+        for batch in batches:
+            yield batch
+
+    session = MagicMock()
+    session.stream = AsyncMock(return_value=MagicMock(partitions=partitions))
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    return factory
+
+
+async def collect(stream) -> list[bytes]:
+    return [chunk async for chunk in stream]
+
+
+def test_export_query_orders_by_keyset_per_coin():
+    stmt = metrics_export_query([COIN_ID], fields=["liquidity"])
+
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("SELECT metrics.id, metrics.fetched_at, metrics.liquidity")
+    assert sql.endswith("ORDER BY metrics.coin_id, metrics.fetched_at, metrics.id")
+    assert "ORDER BY" not in str(metrics_export_query().compile(dialect=postgresql.dialect()))
+
+
+def test_encoders_render_plain_values():
+    metric_id = uuid4()
+
+    line = encode_ndjson(["id", "fetched_at", "liquidity"], [(metric_id, FETCHED_AT, None)])
+
+    assert json.loads(line) == {"id": str(metric_id), "fetched_at": "2025-06-10T12:00:00", "liquidity": None}
+    assert encode_csv([(metric_id, FETCHED_AT, None)]) == f"{metric_id},2025-06-10T12:00:00,\n".encode()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_stream_yields_a_chunk_per_partition():
+    stmt = metrics_export_query([COIN_ID], fields=["liquidity"])
+    factory = session_factory([[(uuid4(), FETCHED_AT, 1.0), (uuid4(), FETCHED_AT, 2.0)], [(uuid4(), FETCHED_AT, 3.0)]])
+
+    chunks = await collect(stream_rows(factory, stmt, FORMAT_NDJSON, chunk_rows=2))
+
+    assert len(chunks) == 2
+    assert [json.loads(line)["liquidity"] for line in b"".join(chunks).splitlines()] == [1.0, 2.0, 3.0]
+    session = factory.return_value.__aenter__.return_value
+    assert session.stream.call_args.args[0].get_execution_options()["yield_per"] == 2
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_csv_header_precedes_the_query():
+    stmt = metrics_export_query([COIN_ID], fields=["liquidity"])
+    stream = stream_rows(session_factory([]), stmt, FORMAT_CSV, chunk_rows=100)
+
+    assert await stream.__anext__() == b"id,fetched_at,liquidity\n"
+    assert await collect(stream) == []
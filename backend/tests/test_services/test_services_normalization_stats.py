@@ -0,0 +1,198 @@
+import asyncio
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+from unittest.mock import MagicMock
+
+from app.crud.normalization_stats import (
+    STAT_NAMES,
+    get_normalization_maxima_sync,
+    metric_stat_values,
+    update_normalization_stats_sync,
+)
+from app.models import NormalizationStat
+from app.schemas.metric import MetricCreate
+from tests.conftest import TestingSessionLocal
+
+NOW = datetime(2025, 1, 1)
+
+
+def metric(coin_id, liquidity=0.0, fetched_at=NOW, **fields) -> MetricCreate:
+    return MetricCreate(coin_id=coin_id, liquidity=liquidity, fetched_at=fetched_at, **fields)
+
+
+def stat(name, value, holder=None, is_stale=False) -> NormalizationStat:
+    return NormalizationStat(name=name, value=value, holder_coin_id=holder, is_stale=is_stale)
+
+
+def db_with_stats(*stats) -> MagicMock:
+    db = MagicMock()
+    db.execute.return_value.scalars.return_value.all.return_value = list(stats)
+    db.execute.return_value.scalars.return_value.__iter__.side_effect = lambda: iter(stats)
+    return db
+
+
+def test_metric_stat_values_sums_components():
+    values = metric_stat_values(metric(
+        uuid4(), liquidity=3, twitter_sentiment=0.25, reddit_sentiment=None, market_cap=100, volume_24h=5,
+    ))
+
+    assert values == {"max_liquidity": 3, "max_github_activity": 0, "max_community": 0.25, "max_market": 105}
+
+
+def candidate_rows(db) -> dict:
+    insert_stmt = db.execute.call_args_list[0].args[0]
+    params = insert_stmt.compile().params
+    return {
+        params[f"name_m{i}"]: (params[f"value_m{i}"], params[f"holder_coin_id_m{i}"])
+        for i in range(len(STAT_NAMES))
+    }
+
+
+def test_update_upserts_batch_maximum_without_row_locks():
+    low, high = uuid4(), uuid4()
+    db = MagicMock()
+
+    update_normalization_stats_sync(db, [metric(low, liquidity=4, market_cap=50), metric(high, liquidity=9)])
+
+    assert [call.args[0].is_dml for call in db.execute.call_args_list] == [True, True]
+    rows = candidate_rows(db)
+    assert list(rows) == sorted(STAT_NAMES)
+    assert rows["max_liquidity"] == (9, high)
+    assert rows["max_market"] == (50, low)
+
+
+def test_update_uses_latest_metric_per_coin():
+    coin = uuid4()
+    db = MagicMock()
+
+    update_normalization_stats_sync(db, [
+        metric(coin, liquidity=50, fetched_at=NOW - timedelta(hours=1)),
+        metric(coin, liquidity=8, fetched_at=NOW),
+    ])
+
+    assert candidate_rows(db)["max_liquidity"] == (8, coin)
+
+
+def test_update_without_metrics_is_noop():
+    db = MagicMock()
+
+    update_normalization_stats_sync(db, [])
+
+    db.execute.assert_not_called()
+
+
+async def seed_liquidity(session, value, holder):
+    session.add(NormalizationStat(name="max_liquidity", value=value, holder_coin_id=holder, is_stale=False))
+    await session.commit()
+
+
+async def read_liquidity(session) -> NormalizationStat:
+    session.expire_all()
+    return (await session.execute(
+        select(NormalizationStat).where(NormalizationStat.name == "max_liquidity")
+    )).scalar_one()
+
+
+async def apply(session, metrics_in):
+    await session.run_sync(lambda sync_session: update_normalization_stats_sync(sync_session, metrics_in))
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_new_maximum_takes_over(db_session):
+    coin = uuid4()
+    await seed_liquidity(db_session, 10, uuid4())
+
+    await apply(db_session, [metric(coin, liquidity=25)])
+    await db_session.commit()
+
+    liquidity = await read_liquidity(db_session)
+    assert (liquidity.value, liquidity.holder_coin_id, liquidity.is_stale) == (25, coin, False)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_holder_drop_marks_stale(db_session):
+    holder = uuid4()
+    await seed_liquidity(db_session, 10, holder)
+
+    await apply(db_session, [metric(holder, liquidity=4), metric(uuid4(), liquidity=6)])
+    await db_session.commit()
+
+    liquidity = await read_liquidity(db_session)
+    assert (liquidity.value, liquidity.holder_coin_id, liquidity.is_stale) == (10, holder, True)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_holder_drop_outrun_by_new_maximum_stays_fresh(db_session):
+    holder, challenger = uuid4(), uuid4()
+    await seed_liquidity(db_session, 10, holder)
+
+    await apply(db_session, [metric(holder, liquidity=4), metric(challenger, liquidity=12)])
+    await db_session.commit()
+
+    liquidity = await read_liquidity(db_session)
+    assert (liquidity.value, liquidity.holder_coin_id, liquidity.is_stale) == (12, challenger, False)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_missing_stats_inserted_stale(db_session):
+    coin = uuid4()
+
+    await apply(db_session, [metric(coin, liquidity=3)])
+    await db_session.commit()
+
+    stats = (await db_session.execute(select(NormalizationStat))).scalars().all()
+    assert sorted(stat.name for stat in stats) == sorted(STAT_NAMES)
+    assert all(stat.is_stale for stat in stats)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("second_value, expected_winner", [(30, "second"), (15, "first")])
+async def test_overlapping_writers_keep_the_maximum(db_session, second_value, expected_winner):
+    coins = {"first": uuid4(), "second": uuid4()}
+    await seed_liquidity(db_session, 10, uuid4())
+
+    async with TestingSessionLocal() as first, TestingSessionLocal() as second:
+        await apply(first, [metric(coins["first"], liquidity=20)])
+
+        # The second writer waits on the row the first one changed, not on a lock it took up front
+        pending = asyncio.create_task(apply(second, [metric(coins["second"], liquidity=second_value)]))
+        await asyncio.sleep(0.2)
+        assert not pending.done()
+
+        await first.commit()
+        await asyncio.wait_for(pending, timeout=5)
+        await second.commit()
+
+    liquidity = await read_liquidity(db_session)
+    assert liquidity.value == max(20, second_value)
+    assert liquidity.holder_coin_id == coins[expected_winner]
+    assert liquidity.is_stale is False
+
+
+def test_maxima_read_without_recompute(mocker):
+    db = db_with_stats(*(stat(name, 0 if name == "max_market" else 5) for name in STAT_NAMES))
+    mock_recompute = mocker.patch("app.crud.normalization_stats.recompute_normalization_stats_sync")
+
+    maxima = get_normalization_maxima_sync(db)
+
+    mock_recompute.assert_not_called()
+    assert maxima == {"max_liquidity": 5, "max_github_activity": 5, "max_community": 5, "max_market": 1}
+
+
+@pytest.mark.parametrize("stats", [
+    [],
+    [stat(name, 5, is_stale=name == "max_community") for name in STAT_NAMES],
+])
+def test_maxima_recomputed_when_missing_or_stale(stats, mocker):
+    mock_recompute = mocker.patch(
+        "app.crud.normalization_stats.recompute_normalization_stats_sync",
+        return_value={name: 7 for name in STAT_NAMES},
+    )
+
+    maxima = get_normalization_maxima_sync(db_with_stats(*stats))
+
+    mock_recompute.assert_called_once()
+    assert set(maxima.values()) == {7}
@@ -0,0 +1,113 @@
+import json
+import os
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+from sqlalchemy.dialects import postgresql
+from unittest.mock import MagicMock
+
+from app.core.config import settings
+from app.services.parquet_export import (
+    MANIFEST_FILENAME,
+    METRICS_DATASET,
+    SCORES_DATASET,
+    export_parquet_sync,
+    load_manifest,
+)
+
+NOW = datetime(2025, 6, 10, 12, 0)
+UNTIL = NOW - timedelta(minutes=15)
+COIN_A, COIN_B, WEIGHT = uuid4(), uuid4(), uuid4()
+
+
+def metric_row(coin_id, fetched_at):
+    return (uuid4(), coin_id, 1.0, 2.0, 3.0, 4.0, 0.5, None, "coin", True, fetched_at, fetched_at)
+
+
+def score_row(coin_id, scored_at):
+    return (coin_id, WEIGHT, 0.1, 0.2, 0.3, 0.4, 0.25, scored_at)
+
+
+def db_returning(metric_batches, score_batches) -> MagicMock:
+    db = MagicMock()
+    db.execute.side_effect = [
+        MagicMock(partitions=MagicMock(return_value=iter(metric_batches))),
+        MagicMock(partitions=MagicMock(return_value=iter(score_batches))),
+    ]
+    return db
+
+
+@pytest.fixture(autouse=True)
+def export_settings(mocker):
+    mocker.patch.object(settings, "PARQUET_EXPORT_LAG_MINUTES", 15)
+    mocker.patch.object(settings, "PARQUET_EXPORT_BATCH_ROWS", 2)
+
+
+def test_export_writes_date_partitions_and_manifest(tmp_path):
+    day_one, day_two = datetime(2025, 6, 8, 6), datetime(2025, 6, 9, 6)
+    db = db_returning(
+        [[metric_row(COIN_A, day_one), metric_row(COIN_B, day_two)], [metric_row(COIN_A, day_two)]],
+        [[score_row(COIN_A, day_two)]],
+    )
+
+    assert export_parquet_sync(db, str(tmp_path), now=NOW) == {"metrics": 3, "scores": 1}
+
+    manifest = load_manifest(str(tmp_path))
+    metrics = manifest["datasets"]["metrics"]
+    assert metrics["watermark"] == UNTIL.isoformat()
+    assert metrics["rows"] == 3
+    assert [(f["date"], f["rows"]) for f in metrics["files"]] == [("2025-06-08", 1), ("2025-06-09", 2)]
+    assert metrics["files"][1]["path"] == "metrics/date=2025-06-09/part-20250610T114500.parquet"
+    assert metrics["dedupe"] == {"key_columns": ["coin_id", "fetched_at"], "keep_greatest": "created_at"}
+    assert "dedupe" not in manifest["datasets"]["scores"]
+
+    table = pq.read_table(tmp_path / metrics["files"][1]["path"])
+    assert table.schema.field("coin_id").type == pa.dictionary(pa.int32(), pa.string())
+    assert table.column("coin_id").to_pylist() == [str(COIN_B), str(COIN_A)]
+    assert table.column("reddit_sentiment").to_pylist() == [None, None]
+
+    scores = ds.dataset(tmp_path / "scores", format="parquet", partitioning="hive").to_table()
+    assert scores.column("final_score").to_pylist() == [0.25]
+
+
+def test_export_continues_from_watermark(tmp_path):
+    export_parquet_sync(db_returning([], []), str(tmp_path), now=NOW)
+    db = db_returning([[metric_row(COIN_A, NOW)]], [])
+
+    assert export_parquet_sync(db, str(tmp_path), now=NOW + timedelta(hours=1)) == {"metrics": 1, "scores": 0}
+
+    sql = str(db.execute.call_args_list[0].args[0].compile(dialect=postgresql.dialect()))
+    assert "metrics.created_at <= %(created_at_1)s AND metrics.created_at > %(created_at_2)s" in sql
+    manifest = load_manifest(str(tmp_path))
+    assert manifest["datasets"]["metrics"]["watermark"] == (UNTIL + timedelta(hours=1)).isoformat()
+
+
+def test_failed_run_leaves_manifest_and_removes_partial_files(tmp_path):
+    export_parquet_sync(db_returning([], []), str(tmp_path), now=NOW)
+    before = (tmp_path / MANIFEST_FILENAME).read_text()
+
+    def failing_batches():
+        yield [metric_row(COIN_A, NOW)]
+        raise RuntimeError("connection lost")
+
+    db = db_returning(failing_batches(), [])
+    with pytest.raises(RuntimeError):
+        export_parquet_sync(db, str(tmp_path), now=NOW + timedelta(hours=1))
+
+    assert (tmp_path / MANIFEST_FILENAME).read_text() == before
+    assert not any(files for _, _, files in os.walk(tmp_path / METRICS_DATASET.name))
+
+
+def test_unlisted_files_are_removed_before_export(tmp_path):
+    stray = tmp_path / SCORES_DATASET.name / "date=2025-06-01" / "part-stray.parquet"
+    stray.parent.mkdir(parents=True)
+    stray.write_bytes(b"partial")
+
+    export_parquet_sync(db_returning([], []), str(tmp_path), now=NOW)
+
+    assert not stray.exists()
+    assert json.loads((tmp_path / MANIFEST_FILENAME).read_text())["datasets"]["scores"]["files"] == []
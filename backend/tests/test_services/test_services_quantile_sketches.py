@@ -0,0 +1,136 @@
+from datetime import datetime
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+
+from app.crud.quantile_sketches import (
+    SKETCH_NAMES,
+    add_quantile_sketch_delta_sync,
+    get_quantile_sketches_sync,
+    metric_sketch_values,
+    rebuild_quantile_sketches_sync,
+)
+from app.models import QuantileSketch
+from app.schemas.metric import MetricCreate
+from app.services.scoring_engine import (
+    NORMALIZATION_PERCENTILE,
+    MetricMatrix,
+    compute_percentile_matrix,
+    load_normalizer,
+    percentile_snapshot,
+)
+from app.utils.quantile_sketch import KLLSketch
+
+NOW = datetime(2025, 1, 1)
+
+
+def sketch_of(*values) -> KLLSketch:
+    sketch = KLLSketch()
+    sketch.update_many(values)
+    return sketch
+
+
+def db_with_sketches(*rows) -> MagicMock:
+    db = MagicMock()
+    db.execute.return_value.scalars.return_value.all.return_value = list(rows)
+    db.execute.return_value.scalars.return_value.__iter__.side_effect = lambda: iter(rows)
+    return db
+
+
+def test_metric_sketch_values_follow_stat_inputs():
+    metric = MetricCreate(
+        coin_id=uuid4(), fetched_at=NOW, liquidity=3, github_activity=2,
+        twitter_sentiment=0.25, market_cap=100, volume_24h=5,
+    )
+
+    assert metric_sketch_values(metric) == {"liquidity": 3, "github_activity": 2, "community": 0.25, "market": 105}
+
+
+def test_delta_sketches_a_written_batch():
+    db = MagicMock()
+
+    add_quantile_sketch_delta_sync(db, [
+        MetricCreate(coin_id=uuid4(), fetched_at=NOW, liquidity=10, market_cap=500),
+        MetricCreate(coin_id=uuid4(), fetched_at=NOW, liquidity=20),
+    ])
+
+    params = db.execute.call_args.args[0].compile().params
+    assert params["count"] == 2
+    assert KLLSketch.from_dict(params["sketches"]["liquidity"]).quantile(1.0) == 20
+    assert KLLSketch.from_dict(params["sketches"]["market"]).quantile(1.0) == 500
+
+
+def test_delta_skips_empty_batch():
+    db = MagicMock()
+
+    add_quantile_sketch_delta_sync(db, [])
+
+    db.execute.assert_not_called()
+
+
+def test_get_merges_deltas_into_rebuilt_sketches():
+    rows = [QuantileSketch(name=name, sketch=sketch_of(1.0).to_dict(), count=1) for name in SKETCH_NAMES]
+    delta = {name: sketch_of(2.0, 3.0).to_dict() for name in SKETCH_NAMES}
+    db = MagicMock()
+    db.execute.return_value.scalars.side_effect = [iter(rows), iter([delta])]
+
+    sketches = get_quantile_sketches_sync(db)
+
+    assert sketches["liquidity"].count == 3
+    assert sketches["market"].quantile(1.0) == 3.0
+
+
+def test_rebuild_compacts_deltas_seen_before_the_scan():
+    delta_id = uuid4()
+    db = MagicMock()
+    ids, scan, upsert, compact = MagicMock(), [(1.0, 2.0, 3.0, 4.0)], MagicMock(), MagicMock()
+    ids.scalars.return_value.all.return_value = [delta_id]
+    db.execute.side_effect = [ids, scan, upsert, compact]
+
+    sketches = rebuild_quantile_sketches_sync(db)
+
+    assert sketches["market"].quantile(1.0) == 4.0
+    delete_stmt = db.execute.call_args_list[3].args[0]
+    assert delete_stmt.table.name == "quantile_sketch_deltas"
+    assert list(delete_stmt.compile().params.values()) == [[delta_id]]
+    db.commit.assert_called_once()
+
+
+def test_get_rebuilds_when_a_sketch_is_missing(mocker):
+    mock_rebuild = mocker.patch("app.crud.quantile_sketches.rebuild_quantile_sketches_sync", return_value={})
+    db = db_with_sketches(QuantileSketch(name="liquidity", sketch=sketch_of(1.0).to_dict(), count=1))
+
+    assert get_quantile_sketches_sync(db) == {}
+    mock_rebuild.assert_called_once_with(db)
+
+
+def test_percentile_matrix_resists_outliers():
+    sketches = {name: sketch_of(0, 1, 2, 3, 1e12) for name in SKETCH_NAMES}
+    matrix = MetricMatrix(coin_ids=[uuid4(), uuid4()], values=np.array([[0, 0, 0, 2], [3, 3, 3, 1e12]], dtype=float))
+
+    components = compute_percentile_matrix(matrix, sketches)
+
+    np.testing.assert_allclose(components[:, 3], [0.4, 0.8])
+    np.testing.assert_allclose(components[0, :3], [0, 0, 0])
+
+
+def test_load_normalizer_percentile_mode(mocker):
+    sketches = {name: sketch_of(*range(100)) for name in SKETCH_NAMES}
+    mocker.patch("app.services.scoring_engine.get_quantile_sketches_sync", return_value=sketches)
+    mock_max = mocker.patch("app.services.scoring_engine.find_max_metrics")
+
+    normalizer = load_normalizer(MagicMock(), NORMALIZATION_PERCENTILE)
+
+    mock_max.assert_not_called()
+    assert normalizer.snapshot == percentile_snapshot(sketches)
+    assert normalizer.snapshot["mode"] == NORMALIZATION_PERCENTILE
+    assert normalizer.snapshot["market"][4] == 49.0
+    matrix = MetricMatrix(coin_ids=[uuid4()], values=np.full((1, 4), 50.0))
+    np.testing.assert_allclose(normalizer.components(matrix), [[0.5] * 4])
+
+
+def test_load_normalizer_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        load_normalizer(MagicMock(), "median")
@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.services.refresh_scheduler import (
+    RefreshCandidate,
+    compute_refresh_interval,
+    get_due_coins,
+    select_due_coins,
+)
+
+NOW = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def test_refresh_interval_bounds():
+    slowest = compute_refresh_interval(None, None)
+    fastest = compute_refresh_interval(1.0, 5.0)
+
+    assert slowest == timedelta(minutes=settings.REFRESH_MAX_INTERVAL_MINUTES)
+    assert fastest == timedelta(minutes=settings.REFRESH_MIN_INTERVAL_MINUTES)
+
+
+def test_refresh_interval_shrinks_with_score_and_volatility():
+    assert compute_refresh_interval(0.8, 0.0) < compute_refresh_interval(0.2, 0.0)
+    assert compute_refresh_interval(0.5, 0.9) < compute_refresh_interval(0.5, 0.1)
+
+
+def test_select_due_coins_orders_by_overdue():
+    candidates = [
+        # Top candidate refreshed 2h ago: interval is the minimum, so overdue
+        RefreshCandidate("hot", NOW - timedelta(hours=2), 1.0, 1.0),
+        # Dead token refreshed 2h ago: not due for another ~22h
+        RefreshCandidate("dead", NOW - timedelta(hours=2), 0.0, 0.0),
+        # Dead token refreshed 3 days ago: due
+        RefreshCandidate("old", NOW - timedelta(days=3), 0.0, 0.0),
+        # Never fetched: always first
+        RefreshCandidate("new", None, None, None),
+    ]
+
+    assert select_due_coins(candidates, NOW) == ["new", "old", "hot"]
+    assert select_due_coins(candidates, NOW, limit=2) == ["new", "old"]
+
+
+def test_get_due_coins_uses_rate_limit_budget(mocker):
+    candidates = [RefreshCandidate(f"coin-{i}", None, None, None) for i in range(5)]
+    mocker.patch("app.services.refresh_scheduler.load_refresh_candidates", return_value=candidates)
+    mocker.patch.object(settings, "COINGECKO_RATE_LIMIT_PER_MINUTE", 1)
+    mocker.patch.object(settings, "REFRESH_TICK_MINUTES", 5)
+    mocker.patch.object(settings, "REFRESH_BUDGET_RESERVE_FRACTION", 0.4)
+
+    assert len(get_due_coins(mocker.MagicMock(), now=NOW)) == 3
@@ -0,0 +1,150 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+from unittest.mock import MagicMock
+
+from app.core.config import settings
+from app.crud.score_history import (
+    drop_expired_score_history_sync,
+    ensure_score_history_partitions_sync,
+    record_score_history_sync,
+)
+from app.db.partitions import (
+    add_months,
+    drop_partitions_before_sync,
+    ensure_monthly_partitions_sync,
+    list_partitions_sync,
+)
+from app.models import Score
+
+RUN_AT = datetime(2025, 3, 15, 12, 0)
+
+
+def db_with_partitions(*rows) -> MagicMock:
+    db = MagicMock()
+    db.execute.return_value.all.return_value = list(rows)
+    return db
+
+
+def test_add_months_rolls_over_years():
+    assert add_months(datetime(2024, 11, 20), 3) == datetime(2025, 2, 1)
+    assert add_months(datetime(2025, 1, 1), -1) == datetime(2024, 12, 1)
+
+
+def test_ensure_creates_consecutive_months():
+    db = MagicMock()
+
+    names = ensure_monthly_partitions_sync(db, "score_history", datetime(2024, 12, 10), 2)
+
+    assert names == ["score_history_2024_12", "score_history_2025_01"]
+    assert db.execute.call_count == 2
+
+
+def test_list_partitions_parses_bounds():
+    db = db_with_partitions(
+        ("score_history_default", "DEFAULT"),
+        ("score_history_2025_02", "FOR VALUES FROM ('2025-02-01 00:00:00') TO ('2025-03-01 00:00:00')"),
+        ("score_history_2025_01", "FOR VALUES FROM ('2025-01-01 00:00:00') TO ('2025-02-01 00:00:00')"),
+    )
+
+    partitions = list_partitions_sync(db, "score_history")
+
+    assert [p.name for p in partitions] == ["score_history_2025_01", "score_history_2025_02", "score_history_default"]
+    assert partitions[0].upper == datetime(2025, 2, 1)
+    assert partitions[-1].is_default
+
+
+def test_drop_keeps_default_and_recent_partitions():
+    db = db_with_partitions(
+        ("score_history_default", "DEFAULT"),
+        ("score_history_2025_01", "FOR VALUES FROM ('2025-01-01 00:00:00') TO ('2025-02-01 00:00:00')"),
+        ("score_history_2025_02", "FOR VALUES FROM ('2025-02-01 00:00:00') TO ('2025-03-01 00:00:00')"),
+    )
+
+    dropped = drop_partitions_before_sync(db, "score_history", datetime(2025, 2, 1))
+
+    assert dropped == ["score_history_2025_01"]
+    assert db.execute.call_count == 2
+
+
+def test_drop_expired_uses_retention(mocker):
+    mock_drop = mocker.patch("app.crud.score_history.drop_partitions_before_sync", return_value=[])
+    mocker.patch.object(settings, "SCORE_HISTORY_RETENTION_MONTHS", 12)
+
+    drop_expired_score_history_sync(MagicMock(), now=RUN_AT)
+
+    assert mock_drop.call_args.args[1:] == ("score_history", datetime(2024, 3, 1))
+
+
+def test_drop_expired_disabled(mocker):
+    mock_drop = mocker.patch("app.crud.score_history.drop_partitions_before_sync")
+    mocker.patch.object(settings, "SCORE_HISTORY_RETENTION_MONTHS", 0)
+
+    assert drop_expired_score_history_sync(MagicMock(), now=RUN_AT) == []
+    mock_drop.assert_not_called()
+
+
+def test_record_history_copies_scores_in_one_statement():
+    weight_id, coin_id = uuid4(), uuid4()
+    db = MagicMock()
+    db.execute.return_value.rowcount = 1
+
+    assert record_score_history_sync(db, [weight_id], RUN_AT, coin_ids=[coin_id]) == 1
+    db.execute.assert_called_once()
+
+
+def test_record_history_without_changed_coins_is_a_no_op():
+    db = MagicMock()
+
+    assert record_score_history_sync(db, [uuid4()], RUN_AT, coin_ids=[]) == 0
+    db.execute.assert_not_called()
+
+
+async def rows_by_partition(session) -> dict[str, int]:
+    rows = await session.execute(text("SELECT tableoid::regclass::text, count(*) FROM score_history GROUP BY 1"))
+    return dict(rows.all())
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_history_routes_into_partitions_and_expires(db_session, test_coin, scoring_weight, mocker):
+    mocker.patch.object(settings, "SCORE_HISTORY_PARTITIONS_AHEAD", 1)
+    mocker.patch.object(settings, "SCORE_HISTORY_RETENTION_MONTHS", 1)
+    db_session.add(Score(
+        coin_id=test_coin.id, scoring_weight_id=scoring_weight.id, liquidity_score=0.1,
+        developer_score=0.2, community_score=0.3, market_score=0.4, final_score=0.25,
+    ))
+    await db_session.commit()
+
+    created = await db_session.run_sync(
+        lambda session: ensure_score_history_partitions_sync(session, now=datetime(2020, 1, 10))
+    )
+    try:
+        assert created == ["score_history_2020_01", "score_history_2020_02"]
+        for scored_at in (datetime(2019, 6, 1), datetime(2020, 1, 15), datetime(2020, 2, 15)):
+            await db_session.run_sync(
+                lambda session, at=scored_at: record_score_history_sync(session, [scoring_weight.id], at)
+            )
+        await db_session.commit()
+
+        assert await rows_by_partition(db_session) == {
+            "score_history_default": 1, "score_history_2020_01": 1, "score_history_2020_02": 1,
+        }
+
+        dropped = await db_session.run_sync(
+            lambda session: drop_expired_score_history_sync(session, now=datetime(2020, 3, 5))
+        )
+        await db_session.commit()
+
+        assert dropped == ["score_history_2020_01"]
+        remaining = await db_session.run_sync(lambda session: list_partitions_sync(session, "score_history"))
+        assert [p.name for p in remaining if p.name in created or p.is_default] == [
+            "score_history_2020_02", "score_history_default",
+        ]
+        assert await rows_by_partition(db_session) == {"score_history_default": 1, "score_history_2020_02": 1}
+    finally:
+        await db_session.rollback()
+        for name in created:
+            await db_session.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
+        await db_session.commit()
@@ -8,6 +8,9 @@ from app.services.scoringsync import (
     calculate_final_score,
     upsert_score,
 )
+from sqlalchemy.dialects import postgresql
+
+from app.crud.scores import bulk_upsert_scores_sync
 from app.schemas.score import ScoreCreate
 from app.models import Score
 
@@ -140,3 +143,36 @@ def test_score_coin_no_metric(mocker, fake_weights):
     score_coin(db, coin_id, fake_weights)
 
     upsert_mock.assert_not_called()
+
+
+def make_score_rows(count):
+    weight_id = uuid4()
+    return [
+        dict(coin_id=uuid4(), scoring_weight_id=weight_id, liquidity_score=0.1, developer_score=0.2,
+             community_score=0.3, market_score=0.4, final_score=0.25)
+        for _ in range(count)
+    ]
+
+
+def test_bulk_upsert_scores_batches_in_one_transaction():
+    db = MagicMock()
+
+    written = bulk_upsert_scores_sync(db, make_score_rows(5), batch_size=2)
+
+    assert written == 5
+    assert db.execute.call_count == 3
+    sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT ON CONSTRAINT uix_coin_weight DO UPDATE" in sql
+    assert "final_score = excluded.final_score" in sql
+    db.commit.assert_called_once()
+
+
+def test_bulk_upsert_scores_rolls_back_whole_run():
+    db = MagicMock()
+    db.execute.side_effect = [None, Exception("constraint violation")]
+
+    with pytest.raises(Exception, match="constraint violation"):
+        bulk_upsert_scores_sync(db, make_score_rows(4), batch_size=2)
+
+    db.rollback.assert_called_once()
+    db.commit.assert_not_called()
@@ -0,0 +1,238 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+
+from app.core.config import settings
+from app.models.scoring_run import SCORING_MODE_FULL, SCORING_MODE_INCREMENTAL
+from app.services.scoring_engine import (
+    COMPONENTS,
+    MetricMatrix,
+    compute_component_matrix,
+    compute_final_scores,
+    load_metric_matrix,
+    score_universe,
+    score_universe_all_weights,
+    weight_matrix,
+    weight_vector,
+    write_scores_for_weights,
+)
+from app.services.scoringsync import calculate_component_scores, calculate_final_score
+
+HWM = datetime(2025, 1, 1, 12, 0)
+MAX_METRICS = {
+    "max_liquidity": 1000,
+    "max_github_activity": 100,
+    "max_community": 1,
+    "max_market": 100000000,
+}
+
+
+@pytest.fixture
+def fake_weights():
+    return MagicMock(
+        id=uuid4(),
+        liquidity_score=0.4,
+        developer_score=0.3,
+        community_score=0.2,
+        market_score=0.1,
+    )
+
+
+def metric_row(coin_id, liquidity, github, twitter, reddit, market_cap, volume):
+    return (coin_id, liquidity, github, twitter, reddit, market_cap, volume)
+
+
+def test_load_metric_matrix_treats_nulls_as_zero():
+    coin_a, coin_b = uuid4(), uuid4()
+    db = MagicMock()
+    db.execute.return_value.all.return_value = [
+        metric_row(coin_a, 10, 5, 0.2, 0.3, 100, 50),
+        metric_row(coin_b, None, None, None, 0.1, None, 7),
+    ]
+
+    matrix = load_metric_matrix(db)
+
+    assert matrix.coin_ids == [coin_a, coin_b]
+    np.testing.assert_allclose(matrix.values, [[10, 5, 0.5, 150], [0, 0, 0.1, 7]])
+
+
+def test_vectorized_scores_match_per_coin_scoring(fake_weights):
+    metrics = [
+        MagicMock(liquidity=1000, github_activity=50, twitter_sentiment=0.5, reddit_sentiment=0.3,
+                  market_cap=50000000, volume_24h=25000000),
+        MagicMock(liquidity=2500, github_activity=None, twitter_sentiment=None, reddit_sentiment=None,
+                  market_cap=None, volume_24h=10),
+    ]
+    matrix = MetricMatrix(
+        coin_ids=[uuid4(), uuid4()],
+        values=np.array([
+            [1000, 50, 0.8, 75000000],
+            [2500, 0, 0, 10],
+        ], dtype=float),
+    )
+
+    components = compute_component_matrix(matrix, MAX_METRICS)
+    finals = compute_final_scores(components, weight_vector(fake_weights))
+
+    for i, metric in enumerate(metrics):
+        expected = calculate_component_scores(metric, MAX_METRICS)
+        np.testing.assert_allclose(components[i], [expected[name] for name in COMPONENTS])
+        assert finals[i] == pytest.approx(min(1, calculate_final_score(expected, fake_weights)))
+
+
+def test_write_scores_for_weights_builds_rows(mocker):
+    weight_id = uuid4()
+    coin_a, coin_b = uuid4(), uuid4()
+    mock_upsert = mocker.patch("app.services.scoring_engine.bulk_upsert_scores_sync", return_value=2)
+
+    written = write_scores_for_weights(
+        MagicMock(), [coin_a, coin_b], [weight_id],
+        np.array([[1, 0.5, 0.25, 0], [0, 0, 0, 1]], dtype=float),
+        np.array([[0.6], [0.1]]),
+        commit=False,
+    )
+
+    assert written == 2
+    rows = mock_upsert.call_args.args[1]
+    assert rows[0] == {
+        "coin_id": coin_a, "scoring_weight_id": weight_id, "liquidity_score": 1.0,
+        "developer_score": 0.5, "community_score": 0.25, "market_score": 0.0, "final_score": 0.6,
+    }
+    assert rows[1]["market_score"] == 1.0
+    assert mock_upsert.call_args.kwargs == {"commit": False}
+
+
+@pytest.fixture
+def patch_publish(mocker):
+    return mocker.patch("app.services.scoring_engine.publish_leaderboards_sync")
+
+
+@pytest.fixture
+def patch_history(mocker):
+    return mocker.patch("app.services.scoring_engine.record_score_history_sync")
+
+
+@pytest.fixture
+def patch_runs(mocker, patch_publish, patch_history):
+    """No previous runs; the newest metric was created at HWM."""
+    mocker.patch("app.services.scoring_engine.get_metrics_high_water_mark_sync", return_value=HWM)
+    last_run = mocker.patch("app.services.scoring_engine.get_last_scoring_run_sync", return_value=None)
+    create_run = mocker.patch("app.services.scoring_engine.create_scoring_run_sync")
+    return last_run, create_run
+
+
+def previous_run(fake_weights, **overrides):
+    fields = dict(
+        high_water_mark=HWM - timedelta(hours=1),
+        normalization=MAX_METRICS,
+        weights=weight_vector(fake_weights).tolist(),
+    )
+    fields.update(overrides)
+    return MagicMock(**fields)
+
+
+def test_score_universe_full_run_without_history(fake_weights, patch_runs, patch_publish, patch_history, mocker):
+    _, create_run = patch_runs
+    matrix = MetricMatrix(coin_ids=[uuid4(), uuid4()], values=np.ones((2, 4)))
+    mock_load = mocker.patch("app.services.scoring_engine.load_metric_matrix", return_value=matrix)
+    mock_max = mocker.patch("app.services.scoring_engine.find_max_metrics", return_value=MAX_METRICS)
+    mock_upsert = mocker.patch(
+        "app.services.scoring_engine.bulk_upsert_scores_sync", side_effect=lambda db, rows, commit: len(rows)
+    )
+    db = MagicMock()
+
+    assert score_universe(db, fake_weights) == 2
+    mock_max.assert_called_once()
+    assert mock_load.call_args.kwargs == {"changed_since": None}
+    assert {row["scoring_weight_id"] for row in mock_upsert.call_args.args[1]} == {fake_weights.id}
+    run = create_run.call_args.kwargs
+    assert (run["mode"], run["coins_scored"], run["high_water_mark"]) == (SCORING_MODE_FULL, 2, HWM)
+    assert run["commit"] is False
+    db.commit.assert_called_once()
+    weight_ids, coin_ids, final_scores = patch_publish.call_args.args
+    assert (weight_ids, coin_ids, final_scores.shape) == ([fake_weights.id], matrix.coin_ids, (2, 1))
+    assert patch_publish.call_args.kwargs == {"replace": True}
+    patch_history.assert_called_once_with(db, [fake_weights.id], run["started_at"], coin_ids=None)
+
+
+def test_score_universe_incremental_rescores_changed_coins(
+    fake_weights, patch_runs, patch_publish, patch_history, mocker
+):
+    last_run, create_run = patch_runs
+    last_run.return_value = previous_run(fake_weights)
+    matrix = MetricMatrix(coin_ids=[uuid4()], values=np.ones((1, 4)))
+    mock_load = mocker.patch("app.services.scoring_engine.load_metric_matrix", return_value=matrix)
+    mocker.patch("app.services.scoring_engine.find_max_metrics", return_value=dict(MAX_METRICS))
+    mocker.patch("app.services.scoring_engine.bulk_upsert_scores_sync", side_effect=lambda db, rows, commit: len(rows))
+
+    assert score_universe(MagicMock(), fake_weights) == 1
+    overlap = timedelta(seconds=settings.SCORING_HIGH_WATER_MARK_OVERLAP_SECONDS)
+    assert mock_load.call_args.kwargs == {"changed_since": HWM - timedelta(hours=1) - overlap}
+    assert create_run.call_args.kwargs["mode"] == SCORING_MODE_INCREMENTAL
+    assert patch_publish.call_args.kwargs == {"replace": False}
+    assert patch_history.call_args.kwargs == {"coin_ids": matrix.coin_ids}
+
+
+@pytest.mark.parametrize("overrides", [
+    {"normalization": {**MAX_METRICS, "max_liquidity": 2000}},
+    {"weights": [1.0, 0.0, 0.0, 0.0]},
+    {"high_water_mark": None},
+])
+def test_score_universe_falls_back_to_full(fake_weights, patch_runs, patch_publish, overrides, mocker):
+    last_run, create_run = patch_runs
+    last_run.return_value = previous_run(fake_weights, **overrides)
+    mock_load = mocker.patch(
+        "app.services.scoring_engine.load_metric_matrix",
+        return_value=MetricMatrix(coin_ids=[], values=np.zeros((0, 4))),
+    )
+    mocker.patch("app.services.scoring_engine.find_max_metrics", return_value=MAX_METRICS)
+    mock_upsert = mocker.patch("app.services.scoring_engine.bulk_upsert_scores_sync")
+
+    assert score_universe(MagicMock(), fake_weights) == 0
+    assert mock_load.call_args.kwargs == {"changed_since": None}
+    mock_upsert.assert_not_called()
+    patch_publish.assert_not_called()
+    assert create_run.call_args.kwargs["mode"] == SCORING_MODE_FULL
+
+
+def test_all_weights_match_single_weight_scoring(fake_weights):
+    second = MagicMock(id=uuid4(), liquidity_score=0.1, developer_score=0.1, community_score=0.1, market_score=0.7)
+    components = np.array([[1, 0.5, 0.8, 0.75], [0.2, 0, 1, 0.1]], dtype=float)
+
+    finals = compute_final_scores(components, weight_matrix([fake_weights, second]))
+
+    assert finals.shape == (2, 2)
+    np.testing.assert_allclose(finals[:, 0], compute_final_scores(components, weight_vector(fake_weights)))
+    np.testing.assert_allclose(finals[:, 1], compute_final_scores(components, weight_vector(second)))
+
+
+def test_score_universe_all_weights_writes_every_pair(fake_weights, patch_runs, mocker):
+    second = MagicMock(id=uuid4(), liquidity_score=1, developer_score=0, community_score=0, market_score=0)
+    coin_ids = [uuid4(), uuid4(), uuid4()]
+    matrix = MetricMatrix(coin_ids=coin_ids, values=np.array([[500, 1, 1, 1], [1000, 1, 1, 1], [0, 1, 1, 1]], dtype=float))
+    mocker.patch("app.services.scoring_engine.load_metric_matrix", return_value=matrix)
+    mock_max = mocker.patch("app.services.scoring_engine.find_max_metrics", return_value=MAX_METRICS)
+    mock_upsert = mocker.patch(
+        "app.services.scoring_engine.bulk_upsert_scores_sync", side_effect=lambda db, rows, commit: len(rows)
+    )
+
+    written = score_universe_all_weights(MagicMock(), [fake_weights, second])
+
+    assert written == 6
+    mock_max.assert_called_once()
+    rows = mock_upsert.call_args.args[1]
+    assert {(row["coin_id"], row["scoring_weight_id"]) for row in rows} == {
+        (coin_id, weight.id) for coin_id in coin_ids for weight in (fake_weights, second)
+    }
+    liquidity_only = [row["final_score"] for row in rows if row["scoring_weight_id"] == second.id]
+    assert liquidity_only == [0.5, 1.0, 0.0]
+
+
+def test_score_universe_all_weights_without_weights(mocker):
+    mock_load = mocker.patch("app.services.scoring_engine.load_metric_matrix")
+
+    assert score_universe_all_weights(MagicMock(), []) == 0
+    mock_load.assert_not_called()
@@ -0,0 +1,114 @@
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.schemas.scoring_weight import ScoringWeightBase
+from app.services import what_if
+from app.services.scoring_engine import MetricMatrix, Normalizer
+from app.services.what_if import (
+    CACHE_KEY,
+    CachedComponents,
+    deserialize_components,
+    get_cached_components,
+    rank_what_if,
+    refresh_component_cache_sync,
+    serialize_components,
+)
+
+MAX_METRICS = {"max_liquidity": 10, "max_github_activity": 10, "max_community": 1, "max_market": 100}
+
+
+def cached_components(version="v1") -> CachedComponents:
+    return CachedComponents(
+        version=version,
+        coin_ids=[uuid4(), uuid4(), uuid4()],
+        components=np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0.5, 0.5, 0.5, 0.5]], dtype=float),
+        normalization=MAX_METRICS,
+    )
+
+
+def as_redis_hash(cached: CachedComponents) -> dict[bytes, bytes]:
+    return {
+        key.encode(): value if isinstance(value, bytes) else value.encode()
+        for key, value in serialize_components(cached).items()
+    }
+
+
+@pytest.fixture(autouse=True)
+def reset_memo(mocker):
+    mocker.patch.object(what_if, "_memo", None)
+
+
+def test_components_round_trip():
+    cached = cached_components()
+
+    restored = deserialize_components(as_redis_hash(cached))
+
+    assert restored.coin_ids == cached.coin_ids
+    assert restored.normalization == MAX_METRICS
+    np.testing.assert_array_equal(restored.components, cached.components)
+
+
+def test_rank_what_if_orders_top_k():
+    cached = cached_components()
+
+    developer_first = rank_what_if(
+        cached, ScoringWeightBase(liquidity_score=0.1, developer_score=0.9, community_score=0, market_score=0), 2,
+    )
+
+    assert [entry["coin_id"] for entry in developer_first] == [cached.coin_ids[1], cached.coin_ids[2]]
+    assert developer_first[0] == {
+        "rank": 1, "coin_id": cached.coin_ids[1], "final_score": 0.9, "liquidity_score": 0.0,
+        "developer_score": 1.0, "community_score": 0.0, "market_score": 0.0,
+    }
+    assert developer_first[1]["final_score"] == 0.5
+
+
+def test_rank_what_if_caps_top_k_at_universe():
+    weights = ScoringWeightBase(liquidity_score=1, developer_score=0, community_score=0, market_score=0)
+
+    assert len(rank_what_if(cached_components(), weights, 50)) == 3
+
+
+def test_refresh_publishes_normalized_matrix(mocker):
+    matrix = MetricMatrix(coin_ids=[uuid4()], values=np.array([[5, 20, 0.5, 50]], dtype=float))
+    mocker.patch("app.services.what_if.load_metric_matrix", return_value=matrix)
+    mocker.patch(
+        "app.services.what_if.load_normalizer",
+        return_value=Normalizer(snapshot=MAX_METRICS, max_metrics=MAX_METRICS),
+    )
+    client = MagicMock()
+
+    assert refresh_component_cache_sync(MagicMock(), client) == 1
+
+    pipe = client.pipeline.return_value
+    pipe.delete.assert_called_once_with(CACHE_KEY)
+    mapping = pipe.hset.call_args.kwargs["mapping"]
+    np.testing.assert_allclose(np.frombuffer(mapping["components"]), [0.5, 1, 0.5, 0.5])
+    pipe.execute.assert_called_once()
+    client.close.assert_not_called()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_cached_components_downloads_only_new_versions():
+    cached = cached_components()
+    client = MagicMock()
+    client.hget = AsyncMock(return_value=b"v1")
+    client.hgetall = AsyncMock(return_value=as_redis_hash(cached))
+
+    first = await get_cached_components(client)
+    second = await get_cached_components(client)
+
+    assert first is second
+    assert first.coin_ids == cached.coin_ids
+    client.hgetall.assert_awaited_once()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_cached_components_before_first_refresh():
+    client = MagicMock()
+    client.hget = AsyncMock(return_value=None)
+
+    assert await get_cached_components(client) is None
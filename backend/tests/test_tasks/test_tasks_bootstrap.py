@@ -45,6 +45,7 @@ def patch_client(mock_supported_coins):
     with patch("app.tasks.bootstrap.SyncCoinGeckoClient") as mock_client_cls:
         mock_client = MagicMock()
         mock_client.get_supported_coins.return_value = mock_supported_coins
+        mock_client.iter_supported_coins.side_effect = lambda: iter(mock_supported_coins)
         mock_client_cls.return_value = mock_client
         yield mock_client
 
@@ -52,7 +53,10 @@ def patch_client(mock_supported_coins):
 @pytest.fixture
 def patch_crud(mocker):
     mocker.patch("app.tasks.bootstrap.get_all_coingeckoids_sync", return_value=["bitcoin"])
-    return mocker.patch("app.tasks.bootstrap.create_coin_sync")
+    return mocker.patch(
+        "app.tasks.bootstrap.bulk_create_coins_sync",
+        side_effect=lambda db, coins: len(coins),
+    )
 
 
 def test_bootstrap_supported_coins_success(patch_client, patch_crud, db_session):
@@ -61,30 +65,57 @@ def test_bootstrap_supported_coins_success(patch_client, patch_crud, db_session)
     # Should insert Ethereum only, since Bitcoin already exists, and the last one is invalid
     patch_crud.assert_called_once()
     args, kwargs = patch_crud.call_args
-    assert isinstance(args[1], CoinCreate)
-    assert args[1].coingeckoid == "ethereum"
-    assert args[1].symbol == "ETH"
-    assert args[1].name == "Ethereum"
-    assert args[1].is_active is True
+    assert len(args[1]) == 1
+    coin = args[1][0]
+    assert isinstance(coin, CoinCreate)
+    assert coin.coingeckoid == "ethereum"
+    assert coin.symbol == "ETH"
+    assert coin.name == "Ethereum"
+    assert coin.is_active is True
 
 
 def test_bootstrap_skips_invalid_entries(patch_client, patch_crud, db_session):
     bootstrap_supported_coins()
 
     # Only 1 coin should be inserted (Ethereum), 1 duplicate (Bitcoin), 1 invalid skipped
-    assert patch_crud.call_count == 1
+    assert sum(len(call.args[1]) for call in patch_crud.call_args_list) == 1
+
+
+def test_bootstrap_inserts_in_batches(patch_client, mocker, db_session):
+    patch_client.get_supported_coins.return_value = [
+        {"id": f"coin-{i}", "symbol": f"c{i}", "name": f"Coin {i}"} for i in range(5)
+    ]
+    mocker.patch("app.tasks.bootstrap.get_all_coingeckoids_sync", return_value=[])
+    mock_bulk = mocker.patch(
+        "app.tasks.bootstrap.bulk_create_coins_sync",
+        side_effect=lambda db, coins: len(coins),
+    )
+
+    bootstrap_supported_coins(batch_size=2, streaming=False)
+
+    assert [len(call.args[1]) for call in mock_bulk.call_args_list] == [2, 2, 1]
+
+
+def test_bootstrap_streams_supported_coins(patch_client, patch_crud, db_session):
+    bootstrap_supported_coins(streaming=True)
+
+    patch_client.iter_supported_coins.assert_called_once()
+    patch_client.get_supported_coins.assert_not_called()
+    assert [coin.coingeckoid for coin in patch_crud.call_args.args[1]] == ["ethereum"]
 
 
 def test_bootstrap_handles_insert_exception(patch_client, mocker, db_session):
-    # Patch `create_coin_sync` to raise an exception
-    mock_create = mocker.patch("app.tasks.bootstrap.create_coin_sync", side_effect=Exception("DB error"))
-    bootstrap_supported_coins()
-    # All valid new coins attempted, but raised exceptions
-    assert mock_create.call_count == 2
+    # Patch `bulk_create_coins_sync` to raise an exception
+    mocker.patch("app.tasks.bootstrap.get_all_coingeckoids_sync", return_value=[])
+    mock_bulk = mocker.patch("app.tasks.bootstrap.bulk_create_coins_sync", side_effect=Exception("DB error"))
+    bootstrap_supported_coins(batch_size=1)
+    # Every batch is attempted even though earlier ones raised
+    assert mock_bulk.call_count == 2
 
 
 def test_bootstrap_handles_total_failure(mocker):
     # Force failure in `get_supported_coins`
     mocker.patch("app.tasks.bootstrap.SyncCoinGeckoClient.get_supported_coins", side_effect=Exception("API Down"))
+    mocker.patch("app.tasks.bootstrap.SyncCoinGeckoClient.iter_supported_coins", side_effect=Exception("API Down"))
     with patch("app.tasks.bootstrap.SyncCoinGeckoClient.close"):
         bootstrap_supported_coins()  # Should not raise
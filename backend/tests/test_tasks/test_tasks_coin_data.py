@@ -1,15 +1,14 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
-from app.tasks.coin_data import fetch_and_update_all_coins
-
-
-@pytest.fixture
-def patch_client():
-    with patch("app.tasks.coin_data.SyncCoinGeckoClient") as mock_client_cls:
-        mock_client = MagicMock()
-        mock_client_cls.return_value = mock_client
-        yield mock_client
+from app.tasks.coin_data import (
+    aggregate_ingestion_stats,
+    fetch_and_update_all_coins,
+    finish_due_refresh,
+    ingest_coin_shard,
+    refresh_due_coins,
+    refresh_market_data_for_all_coins,
+)
 
 
 @pytest.fixture
@@ -18,47 +17,142 @@ def patch_session(mocker):
     return mocker.patch("app.tasks.coin_data.SessionLocal")
 
 
+@pytest.fixture(autouse=True)
+def patch_cache_refresh(mocker):
+    return mocker.patch("app.tasks.coin_data.refresh_component_cache")
+
+
 @pytest.fixture
-def patch_sleep(mocker):
-    # Patch time.sleep to avoid delays during test
-    return mocker.patch("app.tasks.coin_data.time.sleep", return_value=None)
+def patch_lock(mocker):
+    mocker.patch("app.tasks.coin_data.acquire_task_lock", return_value="token")
+    return mocker.patch("app.tasks.coin_data.release_task_lock")
 
 
-def test_fetch_and_update_all_coins_success(patch_client, patch_session, patch_sleep, mocker):
-    mocker.patch("app.tasks.coin_data.get_tracked_coins_sync", return_value=["bitcoin", "ethereum"])
-    mock_update = mocker.patch("app.tasks.coin_data.update_coin_and_metrics_from_coingecko_sync")
-    mock_update.side_effect = lambda db, coin_id, coingecko_client: MagicMock(name=coin_id.capitalize())
+@pytest.fixture
+def patch_ingest(mocker):
+    stats = MagicMock()
+    stats.as_dict.return_value = {"total": 2, "succeeded": 2, "failed": 0}
+    return mocker.patch("app.tasks.coin_data.ingest_coins", new_callable=AsyncMock, return_value=stats)
 
-    fetch_and_update_all_coins()
 
-    assert mock_update.call_count == 2
-    mock_update.assert_any_call(patch_session.return_value, "bitcoin", coingecko_client=patch_client)
-    mock_update.assert_any_call(patch_session.return_value, "ethereum", coingecko_client=patch_client)
+def test_fetch_and_update_all_coins_success(patch_session, patch_ingest, mocker):
+    mocker.patch("app.tasks.coin_data.get_tracked_coins_sync", return_value=["bitcoin", "ethereum", "solana"])
+    mock_chord = mocker.patch("app.tasks.coin_data.chord")
 
+    result = fetch_and_update_all_coins(shard_size=2)
 
-def test_fetch_and_update_all_coins_no_tracked(patch_client, patch_session, mocker):
-    mocker.patch("app.tasks.coin_data.get_tracked_coins_sync", return_value=[])
+    header = mock_chord.call_args.args[0]
+    assert [sig.args[0] for sig in header] == [["bitcoin", "ethereum"], ["solana"]]
+    mock_chord.return_value.assert_called_once()
+    patch_ingest.assert_not_awaited()
+    assert result == {"total": 3, "shards": 2}
+    patch_session.return_value.close.assert_called_once()
 
-    # Should return early with no updates
-    fetch_and_update_all_coins()
 
+def test_ingest_coin_shard(patch_session, patch_ingest):
+    result = ingest_coin_shard(["bitcoin", "ethereum"])
+
+    patch_ingest.assert_awaited_once_with(patch_session.return_value, ["bitcoin", "ethereum"])
+    assert result == {"total": 2, "succeeded": 2, "failed": 0}
+    patch_session.return_value.close.assert_called_once()
 
-def test_fetch_and_update_all_coins_coin_update_error(patch_client, patch_session, patch_sleep, mocker):
-    mocker.patch("app.tasks.coin_data.get_tracked_coins_sync", return_value=["bitcoin", "ethereum"])
 
-    def update_side_effect(db, coin_id, coingecko_client):
-        if coin_id == "bitcoin":
-            raise Exception("Update failed!")
-        return MagicMock(name="Ethereum")
+def test_ingest_coin_shard_ingestion_error(patch_session, mocker):
+    mocker.patch("app.tasks.coin_data.ingest_coins", new_callable=AsyncMock, side_effect=Exception("Boom"))
 
-    mock_update = mocker.patch("app.tasks.coin_data.update_coin_and_metrics_from_coingecko_sync", side_effect=update_side_effect)
+    assert ingest_coin_shard(["bitcoin"]) is None  # Should not raise
+    patch_session.return_value.rollback.assert_called_once()
+    patch_session.return_value.close.assert_called_once()
 
+
+def test_aggregate_ingestion_stats(patch_cache_refresh):
+    shard = {"total": 2, "succeeded": 1, "failed": 1, "requests": 4, "rate_limited": 1, "duration_seconds": 3.0}
+
+    totals = aggregate_ingestion_stats([shard, shard, None])
+
+    assert totals["total"] == 4
+    assert totals["succeeded"] == 2
+    assert totals["rate_limited"] == 2
+    assert totals["shards"] == 3
+    assert totals["failed_shards"] == 1
+    assert totals["max_shard_seconds"] == 3.0
+    assert totals["rate_limited_ratio"] == 0.25
+    patch_cache_refresh.delay.assert_called_once()
+
+
+def test_fetch_and_update_all_coins_no_tracked(patch_session, patch_ingest, mocker):
+    mocker.patch("app.tasks.coin_data.get_tracked_coins_sync", return_value=[])
+
+    # Should return early with no updates
     fetch_and_update_all_coins()
-    assert mock_update.call_count == 2
+    patch_ingest.assert_not_awaited()
 
 
-def test_fetch_and_update_all_coins_total_failure(patch_client, patch_session, mocker):
+def test_fetch_and_update_all_coins_total_failure(patch_session, mocker):
     # Fail on get_tracked_coins_sync
     mocker.patch("app.tasks.coin_data.get_tracked_coins_sync", side_effect=Exception("DB error"))
 
     fetch_and_update_all_coins()  # Should not raise
+
+
+def test_refresh_market_data_for_all_coins(patch_session, mocker):
+    stats = MagicMock()
+    stats.as_dict.return_value = {"total": 3, "succeeded": 3}
+    mock_refresh = mocker.patch("app.tasks.coin_data.refresh_market_data", new_callable=AsyncMock, return_value=stats)
+
+    result = refresh_market_data_for_all_coins()
+
+    mock_refresh.assert_awaited_once_with(patch_session.return_value)
+    assert result == {"total": 3, "succeeded": 3}
+
+
+def test_refresh_market_data_for_all_coins_failure(patch_session, mocker):
+    mocker.patch("app.tasks.coin_data.refresh_market_data", new_callable=AsyncMock, side_effect=Exception("API down"))
+
+    refresh_market_data_for_all_coins()  # Should not raise
+    patch_session.return_value.rollback.assert_called_once()
+
+
+def test_refresh_due_coins_dispatches_due_shards(patch_session, patch_lock, mocker):
+    mocker.patch("app.tasks.coin_data.get_due_coins", return_value=["bitcoin", "ethereum", "solana"])
+    mock_chord = mocker.patch("app.tasks.coin_data.chord")
+
+    result = refresh_due_coins(shard_size=2)
+
+    header = mock_chord.call_args.args[0]
+    assert [sig.args[0] for sig in header] == [["bitcoin", "ethereum"], ["solana"]]
+    callback = mock_chord.return_value.call_args.args[0]
+    assert callback.task == "app.tasks.coin_data.finish_due_refresh"
+    assert callback.args == ("token",)
+    assert result == {"total": 3, "shards": 2}
+    patch_lock.assert_not_called()
+
+
+def test_refresh_due_coins_nothing_due(patch_session, patch_lock, mocker):
+    mocker.patch("app.tasks.coin_data.get_due_coins", return_value=[])
+    mock_chord = mocker.patch("app.tasks.coin_data.chord")
+
+    refresh_due_coins()
+
+    mock_chord.assert_not_called()
+    patch_lock.assert_called_once_with("refresh_due_coins", "token")
+
+
+def test_refresh_due_coins_skips_while_previous_tick_runs(patch_session, patch_lock, mocker):
+    mocker.patch("app.tasks.coin_data.acquire_task_lock", return_value=None)
+    mock_due = mocker.patch("app.tasks.coin_data.get_due_coins")
+
+    assert refresh_due_coins() is None
+
+    mock_due.assert_not_called()
+    patch_session.assert_not_called()
+    patch_lock.assert_not_called()
+
+
+def test_finish_due_refresh_releases_lock(patch_cache_refresh, patch_lock):
+    totals = finish_due_refresh([{"total": 2, "succeeded": 2}, None], "token")
+
+    assert totals["succeeded"] == 2
+    assert totals["failed_shards"] == 1
+    patch_cache_refresh.delay.assert_called_once()
+    patch_lock.assert_called_once_with("refresh_due_coins", "token")
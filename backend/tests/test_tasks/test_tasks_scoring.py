@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import MagicMock
 
-from app.tasks.scoring_all import score_all_coins
+from app.tasks.scoring_all import score_all_coins, score_all_weights
 
 
 @pytest.fixture
@@ -9,9 +9,14 @@ def patch_session(mocker):
     return mocker.patch("app.tasks.scoring_all.SessionLocal")
 
 
+@pytest.fixture(autouse=True)
+def patch_cache_refresh(mocker):
+    return mocker.patch("app.tasks.scoring_all.refresh_component_cache")
+
+
 @pytest.fixture
-def patch_score_coin(mocker):
-    return mocker.patch("app.tasks.scoring_all.score_coin")
+def patch_score_universe(mocker):
+    return mocker.patch("app.tasks.scoring_all.score_universe", return_value=2)
 
 
 @pytest.fixture
@@ -19,21 +24,15 @@ def patch_logger(mocker):
     return mocker.patch("app.tasks.scoring_all.logger")
 
 
-def test_score_all_coins_success(patch_session, patch_score_coin, mocker):
+def test_score_all_coins_success(patch_session, patch_score_universe, mocker):
     fake_weight_id = "f890475c-ad0e-4b52-8cc2-ba3d02e5cacf"
 
     mock_weight = MagicMock()
-    mock_coin_1 = MagicMock(id="coin1")
-    mock_coin_2 = MagicMock(id="coin2")
-
     mocker.patch("app.tasks.scoring_all.getsync", return_value=mock_weight)
-    mocker.patch("app.tasks.scoring_all.get_all_sync", return_value=[mock_coin_1, mock_coin_2])
 
     result = score_all_coins(scoring_weight_id=fake_weight_id)
 
-    assert patch_score_coin.call_count == 2
-    patch_score_coin.assert_any_call(patch_session.return_value, "coin1", mock_weight)
-    patch_score_coin.assert_any_call(patch_session.return_value, "coin2", mock_weight)
+    patch_score_universe.assert_called_once_with(patch_session.return_value, mock_weight, incremental=True)
     assert result == f"Scored 2 coins using ScoringWeight {fake_weight_id}"
 
 
@@ -57,3 +56,25 @@ def test_score_all_coins_exception(patch_session, mocker):
 
     db_instance.rollback.assert_called_once()
     db_instance.close.assert_called_once()
+
+
+def test_score_all_weights_success(patch_session, patch_cache_refresh, mocker):
+    weights = [MagicMock(), MagicMock()]
+    mocker.patch("app.tasks.scoring_all.get_all_sync", return_value=weights)
+    mock_score = mocker.patch("app.tasks.scoring_all.score_universe_all_weights", return_value=10)
+
+    result = score_all_weights()
+
+    mock_score.assert_called_once_with(patch_session.return_value, weights, incremental=True)
+    assert result == "Wrote 10 scores across 2 ScoringWeight profiles"
+    patch_cache_refresh.delay.assert_called_once()
+    patch_session.return_value.close.assert_called_once()
+
+
+def test_score_all_weights_no_profiles(patch_session, patch_cache_refresh, mocker):
+    mocker.patch("app.tasks.scoring_all.get_all_sync", return_value=[])
+    mock_score = mocker.patch("app.tasks.scoring_all.score_universe_all_weights")
+
+    assert score_all_weights() == "No ScoringWeight profiles found"
+    mock_score.assert_not_called()
+    patch_cache_refresh.delay.assert_not_called()
@@ -0,0 +1,126 @@
+import time
+
+import httpx
+import pytest
+
+from app.utils.api_clients.coingeckosync import SyncCoinGeckoClient
+from app.utils.api_clients.http_cache import (
+    CachedResponse,
+    SQLiteResponseCache,
+    freshness_lifetime,
+)
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path):
+    cache = SQLiteResponseCache(str(tmp_path / "cache.sqlite3"), max_bytes=1024)
+    yield cache
+    cache.close()
+
+
+def make_client(cache, handler):
+    client = SyncCoinGeckoClient(base_url="https://cg.test", cache=cache)
+    client.client = httpx.Client(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_freshness_lifetime_directives():
+    assert freshness_lifetime(httpx.Headers({"cache-control": "public, max-age=30"})) == 30
+    assert freshness_lifetime(httpx.Headers({"cache-control": "max-age=30, s-maxage=60"})) == 60
+    assert freshness_lifetime(httpx.Headers({"cache-control": "no-store"})) is None
+    assert freshness_lifetime(httpx.Headers({"cache-control": "no-cache"}), min_ttl=5) == 0
+    assert freshness_lifetime(httpx.Headers({}), min_ttl=100) == 100
+
+
+def test_sqlite_cache_round_trip(sqlite_cache):
+    entry = CachedResponse(body=b'{"a": 1}', etag='"v1"', expires_at=time.time() + 60)
+    sqlite_cache.set("key", entry)
+
+    cached = sqlite_cache.get("key")
+    assert cached.json() == {"a": 1}
+    assert cached.etag == '"v1"'
+    assert cached.is_fresh()
+    assert sqlite_cache.get("missing") is None
+
+
+def test_sqlite_cache_evicts_least_recently_used(sqlite_cache):
+    body = b"x" * 400
+    sqlite_cache.set("a", CachedResponse(body=body))
+    sqlite_cache.set("b", CachedResponse(body=body))
+    sqlite_cache.get("a")  # "b" becomes the least recently used entry
+    sqlite_cache.set("c", CachedResponse(body=body))
+
+    assert sqlite_cache.get("a") is not None
+    assert sqlite_cache.get("b") is None
+    assert sqlite_cache.get("c") is not None
+
+
+def test_client_serves_fresh_entries_without_network(sqlite_cache):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json=[{"id": "bitcoin"}], headers={"cache-control": "max-age=300"})
+
+    client = make_client(sqlite_cache, handler)
+
+    assert client.get_supported_coins() == [{"id": "bitcoin"}]
+    assert client.get_supported_coins() == [{"id": "bitcoin"}]
+    assert len(calls) == 1
+    assert client.cache_hits == 1
+
+
+def test_client_revalidates_stale_entries(sqlite_cache):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"etag": '"v1"', "cache-control": "max-age=0"})
+        return httpx.Response(200, json={"id": "bitcoin"}, headers={"etag": '"v1"', "cache-control": "max-age=0"})
+
+    client = make_client(sqlite_cache, handler)
+
+    assert client.get_coin_data("bitcoin") == {"id": "bitcoin"}
+    assert client.get_coin_data("bitcoin") == {"id": "bitcoin"}
+    assert len(calls) == 2
+    assert "if-none-match" not in calls[0].headers
+    assert calls[1].headers["if-none-match"] == '"v1"'
+    assert client.cache_hits == 1
+
+
+def test_client_streams_supported_coins_through_cache(sqlite_cache, monkeypatch):
+    monkeypatch.setattr("app.core.config.settings.COINGECKO_COINS_LIST_TTL", 0)
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"etag": '"v1"', "cache-control": "max-age=0"})
+        return httpx.Response(200, json=[{"id": "bitcoin"}], headers={"etag": '"v1"', "cache-control": "max-age=0"})
+
+    client = make_client(sqlite_cache, handler)
+
+    assert list(client.iter_supported_coins(chunk_size=4)) == [{"id": "bitcoin"}]
+    assert list(client.iter_supported_coins(chunk_size=4)) == [{"id": "bitcoin"}]
+    assert len(calls) == 2
+    assert calls[1].headers["if-none-match"] == '"v1"'
+    assert client.cache_hits == 1
+
+
+def test_client_skips_caching_oversized_supported_coins(sqlite_cache, monkeypatch):
+    monkeypatch.setattr("app.core.config.settings.COINGECKO_COINS_LIST_CACHE_MAX_BYTES", 8)
+    coins = [{"id": f"coin-{i}"} for i in range(5)]
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json=coins, headers={"etag": '"v1"', "cache-control": "max-age=600"})
+
+    client = make_client(sqlite_cache, handler)
+
+    assert list(client.iter_supported_coins(chunk_size=4)) == coins
+    assert list(client.iter_supported_coins(chunk_size=4)) == coins
+    assert len(calls) == 2
+    assert "if-none-match" not in calls[1].headers
+    assert client.cache_hits == 0
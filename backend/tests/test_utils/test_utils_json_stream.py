@@ -0,0 +1,56 @@
+import json
+
+import httpx
+import pytest
+
+from app.utils.api_clients.coingeckosync import SyncCoinGeckoClient
+from app.utils.json_stream import iter_json_array
+
+
+def chunked(raw: bytes, size: int) -> list[bytes]:
+    return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64, 1 << 16])
+def test_iter_json_array_across_chunk_boundaries(chunk_size):
+    items = [{"id": f"coin-{i}", "name": f"Coin ✓ {i}", "rank": i * 1.5} for i in range(200)]
+    items += [12345, "tail", None]
+
+    assert list(iter_json_array(chunked(json.dumps(items).encode(), chunk_size))) == items
+
+
+def test_iter_json_array_is_lazy():
+    def body():
+        yield b'[{"id": "bitcoin"}, '
+        raise AssertionError("read past the first element")
+
+    assert next(iter_json_array(body())) == {"id": "bitcoin"}
+
+
+def test_iter_json_array_empty():
+    assert list(iter_json_array([b"  [ ]  "])) == []
+
+
+@pytest.mark.parametrize("raw", [b"", b"{}", b"[1,", b"[1 2]", b'[{"id": '])
+def test_iter_json_array_rejects_malformed_input(raw):
+    with pytest.raises(ValueError):
+        list(iter_json_array([raw]))
+
+
+def test_iter_supported_coins_streams_response():
+    coins = [{"id": "bitcoin", "symbol": "btc", "name": "Bitcoin"}]
+    client = SyncCoinGeckoClient(base_url="https://cg.test")
+    client.client = httpx.Client(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, content=json.dumps(coins).encode())
+    ))
+
+    assert list(client.iter_supported_coins(chunk_size=4)) == coins
+    client.close()
+
+
+def test_iter_supported_coins_http_error_yields_nothing():
+    client = SyncCoinGeckoClient(base_url="https://cg.test")
+    client.client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(500)))
+
+    assert list(client.iter_supported_coins()) == []
+    client.close()
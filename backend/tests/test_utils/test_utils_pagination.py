@@ -0,0 +1,21 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    key = (datetime(2025, 6, 10, 12, 30, 15, 123456), uuid4())
+
+    cursor = encode_cursor(*key)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == key
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", encode_cursor(datetime(2025, 1, 1), uuid4())[:-4]])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
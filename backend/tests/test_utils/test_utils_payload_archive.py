@@ -0,0 +1,81 @@
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.utils.payload_archive import INDEX_FILENAME, PayloadArchive
+
+T0 = datetime(2025, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def archive(tmp_path):
+    with PayloadArchive(str(tmp_path), segment_max_bytes=1 << 20, frame_max_records=2) as archive:
+        yield archive
+
+
+def payload(coin_id: str, price: float) -> dict:
+    return {"id": coin_id, "market_data": {"current_price": {"usd": price}}}
+
+
+def test_archive_round_trip(archive):
+    for i in range(5):
+        archive.append(payload("bitcoin", 100 + i), T0 + timedelta(hours=i))
+
+    records = list(archive.iter_records())
+
+    assert [fetched_at for _, fetched_at, _ in records] == [T0 + timedelta(hours=i) for i in range(5)]
+    assert records[3] == ("bitcoin", T0 + timedelta(hours=3), payload("bitcoin", 103))
+
+
+def test_archive_filters_by_window_and_coin(archive):
+    for i in range(4):
+        archive.append(payload("bitcoin", i), T0 + timedelta(hours=i))
+        archive.append(payload("ethereum", i), T0 + timedelta(hours=i))
+
+    records = list(archive.iter_records(T0 + timedelta(hours=1), T0 + timedelta(hours=3), ["ethereum"]))
+
+    assert [(coin, fetched_at.hour) for coin, fetched_at, _ in records] == [("ethereum", 13), ("ethereum", 14)]
+    assert sorted(archive.coingeckoids(T0, T0 + timedelta(hours=1))) == ["bitcoin", "ethereum"]
+
+
+def test_archive_rotates_segments(tmp_path):
+    with PayloadArchive(str(tmp_path), segment_max_bytes=1, frame_max_records=1) as archive:
+        for i in range(3):
+            archive.append(payload(f"coin-{i}", i), T0)
+
+        segments = [name for name in os.listdir(tmp_path) if name.endswith(".zst")]
+        assert len(segments) == 3
+        assert len(list(archive.iter_records())) == 3
+
+
+def test_archive_persists_across_writers(tmp_path):
+    with PayloadArchive(str(tmp_path)) as first:
+        first.append(payload("bitcoin", 1), T0)
+
+    with PayloadArchive(str(tmp_path)) as second:
+        second.append(payload("bitcoin", 2), T0 + timedelta(minutes=5))
+        assert len(list(second.iter_records(coingeckoids=["bitcoin"]))) == 2
+
+    assert os.path.exists(tmp_path / INDEX_FILENAME)
+
+
+def test_archive_keeps_records_pending_until_indexed(tmp_path):
+    with PayloadArchive(str(tmp_path), frame_max_records=10) as archive:
+        archive.append(payload("bitcoin", 1), T0)
+        archive._conn.execute("ALTER TABLE records RENAME TO records_moved")
+
+        with pytest.raises(sqlite3.OperationalError):
+            archive.flush()
+        assert len(archive._pending) == 1
+        assert not archive._conn.in_transaction
+
+        archive._conn.execute("ALTER TABLE records_moved RENAME TO records")
+        assert list(archive.iter_records()) == [("bitcoin", T0, payload("bitcoin", 1))]
+        assert archive._pending == []
+
+
+def test_archive_index_waits_for_other_writers(archive):
+    assert archive._conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+    assert archive._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
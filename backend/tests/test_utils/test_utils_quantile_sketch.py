@@ -0,0 +1,59 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.utils.quantile_sketch import KLLSketch
+
+
+@pytest.fixture
+def stream():
+    return np.random.default_rng(7).lognormal(mean=10, sigma=3, size=50000)
+
+
+def test_ranks_track_exact_percentiles(stream):
+    sketch = KLLSketch(k=200, rng=random.Random(1))
+    sketch.update_many(stream)
+
+    probes = np.quantile(stream, [0.05, 0.25, 0.5, 0.75, 0.95])
+    np.testing.assert_allclose(sketch.ranks(probes), [0.05, 0.25, 0.5, 0.75, 0.95], atol=0.02)
+    assert sketch.count == len(stream)
+    assert sum(len(c) for c in sketch.compactors) < 1000
+
+
+def test_outlier_does_not_squash_ranks():
+    sketch = KLLSketch()
+    sketch.update_many([1.0, 2.0, 3.0, 4.0, 1e12])
+
+    assert sketch.rank(1.0) == 0.0
+    assert sketch.rank(3.0) == pytest.approx(0.4)
+    assert sketch.rank(1e12) == pytest.approx(0.8)
+
+
+def test_merge_matches_single_stream(stream):
+    left, right = KLLSketch(rng=random.Random(2)), KLLSketch(rng=random.Random(3))
+    left.update_many(stream[:20000])
+    right.update_many(stream[20000:])
+
+    left.merge(right)
+
+    assert left.count == len(stream)
+    median = left.quantile(0.5)
+    assert np.mean(stream < median) == pytest.approx(0.5, abs=0.02)
+
+
+def test_round_trips_through_dict(stream):
+    sketch = KLLSketch(k=100)
+    sketch.update_many(stream[:5000])
+
+    restored = KLLSketch.from_dict(sketch.to_dict())
+
+    assert restored.count == sketch.count
+    np.testing.assert_array_equal(restored.ranks(stream[:100]), sketch.ranks(stream[:100]))
+
+
+def test_empty_sketch():
+    sketch = KLLSketch()
+
+    np.testing.assert_array_equal(sketch.ranks(np.array([1.0, 2.0])), [0.0, 0.0])
+    assert sketch.quantiles([0.5]) == [None]